@@ -1,12 +1,17 @@
 """JWT 인증 유틸리티"""
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 import jwt
 from fastapi import Cookie, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
 from src.config import get_settings
+from src.crypto import decrypt_token
 from src.database import get_db
 from src.models.user import User
 from sqlalchemy import select
@@ -51,21 +56,113 @@ def verify_token(token: str, expected_type: str = "access") -> Optional[dict]:
         return None
 
 
-async def get_current_user(
+@dataclass
+class Principal:
+    """인증된 요청 주체 (사용자 + 복호화된 GitHub 리포 토큰)"""
+    user: User
+    github_token: Optional[str] = None
+
+
+def _detached_copy(user: User) -> User:
+    """세션과 분리된 User 사본 (요청 간 공유용, 원본 세션의 변경이 섞이지 않도록)"""
+    copy = User(**{c.key: getattr(user, c.key) for c in User.__table__.columns})
+    make_transient_to_detached(copy)
+    return copy
+
+
+class PrincipalCache:
+    """액세스 토큰 서명 → (사용자, GitHub 토큰) 짧은 TTL 캐시
+
+    JWT 검증에 성공한 토큰만 저장하며 만료 시각은 토큰 exp를 넘지 않는다.
+    사용자 정보나 토큰이 바뀌는 시점(로그아웃, 갱신, 리포 토큰 저장, 재로그인)에 무효화한다.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, User, Optional[str]]] = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        # JWT 서명 부분은 토큰마다 고유
+        return token.rsplit(".", 1)[-1]
+
+    def get(self, token: str) -> Optional[tuple[User, Optional[str]]]:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, user, github_token = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return user, github_token
+
+    def put(
+        self, token: str, user: User, github_token: Optional[str], token_exp: float
+    ) -> None:
+        if self.ttl_seconds <= 0 or self.max_entries <= 0:
+            return
+        expires_at = min(time.time() + self.ttl_seconds, token_exp)
+        self._entries[self._key(token)] = (expires_at, _detached_copy(user), github_token)
+        self._entries.move_to_end(self._key(token))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate_token(self, token: Optional[str]) -> None:
+        if token:
+            self._entries.pop(self._key(token), None)
+
+    def invalidate_user(self, user_id: int) -> None:
+        for key in [k for k, (_, user, _) in self._entries.items() if user.id == user_id]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+principal_cache = PrincipalCache(
+    settings.principal_cache_ttl_seconds, settings.principal_cache_max_entries
+)
+
+
+async def get_current_principal(
     access_token: Optional[str] = Cookie(default=None),
     db: AsyncSession = Depends(get_db),
-) -> Optional[User]:
-    """쿠키의 JWT로 현재 사용자 조회. 미인증 시 None 반환."""
+) -> Optional[Principal]:
+    """쿠키의 JWT로 현재 요청 주체 조회 (캐시 히트 시 JWT 디코딩/DB 조회 생략). 미인증 시 None."""
     if not access_token:
         return None
 
+    cached = principal_cache.get(access_token)
+    if cached:
+        user, github_token = cached
+        # 요청 세션에 조회 없이 연결 (load=False)
+        return Principal(user=await db.merge(user, load=False), github_token=github_token)
+
     payload = verify_token(access_token, expected_type="access")
     if not payload:
         return None
 
     user_id = int(payload["sub"])
     result = await db.execute(select(User).where(User.id == user_id))
-    return result.scalar_one_or_none()
+    user = result.scalar_one_or_none()
+    if not user:
+        return None
+
+    github_token = (
+        decrypt_token(user.github_repo_token) if user.github_repo_token else None
+    )
+    principal_cache.put(access_token, user, github_token, float(payload["exp"]))
+    return Principal(user=user, github_token=github_token)
+
+
+async def get_current_user(
+    principal: Optional[Principal] = Depends(get_current_principal),
+) -> Optional[User]:
+    """쿠키의 JWT로 현재 사용자 조회. 미인증 시 None 반환."""
+    return principal.user if principal else None
 
 
 async def require_current_user(
@@ -78,3 +175,15 @@ async def require_current_user(
             detail="인증이 필요합니다",
         )
     return user
+
+
+async def require_current_principal(
+    principal: Optional[Principal] = Depends(get_current_principal),
+) -> Principal:
+    """인증 필수 의존성 (요청 주체). 미인증 시 401."""
+    if not principal:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="인증이 필요합니다",
+        )
+    return principal
@@ -0,0 +1,154 @@
+"""업스트림별 서킷 브레이커 (closed / open / half-open)"""
+import enum
+import logging
+import time
+from typing import Optional
+
+from src.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class CircuitState(str, enum.Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """서킷이 열려 있어 요청을 보내지 않고 즉시 실패"""
+
+    def __init__(self, upstream: str, retry_after: float):
+        self.upstream = upstream
+        self.retry_after = retry_after
+        super().__init__(
+            f"{upstream} 업스트림 장애로 요청이 차단되었습니다 ({retry_after:.0f}초 후 재시도 가능)"
+        )
+
+
+class CircuitBreaker:
+    """연속 실패 횟수 기반 서킷 브레이커
+
+    - closed: 정상. 연속 실패가 failure_threshold에 도달하면 open
+    - open: recovery_timeout 동안 모든 요청을 즉시 실패 처리
+    - half-open: 최대 half_open_max_calls개의 시험 요청만 허용.
+      모두 성공하면 closed, 하나라도 실패하면 다시 open
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        recovery_timeout: float,
+        half_open_max_calls: int = 1,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.half_open_calls = 0
+        self.half_open_successes = 0
+        self.total_failures = 0
+        self.total_rejections = 0
+        self.times_opened = 0
+
+    def _transition(self, state: CircuitState) -> None:
+        if state == self.state:
+            return
+        logger.warning("서킷 상태 변경: %s %s → %s", self.name, self.state.value, state.value)
+        self.state = state
+        if state == CircuitState.OPEN:
+            self.opened_at = time.monotonic()
+            self.times_opened += 1
+        elif state == CircuitState.CLOSED:
+            self.opened_at = None
+            self.consecutive_failures = 0
+        self.half_open_calls = 0
+        self.half_open_successes = 0
+
+    def retry_after(self) -> float:
+        """open 상태에서 half-open 전환까지 남은 시간"""
+        if self.state != CircuitState.OPEN or self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + self.recovery_timeout - time.monotonic())
+
+    def allow_request(self) -> bool:
+        """요청 허용 여부 (허용 시 half-open 시험 슬롯을 점유)"""
+        if self.state == CircuitState.OPEN:
+            if self.retry_after() > 0:
+                return False
+            self._transition(CircuitState.HALF_OPEN)
+
+        if self.state == CircuitState.HALF_OPEN:
+            if self.half_open_calls >= self.half_open_max_calls:
+                return False
+            self.half_open_calls += 1
+
+        return True
+
+    def before_call(self) -> None:
+        """요청 전 호출 — 차단 상태면 CircuitOpenError"""
+        if not self.allow_request():
+            self.total_rejections += 1
+            raise CircuitOpenError(self.name, self.retry_after() or self.recovery_timeout)
+
+    def record_success(self) -> None:
+        if self.state == CircuitState.HALF_OPEN:
+            self.half_open_successes += 1
+            if self.half_open_successes >= self.half_open_max_calls:
+                self._transition(CircuitState.CLOSED)
+            return
+        self.consecutive_failures = 0
+
+    def record_failure(self) -> None:
+        self.total_failures += 1
+        if self.state == CircuitState.HALF_OPEN:
+            self._transition(CircuitState.OPEN)
+            return
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= self.failure_threshold:
+            self._transition(CircuitState.OPEN)
+
+    def release(self) -> None:
+        """결과 없이 끝난(취소된) half-open 시험 요청의 슬롯 반환"""
+        if self.state == CircuitState.HALF_OPEN and self.half_open_calls > 0:
+            self.half_open_calls -= 1
+
+    def snapshot(self) -> dict:
+        """운영자 확인용 상태 요약"""
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self.consecutive_failures,
+            "failure_threshold": self.failure_threshold,
+            "retry_after": round(self.retry_after(), 1),
+            "times_opened": self.times_opened,
+            "total_failures": self.total_failures,
+            "total_rejections": self.total_rejections,
+        }
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(upstream: str) -> CircuitBreaker:
+    """업스트림별 서킷 브레이커 반환"""
+    breaker = _breakers.get(upstream)
+    if breaker is None:
+        breaker = CircuitBreaker(
+            upstream,
+            failure_threshold=settings.circuit_failure_threshold,
+            recovery_timeout=settings.circuit_recovery_timeout,
+            half_open_max_calls=settings.circuit_half_open_max_calls,
+        )
+        _breakers[upstream] = breaker
+    return breaker
+
+
+def breaker_snapshots() -> dict[str, dict]:
+    """모든 업스트림의 서킷 상태"""
+    return {name: breaker.snapshot() for name, breaker in _breakers.items()}
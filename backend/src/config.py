@@ -23,17 +23,103 @@ class Settings(BaseSettings):
     access_token_expire_minutes: int = 30
     refresh_token_expire_days: int = 7
 
+    # 인증 주체 캐시 (JWT 검증 + 사용자 조회 + 토큰 복호화 결과)
+    principal_cache_ttl_seconds: int = 60
+    principal_cache_max_entries: int = 1000
+
     # GitHub OAuth
     github_client_id: str = ""
     github_client_secret: str = ""
+    # GitHub 조건부 요청(ETag) 캐시: 마지막 저장 후 보관 기간과 최대 항목 수 (0이면 제한 없음)
+    github_cache_max_age_seconds: int = 7 * 24 * 3600
+    github_cache_max_entries: int = 20_000
+    # 설정 시 /api/github/webhook 활성화 (push/PR 이벤트로 캐시·분석 갱신)
+    github_webhook_secret: str = ""
     
     # Gemini API
     gemini_api_key: str = ""
 
+    # 프롬프트 입력 토큰 상한 (모델 컨텍스트 윈도우보다 작으면 이 값이 예산)
+    prompt_max_input_tokens: int = 200_000
+
+    # LLM 호출 스케줄러 (동시 실행 수, 모델별 분당 요청/토큰 한도, 0이면 무제한)
+    llm_max_concurrency: int = 4
+    gemini_flash_rpm: int = 1000
+    gemini_flash_tpm: int = 1_000_000
+    gemini_pro_rpm: int = 150
+    gemini_pro_tpm: int = 2_000_000
+
+    # Hedged request: 최근 응답 시간의 gemini_hedge_percentile 분위수(최소 min_delay초)가 지나도
+    # 응답이 없으면 백업 요청(flash 또는 same 모델)을 보내 먼저 끝난 쪽을 사용 (0이면 비활성화)
+    gemini_hedge_percentile: float = 0.9
+    gemini_hedge_min_delay_seconds: float = 10.0
+    gemini_hedge_min_samples: int = 20
+    gemini_hedge_backup_model: str = "flash"
+    # 입력이 이 토큰 수보다 작은 Pro 요청은 Flash로 처리 (0이면 비활성화)
+    gemini_pro_min_input_tokens: int = 2_000
+
+    # LLM 응답 캐시 (모델 + 정규화된 프롬프트 + 생성 설정 해시 기준, 0이면 비활성화)
+    llm_cache_ttl_seconds: int = 7 * 24 * 3600
+    llm_cache_max_bytes: int = 64 * 1024 * 1024
+
+    # 분석 파일 blob 저장소 크기 한도 (압축 전 바이트 합계, 0이면 제한 없음)
+    blob_store_max_bytes: int = 512 * 1024 * 1024
+
+    # Gemini 서버 측 컨텍스트 캐시 (리포 분석 결과를 cachedContents로 재사용, 0이면 비활성화)
+    gemini_context_cache_ttl_seconds: int = 3600
+
     # 텔레그램
     telegram_bot_token: str = ""
     telegram_chat_id: str = ""
-    
+
+    # 외부 HTTP 클라이언트 (업스트림별 커넥션 풀)
+    http_max_connections: int = 20
+    http_max_keepalive_connections: int = 10
+    http_keepalive_expiry: float = 30.0
+    http2_enabled: bool = True
+
+    # 재시도 정책 (rate limit / backoff / 업스트림별 재시도 예산)
+    http_retry_max_backoff: float = 30.0
+    http_max_retry_wait: float = 60.0
+    http_retry_budget_ratio: float = 0.2
+    http_retry_budget_max: float = 10.0
+    http_rate_limit_threshold: int = 100
+    http_rate_limit_max_delay: float = 10.0
+
+    # GitHub 목록 API 페이지네이션
+    github_pagination_concurrency: int = 5
+    github_issues_max_pages: int = 10
+    # 커밋 상세(/commits/{sha}) 동시 조회 수
+    github_commit_detail_concurrency: int = 5
+
+    # 리포 목록 캐시 (soft TTL 경과 시 캐시를 반환하고 백그라운드 갱신, max age 경과 시 즉시 갱신)
+    repo_list_soft_ttl_seconds: int = 300
+    repo_list_max_age_seconds: int = 7 * 24 * 3600
+
+    # 리포지토리 트리 캐시 (트리 SHA 기준 인메모리 LRU, 파싱된 트리의 추정 메모리 점유량 기준)
+    tree_cache_max_bytes: int = 16 * 1024 * 1024
+
+    # 분석용 소스 수집 방식 (auto: 받을 파일이 많으면 tarball, archive: 항상 tarball, blob: 파일별)
+    github_fetch_mode: str = "auto"
+    github_fetch_concurrency: int = 8
+    github_archive_min_files: int = 5
+    # 트리 파일 크기 합계가 이 값을 넘는 대형 리포는 파일별 요청으로 대체
+    github_archive_max_bytes: int = 50 * 1024 * 1024
+
+    # 심층 분석 방식 (single: Pro 단일 호출, map_reduce: 파일 샤드별 Flash 검토 후 Pro로 병합,
+    # auto: 수집한 소스가 샤드 하나를 넘으면 map_reduce)
+    deep_analysis_mode: str = "auto"
+    deep_analysis_shard_tokens: int = 60_000
+    deep_analysis_shard_concurrency: int = 4
+    # map_reduce 사용 시 분석 대상 파일 수/내용 한도
+    deep_analysis_max_files: int = 150
+    deep_analysis_max_bytes: int = 2 * 1024 * 1024
+
+    # 업스트림별 서킷 브레이커
+    circuit_failure_threshold: int = 5
+    circuit_recovery_timeout: float = 30.0
+    circuit_half_open_max_calls: int = 1
+
     # CORS
     cors_origins: str = "http://localhost:3000"
     
@@ -1,6 +1,7 @@
 """토큰 암호화/복호화 유틸리티 (Fernet)"""
 import base64
 import hashlib
+from functools import lru_cache
 
 from cryptography.fernet import Fernet
 
@@ -9,8 +10,9 @@ from src.config import get_settings
 settings = get_settings()
 
 
+@lru_cache(maxsize=1)
 def _get_fernet() -> Fernet:
-    """설정의 secret key로부터 Fernet 인스턴스 생성.
+    """설정의 secret key로부터 Fernet 인스턴스 생성 (프로세스당 한 번).
 
     Fernet은 정확히 32바이트 url-safe base64 키를 요구하므로,
     jwt_secret_key를 SHA-256 해시하여 32바이트 키를 파생한다.
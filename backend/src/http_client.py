@@ -1,23 +1,322 @@
-"""재시도 로직이 포함된 HTTP 클라이언트 유틸리티"""
+"""재시도 로직이 포함된 HTTP 클라이언트 유틸리티
+
+업스트림(GitHub, Gemini, Telegram)별로 앱 수명 동안 유지되는 httpx 클라이언트를
+재사용하여 keep-alive 커넥션 풀과 (가능한 경우) HTTP/2를 활용한다.
+"""
 import asyncio
+import hashlib
+import importlib.util
 import logging
-from typing import Optional
+import random
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Awaitable, Callable, Optional
+from urllib.parse import urlsplit
 import httpx
 
+from src.circuit_breaker import get_breaker
+from src.config import get_settings
+from src.metrics import upstream_request_duration
+
 logger = logging.getLogger(__name__)
+settings = get_settings()
 
 DEFAULT_TIMEOUT = 20.0
 DEFAULT_MAX_RETRIES = 3
 DEFAULT_BACKOFF_BASE = 1.0
 
+# 재시도 대상 서버 에러
+RETRYABLE_SERVER_ERRORS = {500, 502, 503, 504}
+
+# 업스트림 식별자
+UPSTREAM_GITHUB = "github"
+UPSTREAM_GEMINI = "gemini"
+UPSTREAM_TELEGRAM = "telegram"
+UPSTREAM_DEFAULT = "default"
+
+# 호스트 → 업스트림 매핑
+_UPSTREAM_HOSTS = {
+    "api.github.com": UPSTREAM_GITHUB,
+    "github.com": UPSTREAM_GITHUB,
+    "codeload.github.com": UPSTREAM_GITHUB,
+    "generativelanguage.googleapis.com": UPSTREAM_GEMINI,
+    "api.telegram.org": UPSTREAM_TELEGRAM,
+}
+
+# HTTP/2를 지원하는 업스트림 (h2 패키지가 설치된 경우에만 활성화)
+_HTTP2_UPSTREAMS = {UPSTREAM_GITHUB, UPSTREAM_GEMINI}
+
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_clients: dict[str, httpx.AsyncClient] = {}
 
-def create_client(timeout: float = DEFAULT_TIMEOUT) -> httpx.AsyncClient:
-    """타임아웃이 설정된 httpx 클라이언트 생성"""
+
+def resolve_upstream(url: str) -> str:
+    """URL의 호스트로 업스트림 식별자 결정"""
+    host = urlsplit(url).hostname or ""
+    return _UPSTREAM_HOSTS.get(host, UPSTREAM_DEFAULT)
+
+
+def create_client(
+    timeout: float = DEFAULT_TIMEOUT, http2: bool = False
+) -> httpx.AsyncClient:
+    """타임아웃과 커넥션 풀 한도가 설정된 httpx 클라이언트 생성"""
     return httpx.AsyncClient(
         timeout=httpx.Timeout(timeout, connect=10.0),
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        ),
+        http2=http2 and settings.http2_enabled and _HTTP2_AVAILABLE,
     )
 
 
+def get_client(upstream: str) -> httpx.AsyncClient:
+    """업스트림별 공유 클라이언트 반환 (없거나 닫혔으면 생성)"""
+    client = _clients.get(upstream)
+    if client is None or client.is_closed:
+        client = create_client(http2=upstream in _HTTP2_UPSTREAMS)
+        _clients[upstream] = client
+    return client
+
+
+async def close_clients() -> None:
+    """모든 공유 클라이언트 종료 (앱 종료 시 호출)"""
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning("HTTP 클라이언트 종료 실패: %s", e)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더 값(초 또는 HTTP-date)을 대기 초로 변환"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def is_rate_limited(response: httpx.Response) -> bool:
+    """429 또는 GitHub 1차/2차 rate limit 403 여부"""
+    if response.status_code == 429:
+        return True
+    if response.status_code != 403:
+        return False
+    if response.headers.get("Retry-After"):
+        return True
+    if response.headers.get("X-RateLimit-Remaining") == "0":
+        return True
+    try:
+        return "rate limit" in response.text.lower()
+    except Exception:
+        return False
+
+
+def _rate_limit_wait(response: httpx.Response) -> Optional[float]:
+    """서버가 지정한 대기 시간 (Retry-After → X-RateLimit-Reset 순)"""
+    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+    if retry_after is not None:
+        return retry_after
+    if response.headers.get("X-RateLimit-Remaining") == "0":
+        reset = response.headers.get("X-RateLimit-Reset")
+        if reset and reset.isdigit():
+            return max(0.0, int(reset) - time.time())
+    return None
+
+
+def _full_jitter(attempt: int, backoff_base: float) -> float:
+    """Full jitter exponential backoff: [0, min(cap, base * 2^attempt)]"""
+    ceiling = min(settings.http_retry_max_backoff, backoff_base * (2 ** attempt))
+    return random.uniform(0, ceiling)
+
+
+def retry_delay(
+    response: Optional[httpx.Response],
+    attempt: int,
+    backoff_base: float = DEFAULT_BACKOFF_BASE,
+) -> Optional[float]:
+    """재시도 대기 시간 (재시도 대상이 아니거나 서버 지정 대기가 한도를 넘으면 None)
+
+    response가 None이면 네트워크 오류로 보고 backoff만 적용한다.
+    rate limit은 Retry-After / X-RateLimit-Reset을 따르고, 5xx는 backoff를 적용한다.
+    """
+    if response is None or response.status_code in RETRYABLE_SERVER_ERRORS:
+        return _full_jitter(attempt, backoff_base)
+    if not is_rate_limited(response):
+        return None
+    wait = _rate_limit_wait(response)
+    if wait is None:
+        wait = _full_jitter(attempt, backoff_base)
+    return wait if wait <= settings.http_max_retry_wait else None
+
+
+def _auth_identity(headers: Optional[dict]) -> str:
+    """Authorization 헤더 기반 인증 주체 식별자 (토큰 원문은 보관하지 않음)"""
+    authorization = (headers or {}).get("Authorization")
+    if not authorization:
+        return "anonymous"
+    return hashlib.sha256(authorization.encode()).hexdigest()[:16]
+
+
+class RetryBudget:
+    """업스트림별 재시도 예산 (토큰 버킷)
+
+    최초 요청마다 ratio만큼 토큰이 적립되고 재시도 1회마다 1토큰을 소모한다.
+    업스트림이 계속 실패하면 예산이 고갈되어 추가 재시도 없이 즉시 응답을 반환한다.
+    """
+
+    def __init__(self, ratio: float, max_tokens: float):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+
+    def deposit(self) -> None:
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class RateLimitState:
+    """X-RateLimit-* 헤더로 추적하는 인증 주체별 남은 할당량"""
+
+    def __init__(self) -> None:
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+
+    def update(self, response: httpx.Response) -> None:
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset = response.headers.get("X-RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+        try:
+            self.remaining = int(remaining)
+            self.reset_at = float(reset)
+        except ValueError:
+            return
+
+    def pacing_delay(self, now: Optional[float] = None) -> float:
+        """할당량 소진 전에 남은 요청을 리셋 시각까지 고르게 분산시키는 지연"""
+        if self.remaining is None or self.reset_at is None:
+            return 0.0
+        now = time.time() if now is None else now
+        window = self.reset_at - now
+        if window <= 0 or self.remaining >= settings.http_rate_limit_threshold:
+            return 0.0
+        delay = window if self.remaining <= 0 else window / self.remaining
+        return min(delay, settings.http_rate_limit_max_delay)
+
+
+_retry_budgets: dict[str, RetryBudget] = {}
+_rate_limits: dict[tuple[str, str], RateLimitState] = {}
+
+# single-flight: 동일한 진행 중 GET 요청을 하나의 업스트림 요청으로 합침
+_COALESCIBLE_METHODS = {"GET", "HEAD"}
+# 키에 반영하는 요청 옵션 (그 밖의 옵션이 있으면 합치지 않음)
+_KEYED_KWARGS = {"params"}
+_inflight: dict[tuple, asyncio.Future] = {}
+_singleflight_stats = {"leaders": 0, "coalesced": 0}
+
+
+def get_retry_budget(upstream: str) -> RetryBudget:
+    """업스트림별 재시도 예산 반환"""
+    budget = _retry_budgets.get(upstream)
+    if budget is None:
+        budget = RetryBudget(
+            settings.http_retry_budget_ratio, settings.http_retry_budget_max
+        )
+        _retry_budgets[upstream] = budget
+    return budget
+
+
+def get_rate_limit_state(upstream: str, identity: str) -> RateLimitState:
+    """업스트림 + 인증 주체별 rate limit 상태 반환"""
+    key = (upstream, identity)
+    state = _rate_limits.get(key)
+    if state is None:
+        state = RateLimitState()
+        _rate_limits[key] = state
+    return state
+
+
+def _singleflight_key(
+    method: str,
+    url: str,
+    headers: Optional[dict],
+    params: Optional[dict],
+    options: tuple = (),
+) -> tuple:
+    """(메서드, URL, 쿼리, 인증 주체, 나머지 헤더, 재시도/타임아웃 옵션) 기반 키"""
+    headers = headers or {}
+    return (
+        method.upper(),
+        url,
+        tuple(sorted((str(k), str(v)) for k, v in (params or {}).items())),
+        _auth_identity(headers),
+        tuple(sorted(
+            (str(k).lower(), str(v)) for k, v in headers.items()
+            if str(k).lower() != "authorization"
+        )),
+        options,
+    )
+
+
+def singleflight_stats() -> dict:
+    """single-flight 통계 (실제 요청 수 / 합쳐진 요청 수)"""
+    return {**_singleflight_stats, "inflight": len(_inflight)}
+
+
+async def _singleflight(key: tuple, fn: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+    """진행 중인 동일 요청이 있으면 그 결과를 공유하고, 없으면 직접 요청"""
+    existing = _inflight.get(key)
+    if existing is not None:
+        _singleflight_stats["coalesced"] += 1
+        try:
+            return await asyncio.shield(existing)
+        except asyncio.CancelledError:
+            # 선행 요청만 취소된 경우 직접 요청, 자신이 취소된 경우 전파
+            if not existing.cancelled():
+                raise
+
+    future: asyncio.Future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    _singleflight_stats["leaders"] += 1
+    try:
+        response = await fn()
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()  # 대기자가 없어도 'never retrieved' 경고가 나지 않도록
+        raise
+    else:
+        future.set_result(response)
+        return response
+    finally:
+        if _inflight.get(key) is future:
+            del _inflight[key]
+
+
 async def request_with_retry(
     method: str,
     url: str,
@@ -26,38 +325,195 @@ async def request_with_retry(
     backoff_base: float = DEFAULT_BACKOFF_BASE,
     timeout: float = DEFAULT_TIMEOUT,
     headers: Optional[dict] = None,
+    upstream: Optional[str] = None,
+    **kwargs,
+) -> httpx.Response:
+    """재시도 정책이 적용된 HTTP 요청 (GET/HEAD는 single-flight로 합쳐짐)
+
+    동일한 (메서드, URL, 쿼리, 인증 주체, 헤더, 재시도/타임아웃 옵션)의 요청이
+    이미 진행 중이면 업스트림에 다시 요청하지 않고 그 응답을 함께 사용합니다.
+    본문·리다이렉트 등 키에 반영되지 않는 옵션이 있으면 합치지 않습니다.
+    """
+    def send() -> Awaitable[httpx.Response]:
+        return _request_with_retry(
+            method, url,
+            max_retries=max_retries,
+            backoff_base=backoff_base,
+            timeout=timeout,
+            headers=headers,
+            upstream=upstream,
+            **kwargs,
+        )
+
+    if method.upper() in _COALESCIBLE_METHODS and kwargs.keys() <= _KEYED_KWARGS:
+        key = _singleflight_key(
+            method, url, headers, kwargs.get("params"),
+            (upstream, timeout, max_retries, backoff_base),
+        )
+        return await _singleflight(key, send)
+    return await send()
+
+
+async def _request_with_retry(
+    method: str,
+    url: str,
+    *,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    backoff_base: float = DEFAULT_BACKOFF_BASE,
+    timeout: float = DEFAULT_TIMEOUT,
+    headers: Optional[dict] = None,
+    upstream: Optional[str] = None,
     **kwargs,
 ) -> httpx.Response:
-    """Exponential backoff 재시도 로직이 포함된 HTTP 요청
+    """Rate limit을 인지하는 재시도 로직이 포함된 HTTP 요청
 
-    네트워크 에러, 타임아웃, 5xx 에러에 대해 재시도합니다.
+    네트워크 에러, 타임아웃, 5xx, 429, GitHub rate limit 403에 대해 재시도합니다.
+    - Retry-After / X-RateLimit-Reset이 있으면 그 시간만큼 대기 (http_max_retry_wait 초과 시 즉시 반환)
+    - 그 외에는 full jitter exponential backoff
+    - 업스트림별 재시도 예산이 고갈되면 재시도하지 않음
+    - GitHub 할당량이 임계치 아래로 내려가면 요청 전에 미리 속도를 낮춤
+    - 업스트림 서킷이 열려 있으면 요청 없이 CircuitOpenError로 즉시 실패
     """
+    upstream = upstream or resolve_upstream(url)
+    client = get_client(upstream)
+    budget = get_retry_budget(upstream)
+    breaker = get_breaker(upstream)
+    rate_limit = get_rate_limit_state(upstream, _auth_identity(headers))
+    request_timeout = httpx.Timeout(timeout, connect=10.0)
     last_exception: Optional[Exception] = None
+    last_response: Optional[httpx.Response] = None
+
+    breaker.before_call()
+    budget.deposit()
 
     for attempt in range(max_retries):
+        can_retry = attempt < max_retries - 1
+
+        # 재시도 도중 서킷이 열렸으면 더 이상 요청하지 않음
+        if attempt > 0 and not breaker.allow_request():
+            logger.warning(f"{upstream} 서킷 open, 재시도 중단: {url}")
+            if last_response is not None:
+                return last_response
+            break
+
+        pacing = rate_limit.pacing_delay()
+        if pacing > 0:
+            logger.info(
+                f"{upstream} 할당량 잔여 {rate_limit.remaining}, {pacing:.1f}초 감속"
+            )
+            await asyncio.sleep(pacing)
+
+        started = time.perf_counter()
         try:
-            async with create_client(timeout) as client:
-                response = await client.request(
-                    method, url, headers=headers, **kwargs
-                )
-                # 5xx 서버 에러인 경우 재시도
-                if response.status_code >= 500 and attempt < max_retries - 1:
-                    wait = backoff_base * (2 ** attempt)
-                    logger.warning(
-                        f"서버 에러 {response.status_code}, {wait}초 후 재시도 ({attempt + 1}/{max_retries})"
-                    )
-                    await asyncio.sleep(wait)
-                    continue
-                return response
-        except (httpx.TimeoutException, httpx.ConnectError) as e:
+            response = await client.request(
+                method, url, headers=headers, timeout=request_timeout, **kwargs
+            )
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        except httpx.TransportError as e:
+            # 타임아웃/연결 실패뿐 아니라 ReadError, RemoteProtocolError 등 전송 오류 전체
+            upstream_request_duration.observe(
+                time.perf_counter() - started,
+                upstream=upstream, method=method.upper(), status="error",
+            )
+            breaker.record_failure()
             last_exception = e
-            if attempt < max_retries - 1:
-                wait = backoff_base * (2 ** attempt)
+            if can_retry and budget.withdraw():
+                wait = _full_jitter(attempt, backoff_base)
                 logger.warning(
-                    f"요청 실패 ({type(e).__name__}), {wait}초 후 재시도 ({attempt + 1}/{max_retries})"
+                    f"요청 실패 ({type(e).__name__}), {wait:.1f}초 후 재시도 ({attempt + 1}/{max_retries})"
                 )
                 await asyncio.sleep(wait)
-            else:
-                logger.error(f"최대 재시도 횟수 초과: {url}")
+                continue
+            logger.error(f"재시도 중단 ({attempt + 1}/{max_retries}): {url}")
+            break
+        except Exception:
+            # 결과를 알 수 없는 예외: half-open 시험 슬롯이 묶이지 않도록 반환
+            breaker.release()
+            raise
+
+        upstream_request_duration.observe(
+            time.perf_counter() - started,
+            upstream=upstream, method=method.upper(), status=response.status_code,
+        )
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        last_response = response
+        rate_limit.update(response)
+
+        if not is_rate_limited(response) and response.status_code not in RETRYABLE_SERVER_ERRORS:
+            return response
+        wait = retry_delay(response, attempt, backoff_base)
+        if wait is None:
+            logger.warning(
+                f"{upstream} rate limit ({response.status_code}), 대기 시간이 한도를 초과하여 재시도하지 않음"
+            )
+            return response
+
+        if not can_retry or not budget.withdraw():
+            return response
+
+        logger.warning(
+            f"응답 {response.status_code}, {wait:.1f}초 후 재시도 ({attempt + 1}/{max_retries})"
+        )
+        await asyncio.sleep(wait)
 
     raise last_exception or httpx.ConnectError("요청 실패")
+
+
+@asynccontextmanager
+async def stream_request(
+    method: str,
+    url: str,
+    *,
+    timeout: float = DEFAULT_TIMEOUT,
+    headers: Optional[dict] = None,
+    upstream: Optional[str] = None,
+    **kwargs,
+) -> AsyncIterator[httpx.Response]:
+    """본문을 스트리밍으로 읽는 단일 요청 (재시도 없음)
+
+    본문을 읽는 도중에는 재시도할 수 없으므로 호출자가 실패 시 대체 경로를 사용한다.
+    서킷 브레이커, rate limit 추적, 메트릭은 request_with_retry와 동일하게 반영한다.
+    """
+    upstream = upstream or resolve_upstream(url)
+    client = get_client(upstream)
+    breaker = get_breaker(upstream)
+    rate_limit = get_rate_limit_state(upstream, _auth_identity(headers))
+
+    breaker.before_call()
+    started = time.perf_counter()
+    recorded = False
+    try:
+        async with client.stream(
+            method, url, headers=headers,
+            timeout=httpx.Timeout(timeout, connect=10.0), **kwargs,
+        ) as response:
+            upstream_request_duration.observe(
+                time.perf_counter() - started,
+                upstream=upstream, method=method.upper(), status=response.status_code,
+            )
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            recorded = True
+            rate_limit.update(response)
+            yield response
+    except httpx.TransportError:
+        # 응답 상태를 기록한 뒤(본문 수신 중)의 오류는 이미 한 번 반영했으므로 다시 세지 않음
+        if not recorded:
+            upstream_request_duration.observe(
+                time.perf_counter() - started,
+                upstream=upstream, method=method.upper(), status="error",
+            )
+            breaker.record_failure()
+        raise
+    except (asyncio.CancelledError, Exception):
+        # 응답 상태를 기록하기 전의 취소/예외: half-open 시험 슬롯 반환
+        if not recorded:
+            breaker.release()
+        raise
@@ -1,14 +1,19 @@
 """FastAPI 애플리케이션 엔트리포인트"""
 import logging
 from contextlib import asynccontextmanager
-from sqlalchemy import func
+from sqlalchemy import func, select
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from pydantic import ValidationError
 
+from src.circuit_breaker import CircuitOpenError, breaker_snapshots
 from src.config import get_settings
-from src.database import init_db
+from src.database import init_db, engine, async_session_maker
+from src.http_client import close_clients
+from src.services.github_cache import github_response_cache
+from src import metrics
+from src.models.queue_item import QueueItem, QueueStatus
 from src.routes import issues_router, queue_router, queue_public_router, auth_router, github_router, settings_router, labels_router, comments_router
 
 logger = logging.getLogger(__name__)
@@ -27,8 +32,6 @@ DEFAULT_LABELS = [
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """앱 시작/종료 시 실행되는 로직"""
-    from sqlalchemy import select
-    from src.database import async_session_maker
     from src.models.label import Label
 
     await init_db()
@@ -41,8 +44,14 @@ async def lifespan(app: FastAPI):
                 session.add(Label(name=lb["name"], color=lb["color"]))
             await session.commit()
 
+    # 보관 기간이 지났거나 한도를 넘은 GitHub 캐시 항목 정리
+    await github_response_cache.evict()
+
     yield
 
+    # 업스트림 HTTP 커넥션 풀 정리
+    await close_clients()
+
 
 app = FastAPI(
     title="Gary Agent Dashboard API",
@@ -54,6 +63,9 @@ app = FastAPI(
     openapi_url="/api/openapi.json",
 )
 
+# 라우트별 요청 지연 메트릭
+app.add_middleware(metrics.MetricsMiddleware)
+
 # CORS 설정
 app.add_middleware(
     CORSMiddleware,
@@ -73,6 +85,16 @@ async def validation_error_handler(request: Request, exc: ValidationError):
     )
 
 
+@app.exception_handler(CircuitOpenError)
+async def circuit_open_handler(request: Request, exc: CircuitOpenError):
+    """업스트림 서킷 open → 503 (즉시 실패)"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc), "code": "upstream_unavailable"},
+        headers={"Retry-After": str(int(exc.retry_after) + 1)},
+    )
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """예상치 못한 에러 → 500"""
@@ -100,6 +122,45 @@ async def health_check():
     return {"status": "ok"}
 
 
+_CIRCUIT_STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    """Prometheus 텍스트 포맷 메트릭 (게이지는 스크레이프 시점에 계산)"""
+    pool = engine.pool
+    for gauge, attr in (
+        (metrics.db_pool_size, "size"),
+        (metrics.db_pool_checked_out, "checkedout"),
+        (metrics.db_pool_overflow, "overflow"),
+    ):
+        reader = getattr(pool, attr, None)
+        if callable(reader):
+            gauge.set(reader())
+
+    async with async_session_maker() as session:
+        result = await session.execute(
+            select(QueueItem.status, func.count(QueueItem.id))
+            .group_by(QueueItem.status)
+        )
+        counts = {row[0]: row[1] for row in result.all()}
+    for queue_status in QueueStatus:
+        metrics.queue_depth.set(counts.get(queue_status, 0), status=queue_status.value)
+
+    for upstream, snapshot in breaker_snapshots().items():
+        metrics.upstream_circuit_state.set(
+            _CIRCUIT_STATE_VALUES[snapshot["state"]], upstream=upstream
+        )
+
+    return Response(content=metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@app.get("/health/upstreams")
+async def upstream_health():
+    """업스트림(GitHub, Gemini, Telegram)별 서킷 브레이커 상태"""
+    return {"circuits": breaker_snapshots()}
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
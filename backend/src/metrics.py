@@ -0,0 +1,301 @@
+"""Prometheus 텍스트 포맷 메트릭 (외부 의존성 없는 경량 구현)
+
+측정 경로에서는 dict 조회와 덧셈만 수행하므로 프로덕션에서 상시 활성화해도 부담이 적다.
+DB 풀/큐 깊이 같은 게이지는 /metrics 스크레이프 시점에만 계산한다.
+"""
+import bisect
+import time
+from typing import Iterable, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def _header(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+
+class Counter(_Metric):
+    """단조 증가 카운터"""
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> list[str]:
+        lines = self._header()
+        for key, value in self._values.items():
+            lines.append(
+                f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            )
+        return lines
+
+
+class Gauge(_Metric):
+    """임의 값 게이지"""
+    kind = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: dict[tuple, float] = {}
+
+    def set(self, value: float, **labels) -> None:
+        self._values[self._key(labels)] = value
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> list[str]:
+        lines = self._header()
+        for key, value in self._values.items():
+            lines.append(
+                f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            )
+        return lines
+
+
+class Histogram(_Metric):
+    """누적 버킷 히스토그램"""
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: tuple[float, ...] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # key → [버킷별 카운트..., +Inf 카운트, 합계]
+        self._values: dict[tuple, list[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        state = self._values.get(key)
+        if state is None:
+            state = [0.0] * (len(self.buckets) + 2)
+            self._values[key] = state
+        # bisect_left: value <= bound인 첫 버킷, 모든 bound보다 크면 +Inf 칸
+        state[bisect.bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    def count(self, **labels) -> int:
+        state = self._values.get(self._key(labels))
+        return int(sum(state[:-1])) if state else 0
+
+    def render(self) -> list[str]:
+        lines = self._header()
+        for key, state in self._values.items():
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {_format_value(cumulative)}")
+            cumulative += state[len(self.buckets)]
+            labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {_format_value(cumulative)}")
+            base = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{base} {_format_value(state[-1])}")
+            lines.append(f"{self.name}_count{base} {_format_value(cumulative)}")
+        return lines
+
+
+class MetricsRegistry:
+    """메트릭 레지스트리"""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"이미 등록된 메트릭입니다: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets=buckets))
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# ── 인바운드 HTTP ──────────────────────────────────────────
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "API 라우트별 요청 처리 시간",
+    ("method", "route", "status"),
+)
+
+# ── 아웃바운드 HTTP (http_client) ─────────────────────────────
+upstream_request_duration = registry.histogram(
+    "upstream_request_duration_seconds",
+    "업스트림별 외부 요청 시간 (재시도 시도 단위)",
+    ("upstream", "method", "status"),
+)
+
+upstream_circuit_state = registry.gauge(
+    "upstream_circuit_state",
+    "업스트림 서킷 상태 (0=closed, 1=half_open, 2=open)",
+    ("upstream",),
+)
+
+github_file_fetch_duration = registry.histogram(
+    "github_file_fetch_duration_seconds",
+    "분석용 파일 내용 조회 시간 (source=store/archive/blob/contents)",
+    ("source",),
+)
+
+# ── DB 커넥션 풀 ─────────────────────────────────────────
+db_pool_size = registry.gauge("db_pool_size", "SQLAlchemy 커넥션 풀 크기")
+db_pool_checked_out = registry.gauge(
+    "db_pool_checked_out", "사용 중인 SQLAlchemy 커넥션 수"
+)
+db_pool_overflow = registry.gauge(
+    "db_pool_overflow", "풀 크기를 초과해 생성된 SQLAlchemy 커넥션 수"
+)
+
+# ── 작업 큐 ───────────────────────────────────────────────
+queue_depth = registry.gauge("queue_depth", "상태별 작업 큐 아이템 수", ("status",))
+
+# ── Gemini ───────────────────────────────────────────────
+gemini_requests = registry.counter(
+    "gemini_requests_total", "Gemini 호출 수", ("model", "outcome")
+)
+gemini_request_duration = registry.histogram(
+    "gemini_request_duration_seconds", "Gemini 호출 시간", ("model",)
+)
+gemini_latency_quantile = registry.gauge(
+    "gemini_latency_quantile_seconds",
+    "최근 Gemini 성공 응답 시간의 분위수 (hedge 지연 기준)",
+    ("model", "quantile"),
+)
+gemini_hedged_requests = registry.counter(
+    "gemini_hedged_requests_total",
+    "Gemini hedged request 결과 (outcome=fired/primary_won/backup_won/fallback/failed)",
+    ("model", "outcome"),
+)
+gemini_model_downgrades = registry.counter(
+    "gemini_model_downgrades_total",
+    "입력 크기 기준으로 더 가벼운 모델로 바꾼 요청 수",
+    ("from_model", "to_model"),
+)
+gemini_stream_first_chunk = registry.histogram(
+    "gemini_stream_first_chunk_seconds",
+    "Gemini 스트리밍 호출의 첫 응답 조각까지 걸린 시간",
+    ("model",),
+)
+llm_queue_wait = registry.histogram(
+    "llm_queue_wait_seconds",
+    "LLM 스케줄러에서 실행 권한을 얻기까지 대기한 시간",
+    ("model", "priority"),
+)
+llm_queue_depth = registry.gauge(
+    "llm_queue_depth", "우선순위별 LLM 호출 대기 수", ("priority",)
+)
+llm_inflight = registry.gauge("llm_inflight", "실행 중인 LLM 호출 수")
+llm_cache_requests = registry.counter(
+    "llm_cache_requests_total",
+    "LLM 응답 캐시 조회 수 (outcome=hit/miss/bypass)",
+    ("model", "outcome"),
+)
+gemini_context_cache_requests = registry.counter(
+    "gemini_context_cache_requests_total",
+    "Gemini 컨텍스트 캐시 조회 수 (outcome=hit/create/skip/error)",
+    ("kind", "outcome"),
+)
+
+
+class MetricsMiddleware:
+    """라우트 템플릿 단위로 요청 지연을 기록하는 ASGI 미들웨어
+
+    경로 파라미터가 들어간 실제 URL 대신 매칭된 라우트 경로(예: /api/issues/{issue_id})를
+    라벨로 사용하여 시계열 수가 라우트 수로 제한되도록 한다.
+    """
+
+    def __init__(self, app: ASGIApp, exclude_paths: tuple[str, ...] = ("/metrics",)):
+        self.app = app
+        self.exclude_paths = exclude_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope.get("path") in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code: Optional[int] = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            http_request_duration.observe(
+                time.perf_counter() - start,
+                method=scope.get("method", ""),
+                route=getattr(route, "path", "unmatched"),
+                status=status_code or 500,
+            )
@@ -7,8 +7,14 @@ from src.models.user import User
 from src.models.comment import Comment
 from src.models.connected_repo import ConnectedRepo
 from src.models.deep_analysis_suggestion import DeepAnalysisSuggestion
+from src.models.github_http_cache import GitHubHttpCache
+from src.models.git_blob import GitBlob
+from src.models.user_repo_list import UserRepoList
+from src.models.commit_detail import CommitDetail
+from src.models.llm_response import LLMResponse
 
 __all__ = [
     "Label", "issue_labels", "Issue", "QueueItem", "Setting",
     "User", "Comment", "ConnectedRepo", "DeepAnalysisSuggestion",
+    "GitHubHttpCache", "GitBlob", "UserRepoList", "CommitDetail", "LLMResponse",
 ]
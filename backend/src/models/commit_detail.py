@@ -0,0 +1,25 @@
+"""커밋 상세(변경 통계) 저장소 모델"""
+from __future__ import annotations
+from datetime import datetime
+from sqlalchemy import String, Integer, Text, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database import Base
+
+
+class CommitDetail(Base):
+    """커밋 SHA별 변경 통계와 파일 목록
+
+    커밋은 불변이므로 한 번 저장한 항목은 갱신하거나 만료하지 않는다.
+    """
+    __tablename__ = "commit_details"
+
+    sha: Mapped[str] = mapped_column(String(64), primary_key=True)
+    additions: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    deletions: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    total: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    files_changed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    files: Mapped[str] = mapped_column(Text, nullable=False)  # JSON 파일 경로 배열
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
@@ -42,6 +42,8 @@ class ConnectedRepo(Base):
     analysis_result: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     analysis_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     analyzed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    # 마지막 Phase 1 분석 시점의 루트 트리 SHA (같으면 재분석 생략)
+    analysis_tree_sha: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
 
     # 심층 분석 (Phase 2)
     deep_analysis_status: Mapped[Optional[str]] = mapped_column(
@@ -50,6 +52,9 @@ class ConnectedRepo(Base):
     deep_analysis_result: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     deep_analysis_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     deep_analyzed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    # 심층 분석 지문: 루트 트리 SHA + 검토한 파일별 blob SHA (JSON, 변경 파일만 재검토)
+    deep_analysis_tree_sha: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    deep_analysis_files: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # 커밋 히스토리 분석 (Phase 3)
     commit_analysis_status: Mapped[Optional[str]] = mapped_column(
@@ -58,6 +63,8 @@ class ConnectedRepo(Base):
     commit_analysis_result: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     commit_analysis_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     commit_analyzed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    # 마지막으로 분석한 기본 브랜치 head 커밋 SHA (증분 분석 기준)
+    commit_analyzed_sha: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
 
     # 관계
     deep_analysis_suggestions: Mapped[List["DeepAnalysisSuggestion"]] = relationship(
@@ -0,0 +1,26 @@
+"""Git blob 내용 저장소 모델"""
+from __future__ import annotations
+from datetime import datetime
+from sqlalchemy import String, Integer, LargeBinary, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database import Base
+
+
+class GitBlob(Base):
+    """blob SHA 기준 파일 내용 (zlib 압축)
+
+    blob SHA는 내용 자체의 해시이므로 항목이 바뀌거나 만료되지 않고,
+    같은 내용을 가진 모든 리포/사용자가 공유한다. 크기 한도는 BlobStore가 관리한다.
+    """
+    __tablename__ = "git_blobs"
+
+    sha: Mapped[str] = mapped_column(String(64), primary_key=True)
+    content: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    size: Mapped[int] = mapped_column(Integer, nullable=False)  # 압축 전 바이트
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+    last_used_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, index=True, nullable=False
+    )
@@ -0,0 +1,34 @@
+"""GitHub API 조건부 요청(ETag) 캐시 모델"""
+from __future__ import annotations
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import String, Text, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database import Base
+
+
+class GitHubHttpCache(Base):
+    """GitHub API 응답 캐시 (토큰 + URL 단위)
+
+    cache_key는 인증 토큰 해시를 포함하므로 사용자 간에 비공개 응답이 공유되지 않는다.
+    보관 기간과 항목 수 한도는 GitHubResponseCache가 관리한다.
+    """
+    __tablename__ = "github_http_cache"
+
+    cache_key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    repo_full_name: Mapped[Optional[str]] = mapped_column(
+        String(255), index=True, nullable=True
+    )
+    url: Mapped[str] = mapped_column(Text, nullable=False)
+    etag: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    last_modified: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    headers: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # JSON
+    body: Mapped[str] = mapped_column(Text, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        index=True,
+        nullable=False,
+    )
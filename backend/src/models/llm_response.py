@@ -0,0 +1,27 @@
+"""LLM 응답 캐시 모델"""
+from __future__ import annotations
+from datetime import datetime
+from sqlalchemy import String, Integer, Text, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database import Base
+
+
+class LLMResponse(Base):
+    """(모델, 정규화된 프롬프트, 생성 설정) 해시 기준 LLM 응답
+
+    같은 입력에 대한 재호출을 DB 조회로 대체한다. 만료와 크기 한도는 LLMResponseCache가 관리한다.
+    """
+    __tablename__ = "llm_responses"
+
+    cache_key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    model: Mapped[str] = mapped_column(String(100), nullable=False)
+    response: Mapped[str] = mapped_column(Text, nullable=False)
+    size: Mapped[int] = mapped_column(Integer, nullable=False)  # 응답 UTF-8 바이트
+    hit_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+    last_used_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, index=True, nullable=False
+    )
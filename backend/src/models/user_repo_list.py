@@ -0,0 +1,18 @@
+"""사용자별 GitHub 리포지토리 목록 캐시 모델"""
+from __future__ import annotations
+from datetime import datetime
+from sqlalchemy import Text, DateTime, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database import Base
+
+
+class UserRepoList(Base):
+    """사용자의 GitHub 리포 목록 (RepoResponse 필드만 담은 JSON 배열)"""
+    __tablename__ = "user_repo_lists"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    items: Mapped[str] = mapped_column(Text, nullable=False)  # JSON
+    fetched_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
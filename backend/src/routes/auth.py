@@ -11,12 +11,14 @@ from src.config import get_settings
 from src.database import get_db, async_session_maker
 from src.services.github_service import GitHubService, GitHubAPIService
 from src.services.gemini_service import GeminiAnalysisService
+from src.services.repo_list_cache import repo_list_cache
 from src.schemas.auth import AuthURLResponse, UserResponse
 from src.auth import (
     create_access_token,
     create_refresh_token,
     verify_token,
     get_current_user,
+    principal_cache,
 )
 from src.crypto import decrypt_token
 from src.models.user import User
@@ -84,14 +86,7 @@ async def _trigger_commit_analysis_on_login(user_id: int, repo_token: str) -> No
 
             for repo in repos:
                 try:
-                    owner, repo_name = repo.full_name.split("/", 1)
-                    commits_data = await github_api.get_commits(
-                        owner, repo_name, per_page=30
-                    )
-                    if commits_data:
-                        await gemini_service.analyze_commits(
-                            repo.id, bg_db, commits_data
-                        )
+                    await gemini_service.refresh_commit_analysis(repo.id, bg_db)
                 except Exception:
                     logger.exception(
                         "로그인 커밋 분석 실패: repo=%s", repo.full_name
@@ -167,6 +162,8 @@ async def github_repos_callback(
 
     repo_token = await service.exchange_code_for_token(code)
     await service.save_repo_token(user_id, repo_token)
+    # 권한 범위가 바뀌었을 수 있으므로 리포 목록을 새로 조회하도록 삭제
+    await repo_list_cache.invalidate(user_id)
 
     return RedirectResponse(url="http://localhost:5555/github", status_code=302)
 
@@ -213,12 +210,17 @@ async def refresh_tokens(
         _clear_auth_cookies(response)
         return {"message": "사용자 없음"}
 
+    principal_cache.invalidate_user(user_id)
     _set_auth_cookies(response, user_id)
     return {"message": "토큰 갱신 완료"}
 
 
 @router.post("/logout")
-async def logout(response: Response):
+async def logout(
+    response: Response,
+    access_token: Optional[str] = Cookie(default=None),
+):
     """로그아웃 — 쿠키 삭제"""
+    principal_cache.invalidate_token(access_token)
     _clear_auth_cookies(response)
     return {"message": "로그아웃 완료"}
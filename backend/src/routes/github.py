@@ -1,15 +1,24 @@
 """GitHub API 라우터"""
 import asyncio
+import json
 import logging
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.config import get_settings
 from src.database import get_db, async_session_maker
 from src.services.github_service import GitHubService, GitHubAPIService
-from src.services.gemini_service import GeminiAnalysisService
+from src.services.gemini_service import GeminiAnalysisService, schedule_work_plans
+from src.services.llm_scheduler import LLMPriority
+from src.services.github_cache import github_response_cache
+from src.services.context_cache import repo_context_cache
+from src.services.llm_cache import llm_response_cache
+from src.services.repo_list_cache import repo_list_cache
+from src.services.commit_store import commit_detail_store
+from src.services.webhook_service import GitHubWebhookService, verify_signature
 from src.schemas.github import (
     RepoResponse,
     RepoListResponse,
@@ -32,55 +41,93 @@ from src.schemas.github import (
     CommitAnalysisResponse,
 )
 from src.schemas.issue import IssueResponse
-from src.auth import require_current_user
-from src.crypto import decrypt_token
+from src.auth import Principal, require_current_principal, require_current_user
 from src.models.user import User
 from src.models.issue import Issue, IssueStatus, IssuePriority
 from src.models.connected_repo import ConnectedRepo
 from src.models.deep_analysis_suggestion import DeepAnalysisSuggestion
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
 
 router = APIRouter(prefix="/api/github", tags=["github"])
 
 
 async def _get_github_token(
-    user: User = Depends(require_current_user),
+    principal: Principal = Depends(require_current_principal),
 ) -> str:
-    """현재 사용자의 GitHub 리포 토큰 가져오기 (JWT 인증 + 복호화)"""
-    if not user.github_repo_token:
+    """현재 사용자의 GitHub 리포 토큰 가져오기 (인증 주체 캐시에서 복호화된 토큰 사용)"""
+    if not principal.github_token:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="GitHub 리포지토리 접근 권한이 필요합니다.",
         )
-    return decrypt_token(user.github_repo_token)
+    return principal.github_token
 
 
 @router.get("/repos", response_model=RepoListResponse)
 async def get_repos(
+    refresh: bool = Query(False, description="캐시를 무시하고 GitHub에서 다시 조회"),
+    principal: Principal = Depends(require_current_principal),
     access_token: str = Depends(_get_github_token),
 ):
-    """사용자의 GitHub 리포지토리 전체 목록 조회 (모든 페이지 순회)"""
-    api = GitHubAPIService(access_token)
-    repos = await api.get_all_repos()
+    """사용자의 GitHub 리포지토리 전체 목록 조회 (캐시 우선, 오래되면 백그라운드 갱신)"""
+    items, fetched_at = await repo_list_cache.get_repos(
+        principal.user.id, access_token, refresh=refresh
+    )
+    return RepoListResponse(
+        items=[RepoResponse(**item) for item in items],
+        fetched_at=fetched_at.isoformat(),
+    )
 
-    items = [
-        RepoResponse(
-            id=repo["id"],
-            name=repo["name"],
-            full_name=repo["full_name"],
-            description=repo.get("description"),
-            private=repo["private"],
-            html_url=repo["html_url"],
-            default_branch=repo.get("default_branch", "main"),
-            updated_at=repo["updated_at"],
-            language=repo.get("language"),
-            stargazers_count=repo.get("stargazers_count", 0),
-        )
-        for repo in repos
-    ]
 
-    return RepoListResponse(items=items)
+@router.get("/cache/stats")
+async def get_cache_stats(
+    user: User = Depends(require_current_user),
+):
+    """GitHub API 조건부 요청 캐시 히트/미스 통계"""
+    return github_response_cache.stats()
+
+
+@router.get("/llm-cache/stats")
+async def get_llm_cache_stats(
+    user: User = Depends(require_current_user),
+):
+    """LLM 응답 캐시 히트/미스/우회 통계 (+ Gemini 컨텍스트 캐시)"""
+    return {**llm_response_cache.stats(), "context_cache": repo_context_cache.stats()}
+
+
+@router.post("/webhook")
+async def receive_webhook(
+    request: Request,
+    x_github_event: str = Header(...),
+    x_hub_signature_256: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
+    """GitHub 웹훅 수신 (push / pull_request / issues)"""
+    if not settings.github_webhook_secret:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="웹훅 시크릿이 설정되지 않았습니다",
+        )
+
+    body = await request.body()
+    if not verify_signature(settings.github_webhook_secret, body, x_hub_signature_256):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="웹훅 서명이 올바르지 않습니다",
+        )
+
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="웹훅 본문이 올바른 JSON이 아닙니다",
+        )
+
+    service = GitHubWebhookService(db)
+    return await service.handle(x_github_event, payload)
 
 
 @router.get("/repos/{owner}/{repo}/tree", response_model=RepoTreeResponse)
@@ -167,10 +214,18 @@ async def import_github_issue(
         priority=IssuePriority.MEDIUM,
         repo_full_name=f"{owner}/{repo}",
     )
+    # 본문이 있으면 AI 작업 계획 백그라운드 생성
+    if new_issue.description.strip():
+        new_issue.ai_plan_status = "generating"
     db.add(new_issue)
     await db.commit()
     await db.refresh(new_issue)
 
+    if new_issue.ai_plan_status == "generating":
+        schedule_work_plans(
+            [new_issue.id], access_token, priority=LLMPriority.BACKGROUND_PLAN
+        )
+
     return IssueResponse.model_validate(new_issue)
 
 
@@ -201,11 +256,17 @@ async def get_repo_commits(
     repo: str,
     sha: str = Query(default="", description="브랜치 이름 또는 커밋 SHA"),
     per_page: int = Query(default=30, ge=1, le=100),
+    include_stats: bool = Query(
+        default=False, description="저장소에 없는 커밋의 변경 통계도 GitHub에서 조회"
+    ),
     access_token: str = Depends(_get_github_token),
 ):
-    """리포지토리 최근 커밋 목록 조회"""
+    """리포지토리 최근 커밋 목록 조회 (저장된 커밋 상세로 변경 통계 보강)"""
     api = GitHubAPIService(access_token)
     commits = await api.get_commits(owner, repo, sha=sha, per_page=per_page)
+    commits = await commit_detail_store.enrich_commits(
+        api, owner, repo, commits, fetch_missing=include_stats
+    )
     items = [
         CommitResponse(
             sha=c["sha"],
@@ -270,6 +331,7 @@ async def get_connected_repos(
 async def connect_repo(
     body: ConnectRepoRequest,
     user: User = Depends(require_current_user),
+    github_token: str = Depends(_get_github_token),
     db: AsyncSession = Depends(get_db),
 ):
     """리포지토리 연동 추가"""
@@ -304,7 +366,6 @@ async def connect_repo(
     await db.refresh(repo)
 
     # 백그라운드 분석 시작
-    github_token = decrypt_token(user.github_repo_token)
     repo_id = repo.id
 
     async def _run_analysis():
@@ -393,6 +454,7 @@ async def get_repo_analysis(
 async def retry_repo_analysis(
     repo_id: int,
     user: User = Depends(require_current_user),
+    github_token: str = Depends(_get_github_token),
     db: AsyncSession = Depends(get_db),
 ):
     """리포지토리 분석 재시도"""
@@ -418,14 +480,13 @@ async def retry_repo_analysis(
     repo.analysis_error = None
     await db.commit()
 
-    github_token = decrypt_token(user.github_repo_token)
-
     async def _run_analysis():
         async with async_session_maker() as bg_db:
             try:
                 github_api = GitHubAPIService(github_token)
                 service = GeminiAnalysisService(github_api)
-                await service.analyze_repo(repo_id, bg_db)
+                # 명시적 재분석: LLM 응답 캐시를 건너뛰고 새로 생성
+                await service.analyze_repo(repo_id, bg_db, use_cache=False)
             except Exception:
                 logger.exception("Background analysis retry failed: repo_id=%d", repo_id)
 
@@ -479,6 +540,7 @@ async def get_deep_analysis(
 async def trigger_deep_analysis(
     repo_id: int,
     user: User = Depends(require_current_user),
+    github_token: str = Depends(_get_github_token),
     db: AsyncSession = Depends(get_db),
 ):
     """심층 분석 수동 트리거"""
@@ -509,7 +571,6 @@ async def trigger_deep_analysis(
     repo.deep_analysis_error = None
     await db.commit()
 
-    github_token = decrypt_token(user.github_repo_token)
     rid = repo.id
 
     async def _run_deep_analysis():
@@ -517,7 +578,7 @@ async def trigger_deep_analysis(
             try:
                 github_api = GitHubAPIService(github_token)
                 service = GeminiAnalysisService(github_api)
-                await service.analyze_repo_deep(rid, bg_db)
+                await service.analyze_repo_deep(rid, bg_db, use_cache=False)
             except Exception:
                 logger.exception(
                     "Background deep analysis failed: repo_id=%d", rid
@@ -539,6 +600,7 @@ async def create_issues_from_suggestions(
     repo_id: int,
     body: CreateIssuesFromSuggestionsRequest,
     user: User = Depends(require_current_user),
+    access_token: str = Depends(_get_github_token),
     db: AsyncSession = Depends(get_db),
 ):
     """선택된 개선 제안을 이슈 티켓으로 일괄 생성"""
@@ -642,10 +704,17 @@ async def create_issues_from_suggestions(
         await db.flush()
 
         suggestion.issue_id = new_issue.id
+        new_issue.ai_plan_status = "generating"
         created_ids.append(new_issue.id)
 
     await db.commit()
 
+    # 생성된 이슈의 AI 작업 계획은 한 번의 배치로 생성
+    if created_ids:
+        schedule_work_plans(
+            created_ids, access_token, priority=LLMPriority.BACKGROUND_PLAN
+        )
+
     return CreateIssuesFromSuggestionsResponse(
         created_count=len(created_ids),
         issue_ids=created_ids,
@@ -691,6 +760,7 @@ async def get_commit_analysis(
 async def trigger_commit_analysis(
     repo_id: int,
     user: User = Depends(require_current_user),
+    github_token: str = Depends(_get_github_token),
     db: AsyncSession = Depends(get_db),
 ):
     """커밋 히스토리 AI 분석 트리거"""
@@ -716,20 +786,21 @@ async def trigger_commit_analysis(
     repo.commit_analysis_error = None
     await db.commit()
 
-    github_token = decrypt_token(user.github_repo_token)
     rid = repo.id
-    owner, repo_name = repo.full_name.split("/", 1)
-    default_branch = repo.default_branch
 
     async def _run_commit_analysis():
         async with async_session_maker() as bg_db:
             try:
                 github_api = GitHubAPIService(github_token)
-                commits = await github_api.get_commits(
-                    owner, repo_name, sha=default_branch, per_page=30
-                )
                 service = GeminiAnalysisService(github_api)
-                await service.analyze_commits(rid, bg_db, commits)
+                # 수동 트리거는 변경 여부와 관계없이 전체 재분석
+                analyzed = await service.refresh_commit_analysis(rid, bg_db, force=True)
+                if not analyzed:
+                    repo_row = await bg_db.get(ConnectedRepo, rid)
+                    if repo_row and repo_row.commit_analysis_status == "pending":
+                        repo_row.commit_analysis_status = "failed"
+                        repo_row.commit_analysis_error = "분석할 커밋이 없습니다"
+                        await bg_db.commit()
             except Exception:
                 logger.exception(
                     "Background commit analysis failed: repo_id=%d", rid
@@ -1,12 +1,14 @@
 """일감 라우터"""
 import asyncio
+import json
 import logging
-from datetime import datetime, timedelta
-from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import AsyncIterator, Optional, List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.config import get_settings
 from src.database import get_db, async_session_maker
 from src.models.issue import IssueStatus, IssuePriority
 from src.models.issue import Issue as IssueModel
@@ -16,21 +18,28 @@ from src.models.connected_repo import ConnectedRepo
 from src.dependencies import get_issue_service, get_queue_service
 from src.services.issue_service import IssueService
 from src.services.queue_service import QueueService
-from src.services.gemini_service import GeminiAnalysisService
+from src.services.gemini_service import GeminiAnalysisService, schedule_work_plans
 from src.services.github_service import GitHubAPIService
+from src.services.plan_stream import plan_stream_broker
 from src.crypto import decrypt_token
 from src.schemas.issue import (
     IssueCreate,
     IssueUpdate,
     IssueResponse,
     IssueListResponse,
+    IssuePlanBatchRequest,
+    IssuePlanBatchResponse,
 )
 from src.schemas.queue import QueueItemResponse
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
 
 router = APIRouter(prefix="/api/issues", tags=["issues"])
 
+# SSE 연결 유지용 주석 전송 간격 (초), 이 간격마다 생성 상태도 다시 확인
+PLAN_STREAM_KEEPALIVE = 15.0
+
 
 def _enrich_issue_response(issue) -> IssueResponse:
     """Add latest_queue_status and pr_status to issue response"""
@@ -89,7 +98,7 @@ async def create_issue(
 
         asyncio.create_task(_generate_plan())
 
-    # 리포가 지정되었고 커밋 분석이 오래되었거나 없으면 백그라운드 갱신
+    # 리포가 지정되었으면 새 커밋이 있을 때만 커밋 분석 백그라운드 갱신
     if data.repo_full_name:
         repo_full_name = data.repo_full_name
 
@@ -109,28 +118,17 @@ async def create_issue(
                     if repo.commit_analysis_status == "analyzing":
                         return
 
-                    # 미분석이거나 1시간 이상 경과하면 갱신
-                    is_stale = (
-                        repo.commit_analysis_status is None
-                        or repo.commit_analyzed_at is None
-                        or (datetime.utcnow() - repo.commit_analyzed_at) > timedelta(hours=1)
-                    )
-                    if not is_stale:
+                    # 웹훅이 설정되어 있으면 push 시 갱신되므로 미분석일 때만 실행.
+                    # 그 외에는 head SHA를 확인하여 새 커밋이 있을 때만 분석한다
+                    if settings.github_webhook_secret and repo.commit_analyzed_sha:
                         return
 
                     if not github_token:
                         return
 
                     github_api = GitHubAPIService(github_token)
-                    owner, repo_name = repo_full_name.split("/", 1)
-                    commits_data = await github_api.get_commits(
-                        owner, repo_name, per_page=30
-                    )
-                    if commits_data:
-                        gemini_service = GeminiAnalysisService(github_api)
-                        await gemini_service.analyze_commits(
-                            repo.id, bg_db, commits_data
-                        )
+                    gemini_service = GeminiAnalysisService(github_api)
+                    await gemini_service.refresh_commit_analysis(repo.id, bg_db)
                 except Exception:
                     logger.exception(
                         "일감 생성 커밋 분석 갱신 실패: repo=%s",
@@ -142,6 +140,30 @@ async def create_issue(
     return _enrich_issue_response(issue)
 
 
+@router.post("/generate-plans", response_model=IssuePlanBatchResponse, status_code=202)
+async def generate_plans_batch(
+    data: IssuePlanBatchRequest,
+    db: AsyncSession = Depends(get_db),
+):
+    """여러 일감의 AI 작업 계획 일괄 생성 (같은 리포 일감은 한 번의 호출로 묶음)"""
+    result = await db.execute(
+        select(IssueModel).where(IssueModel.id.in_(data.issue_ids))
+    )
+    issues = list(result.scalars().all())
+    if not issues:
+        raise HTTPException(status_code=404, detail="일감을 찾을 수 없습니다")
+
+    issue_ids = [issue.id for issue in issues]
+    for issue in issues:
+        issue.ai_plan_status = "generating"
+    await db.commit()
+
+    github_token = await _get_github_token(db)
+    schedule_work_plans(issue_ids, github_token, use_cache=not data.force)
+
+    return IssuePlanBatchResponse(issue_ids=issue_ids)
+
+
 @router.get("", response_model=IssueListResponse)
 async def get_issues(
     status: Optional[IssueStatus] = None,
@@ -198,6 +220,66 @@ async def get_issue(
     return _enrich_issue_response(issue)
 
 
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _plan_status(issue_id: int) -> tuple[Optional[str], Optional[str]]:
+    """새 세션으로 (ai_plan_status, behavior_example) 조회"""
+    async with async_session_maker() as db:
+        result = await db.execute(
+            select(IssueModel.ai_plan_status, IssueModel.behavior_example)
+            .where(IssueModel.id == issue_id)
+        )
+        row = result.one_or_none()
+    return (row[0], row[1]) if row else (None, None)
+
+
+@router.get("/{issue_id}/plan-stream")
+async def stream_work_plan(
+    issue_id: int,
+    request: Request,
+    service: IssueService = Depends(get_issue_service),
+):
+    """AI 작업 계획 생성 진행 상황 (Server-Sent Events)
+
+    이벤트: snapshot(지금까지의 계획 본문), chunk(새 조각), done(status와 최종 본문)
+    """
+    await service.get_issue(issue_id)
+
+    async def events() -> AsyncIterator[str]:
+        async with plan_stream_broker.subscribe(issue_id) as queue:
+            # 구독 등록 후 상태를 확인해야 그 사이에 끝난 생성을 놓치지 않는다
+            if not plan_stream_broker.is_active(issue_id):
+                status_value, plan = await _plan_status(issue_id)
+                if status_value != "generating":
+                    yield _sse("done", {"status": status_value, "text": plan or ""})
+                    return
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), PLAN_STREAM_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    if not plan_stream_broker.is_active(issue_id):
+                        # 다른 프로세스에서 생성 중이거나 이미 끝난 경우
+                        status_value, plan = await _plan_status(issue_id)
+                        if status_value != "generating":
+                            yield _sse("done", {"status": status_value, "text": plan or ""})
+                            return
+                    yield ": keepalive\n\n"
+                    continue
+                if event["event"] == "done":
+                    _, plan = await _plan_status(issue_id)
+                    yield _sse("done", {**event["data"], "text": plan or ""})
+                    return
+                yield _sse(event["event"], event["data"])
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.patch("/{issue_id}", response_model=IssueResponse)
 async def update_issue(
     issue_id: int,
@@ -258,7 +340,9 @@ async def generate_behavior(
             try:
                 github_api = GitHubAPIService(github_token or "")
                 gemini_service = GeminiAnalysisService(github_api)
-                await gemini_service.generate_work_plan(issue_id_val, bg_db)
+                await gemini_service.generate_work_plan(
+                    issue_id_val, bg_db, use_cache=False
+                )
             except Exception:
                 logger.exception(
                     "Background work plan regeneration failed: issue_id=%d",
@@ -21,6 +21,7 @@ class RepoResponse(BaseModel):
 class RepoListResponse(BaseModel):
     """리포지토리 목록 응답"""
     items: List[RepoResponse]
+    fetched_at: Optional[str] = None  # 목록을 GitHub에서 조회한 시각 (UTC)
 
 
 class TreeItemResponse(BaseModel):
@@ -103,3 +103,15 @@ class IssueListResponse(BaseModel):
     """일감 목록 응답"""
     items: List[IssueResponse]
     total: int
+
+
+class IssuePlanBatchRequest(BaseModel):
+    """AI 작업 계획 일괄 생성 요청"""
+    issue_ids: List[int] = Field(..., min_length=1, max_length=200)
+    # True면 같은 입력이라도 새로 생성 (LLM 응답 캐시 무시)
+    force: bool = False
+
+
+class IssuePlanBatchResponse(BaseModel):
+    """AI 작업 계획 일괄 생성 응답 (백그라운드 생성이 시작된 일감)"""
+    issue_ids: List[int]
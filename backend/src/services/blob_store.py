@@ -0,0 +1,122 @@
+"""blob SHA 기준 파일 내용 저장소 (content-addressable)"""
+import logging
+import zlib
+from datetime import datetime
+from typing import Callable, Iterable
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import get_settings
+from src.database import async_session_maker
+from src.models.git_blob import GitBlob
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class BlobStore:
+    """Git blob 내용을 압축 저장하고 SHA로 재사용하는 저장소
+
+    트리에서 얻은 blob SHA로 조회하므로 파일이 바뀌지 않았다면 GitHub에 다시 요청하지 않는다.
+    전체 크기가 max_bytes를 넘으면 가장 오래 사용되지 않은 blob부터 삭제한다.
+    저장소 오류는 분석 실패로 이어지지 않도록 경고 로그만 남긴다.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] = async_session_maker,
+        max_bytes: int = settings.blob_store_max_bytes,
+    ):
+        self.session_factory = session_factory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    async def get_many(self, shas: Iterable[str]) -> dict[str, bytes]:
+        """저장된 blob 일괄 조회 (없는 SHA는 결과에서 제외)"""
+        wanted = set(shas)
+        if not wanted:
+            return {}
+        found: dict[str, bytes] = {}
+        try:
+            async with self.session_factory() as db:
+                result = await db.execute(
+                    select(GitBlob.sha, GitBlob.content).where(GitBlob.sha.in_(wanted))
+                )
+                for sha, content in result.all():
+                    found[sha] = zlib.decompress(content)
+                if found:
+                    await db.execute(
+                        update(GitBlob)
+                        .where(GitBlob.sha.in_(found))
+                        .values(last_used_at=datetime.utcnow())
+                    )
+                    await db.commit()
+        except Exception as e:
+            logger.warning("blob 저장소 조회 실패: %s", e)
+        self.hits += len(found)
+        self.misses += len(wanted) - len(found)
+        return found
+
+    async def put_many(self, blobs: dict[str, bytes]) -> None:
+        """blob 일괄 저장 후 크기 한도 초과분 정리
+
+        이미 있는 SHA는 건너뛴다. 같은 리포를 동시에 분석해 같은 SHA를 저장해도
+        충돌한 행만 무시되고 나머지는 저장된다.
+        """
+        if not blobs:
+            return
+        now = datetime.utcnow()
+        rows = [
+            {
+                "sha": sha, "content": zlib.compress(data), "size": len(data),
+                "created_at": now, "last_used_at": now,
+            }
+            for sha, data in blobs.items()
+        ]
+        try:
+            async with self.session_factory() as db:
+                dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+                await db.execute(
+                    dialect.insert(GitBlob).on_conflict_do_nothing(index_elements=["sha"]),
+                    rows,
+                )
+                await db.commit()
+                await self._evict(db)
+        except Exception as e:
+            logger.warning("blob 저장소 저장 실패: %s", e)
+
+    async def _evict(self, db: AsyncSession) -> None:
+        """크기 한도를 넘으면 가장 오래 사용되지 않은 blob부터 삭제"""
+        if self.max_bytes <= 0:
+            return
+        total = await db.scalar(select(func.coalesce(func.sum(GitBlob.size), 0)))
+        excess = (total or 0) - self.max_bytes
+        if excess <= 0:
+            return
+        result = await db.execute(
+            select(GitBlob.sha, GitBlob.size).order_by(GitBlob.last_used_at)
+        )
+        evicted: list[str] = []
+        for sha, size in result.all():
+            if excess <= 0:
+                break
+            evicted.append(sha)
+            excess -= size
+        await db.execute(delete(GitBlob).where(GitBlob.sha.in_(evicted)))
+        await db.commit()
+        logger.info("blob 저장소 크기 한도 초과, %d개 blob 삭제", len(evicted))
+
+    def stats(self) -> dict:
+        """히트/미스 카운터"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+blob_store = BlobStore()
@@ -0,0 +1,133 @@
+"""커밋 SHA 기준 커밋 상세 저장소"""
+import asyncio
+import json
+import logging
+from typing import Callable, Iterable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import get_settings
+from src.database import async_session_maker
+from src.models.commit_detail import CommitDetail
+from src.services.github_service import GitHubAPIService
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# 저장하는 커밋당 최대 파일 경로 수
+MAX_STORED_FILES = 100
+
+
+def _to_dict(entry: CommitDetail) -> dict:
+    return {
+        "sha": entry.sha,
+        "additions": entry.additions,
+        "deletions": entry.deletions,
+        "total": entry.total,
+        "files_changed": entry.files_changed,
+        "files": json.loads(entry.files),
+    }
+
+
+class CommitDetailStore:
+    """/commits/{sha} 응답의 요약을 영구 저장하여 커밋마다 한 번만 조회
+
+    커밋 목록 API는 stats/files를 주지 않으므로 분석 대상 커밋의 상세를 채울 때 사용한다.
+    """
+
+    def __init__(
+        self, session_factory: Callable[[], AsyncSession] = async_session_maker
+    ):
+        self.session_factory = session_factory
+
+    async def get_many(self, shas: Iterable[str]) -> dict[str, dict]:
+        """저장된 커밋 상세 일괄 조회"""
+        wanted = set(shas)
+        if not wanted:
+            return {}
+        try:
+            async with self.session_factory() as db:
+                result = await db.execute(
+                    select(CommitDetail).where(CommitDetail.sha.in_(wanted))
+                )
+                return {entry.sha: _to_dict(entry) for entry in result.scalars().all()}
+        except Exception as e:
+            logger.warning("커밋 상세 조회 실패: %s", e)
+            return {}
+
+    async def put_many(self, details: Iterable[dict]) -> None:
+        """커밋 상세 일괄 저장 (이미 있는 SHA는 건너뜀)"""
+        details = {d["sha"]: d for d in details}
+        if not details:
+            return
+        try:
+            async with self.session_factory() as db:
+                result = await db.execute(
+                    select(CommitDetail.sha).where(CommitDetail.sha.in_(details.keys()))
+                )
+                existing = set(result.scalars().all())
+                for sha, d in details.items():
+                    if sha in existing:
+                        continue
+                    db.add(CommitDetail(
+                        sha=sha,
+                        additions=d["additions"],
+                        deletions=d["deletions"],
+                        total=d["total"],
+                        files_changed=d["files_changed"],
+                        files=json.dumps(d["files"][:MAX_STORED_FILES], ensure_ascii=False),
+                    ))
+                await db.commit()
+        except Exception as e:
+            logger.warning("커밋 상세 저장 실패: %s", e)
+
+    async def enrich_commits(
+        self,
+        github: GitHubAPIService,
+        owner: str,
+        repo: str,
+        commits: list[dict],
+        fetch_missing: bool = True,
+    ) -> list[dict]:
+        """커밋 목록(get_commits 결과)에 stats / files_changed / files 채우기
+
+        저장소에 없는 커밋은 fetch_missing일 때만 동시에 조회하여 저장한다.
+        """
+        details = await self.get_many(c["sha"] for c in commits)
+
+        missing = [c["sha"] for c in commits if c["sha"] not in details]
+        if missing and fetch_missing:
+            semaphore = asyncio.Semaphore(max(1, settings.github_commit_detail_concurrency))
+
+            async def fetch(sha: str):
+                async with semaphore:
+                    try:
+                        return await github.get_commit_detail(owner, repo, sha)
+                    except Exception as e:
+                        logger.warning("커밋 상세 조회 실패: %s — %s", sha[:7], e)
+                        return None
+
+            fetched = [d for d in await asyncio.gather(*(fetch(sha) for sha in missing)) if d]
+            await self.put_many(fetched)
+            details.update({d["sha"]: d for d in fetched})
+
+        enriched = []
+        for c in commits:
+            d = details.get(c["sha"])
+            if d:
+                c = {
+                    **c,
+                    "stats": {
+                        "additions": d["additions"],
+                        "deletions": d["deletions"],
+                        "total": d["total"],
+                    },
+                    "files_changed": d["files_changed"],
+                    "files": d["files"],
+                }
+            enriched.append(c)
+        return enriched
+
+
+commit_detail_store = CommitDetailStore()
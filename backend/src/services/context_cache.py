@@ -0,0 +1,185 @@
+"""리포 분석 컨텍스트용 Gemini 서버 측 캐시 (cachedContents)
+
+작업 계획 생성마다 같은 리포 분석 결과를 다시 보내는 대신, (리포, 분석 버전)별로
+cachedContent를 한 번 만들고 이후 호출에서는 이름만 참조한다.
+분석 결과가 바뀌면 버전(내용 해시)이 달라지므로 낡은 컨텍스트가 재사용되지 않는다.
+이전 항목은 아직 진행 중인 호출이 참조하고 있을 수 있으므로 서버에서 즉시 삭제하지 않고
+로컬 매핑만 버린 뒤 TTL로 만료되게 둔다.
+"""
+import asyncio
+import hashlib
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Optional, Protocol
+
+from src.config import get_settings
+from src.http_client import request_with_retry
+from src.metrics import gemini_context_cache_requests
+from src.services.prompt_packer import estimate_tokens
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+GEMINI_API_ROOT = "https://generativelanguage.googleapis.com/v1beta"
+
+# 모델별 컨텍스트 캐시 최소 토큰 수 (이보다 작으면 프롬프트에 직접 포함)
+MIN_CACHE_TOKENS = {
+    "gemini-2.5-flash": 1024,
+    "gemini-2.5-pro": 4096,
+}
+DEFAULT_MIN_CACHE_TOKENS = 4096
+# 만료가 이 시간 안으로 다가온 항목은 새로 만든다 (호출 도중 만료 방지)
+EXPIRY_MARGIN_SECONDS = 60
+
+
+class CachedContentError(RuntimeError):
+    """API가 cachedContent 참조를 거부함 (만료/삭제 등)"""
+
+
+def is_cached_content_rejection(status_code: int, detail: str) -> bool:
+    """cachedContent 참조 실패 응답인지 (호출자는 컨텍스트를 프롬프트에 넣어 재시도)"""
+    return status_code in (400, 403, 404) and "cach" in detail.lower()
+
+
+@dataclass
+class CachedContext:
+    """서버 측 캐시 항목 (text는 참조가 거부될 때 프롬프트에 직접 넣는 원문)"""
+    name: str
+    version: str
+    expires_at: float  # time.monotonic() 기준
+    text: str = field(default="", repr=False)
+
+    @property
+    def fresh(self) -> bool:
+        return self.expires_at - time.monotonic() > EXPIRY_MARGIN_SECONDS
+
+
+class ContextCacheBackend(Protocol):
+    """컨텍스트 캐시 저장소 인터페이스"""
+
+    async def create(self, model: str, text: str, ttl_seconds: int) -> str:
+        """캐시 항목을 만들고 이름 반환 (ttl_seconds 후 서버에서 만료)"""
+        ...
+
+
+class GeminiContextCacheBackend:
+    """Gemini cachedContents API"""
+
+    async def create(self, model: str, text: str, ttl_seconds: int) -> str:
+        response = await request_with_retry(
+            "POST",
+            f"{GEMINI_API_ROOT}/cachedContents?key={settings.gemini_api_key}",
+            json={
+                "model": f"models/{model}",
+                "contents": [{"role": "user", "parts": [{"text": text}]}],
+                "ttl": f"{ttl_seconds}s",
+            },
+            headers={"Content-Type": "application/json"},
+            timeout=60.0,
+            max_retries=1,
+        )
+        if response.status_code != 200:
+            raise RuntimeError(
+                f"Gemini 컨텍스트 캐시 생성 실패 ({response.status_code}): {response.text[:300]}"
+            )
+        return response.json()["name"]
+
+
+class LocalContextCacheBackend:
+    """테스트/로컬 개발용 인메모리 대체 구현"""
+
+    def __init__(self):
+        self.entries: dict[str, tuple[str, str]] = {}  # name → (model, text)
+        self._ids = itertools.count(1)
+
+    async def create(self, model: str, text: str, ttl_seconds: int) -> str:
+        name = f"cachedContents/local-{next(self._ids)}"
+        self.entries[name] = (model, text)
+        return name
+
+
+class RepoContextCache:
+    """(리포 ID, 모델, 컨텍스트 종류) → 서버 측 캐시 항목 (분석 버전별)
+
+    kind는 같은 리포의 서로 다른 컨텍스트를 구분한다
+    (analysis: 작업 계획용 기본+심층 분석, phase1: 심층 분석에 쓰는 Phase 1 결과).
+
+    캐시 생성 실패는 작업 계획 생성 실패로 이어지지 않도록 None을 반환하고,
+    호출자는 컨텍스트를 프롬프트에 직접 포함한다.
+    """
+
+    def __init__(
+        self,
+        backend: ContextCacheBackend,
+        ttl_seconds: int = settings.gemini_context_cache_ttl_seconds,
+    ):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[tuple[int, str, str], CachedContext] = {}
+        self._locks: dict[tuple[int, str, str], asyncio.Lock] = {}
+        self.hits = 0
+        self.creates = 0
+
+    @staticmethod
+    def version_of(text: str) -> str:
+        return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+    async def get_or_create(
+        self, repo_id: int, model: str, text: str, kind: str = "analysis"
+    ) -> Optional[CachedContext]:
+        """컨텍스트 텍스트에 해당하는 캐시 항목 (캐시하기에 너무 작거나 실패하면 None)"""
+        if self.ttl_seconds <= 0:
+            return None
+        if estimate_tokens(text) < MIN_CACHE_TOKENS.get(model, DEFAULT_MIN_CACHE_TOKENS):
+            gemini_context_cache_requests.inc(kind=kind, outcome="skip")
+            return None
+
+        key = (repo_id, model, kind)
+        version = self.version_of(text)
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            entry = self._entries.get(key)
+            if entry and entry.version == version and entry.fresh:
+                self.hits += 1
+                gemini_context_cache_requests.inc(kind=kind, outcome="hit")
+                return entry
+            # 분석 버전이 바뀌었거나 곧 만료됨: 이전 항목은 TTL로 만료되도록 두고 새로 생성
+            try:
+                name = await self.backend.create(model, text, self.ttl_seconds)
+            except Exception as e:
+                logger.warning("컨텍스트 캐시 생성 실패 (repo_id=%d): %s", repo_id, e)
+                self._entries.pop(key, None)
+                gemini_context_cache_requests.inc(kind=kind, outcome="error")
+                return None
+            entry = CachedContext(
+                name=name, version=version,
+                expires_at=time.monotonic() + self.ttl_seconds, text=text,
+            )
+            self._entries[key] = entry
+            self.creates += 1
+            gemini_context_cache_requests.inc(kind=kind, outcome="create")
+            logger.info("컨텍스트 캐시 생성: repo_id=%d %s/%s → %s", repo_id, model, kind, name)
+            return entry
+
+    def invalidate_repo(self, repo_id: int, kind: Optional[str] = None) -> None:
+        """리포 분석이 갱신되면 해당 리포의 항목을 더 이상 참조하지 않음 (kind 지정 시 그 종류만)
+
+        서버 측 항목은 진행 중인 호출이 참조하고 있을 수 있으므로 삭제하지 않고 TTL로 만료시킨다.
+        """
+        for key in [
+            k for k in self._entries
+            if k[0] == repo_id and (kind is None or k[2] == kind)
+        ]:
+            del self._entries[key]
+
+    def discard(self, entry: CachedContext) -> None:
+        """API가 참조를 거부한 항목을 매핑에서 제거 (다음 호출에서 새로 생성)"""
+        for key in [k for k, e in self._entries.items() if e.name == entry.name]:
+            del self._entries[key]
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "creates": self.creates}
+
+
+repo_context_cache = RepoContextCache(GeminiContextCacheBackend())
@@ -1,17 +1,49 @@
 """Gemini API를 이용한 리포지토리 분석 서비스"""
+import asyncio
 import base64
 import json
 import logging
 import re
-from typing import Optional, List
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Optional, List
 from datetime import datetime
 
-from sqlalchemy import select, delete
+import httpx
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.config import get_settings
-from src.http_client import request_with_retry
+from src.database import async_session_maker
+from src.http_client import request_with_retry, retry_delay, stream_request
+from src.metrics import (
+    gemini_request_duration,
+    gemini_hedged_requests,
+    gemini_model_downgrades,
+    gemini_requests,
+    gemini_stream_first_chunk,
+    github_file_fetch_duration,
+)
+from src.services.blob_store import BlobStore, blob_store as _default_blob_store
+from src.services.commit_store import CommitDetailStore, commit_detail_store
+from src.services.context_cache import (
+    CachedContentError,
+    CachedContext,
+    RepoContextCache,
+    is_cached_content_rejection,
+    repo_context_cache,
+)
 from src.services.github_service import GitHubAPIService
+from src.services.latency_tracker import LatencyTracker, gemini_latency_tracker
+from src.services.llm_cache import LLMResponseCache, llm_response_cache
+from src.services.llm_scheduler import LLMPriority, LLMScheduler, llm_scheduler
+from src.services.plan_stream import PlanStreamBroker, plan_stream_broker
+from src.services.prompt_packer import (
+    PromptPacker,
+    estimate_tokens,
+    truncate_to_tokens,
+)
+from src.services.repo_archive import fetch_files_from_archive
 from src.models.connected_repo import ConnectedRepo
 from src.models.deep_analysis_suggestion import (
     DeepAnalysisSuggestion,
@@ -70,19 +102,147 @@ DEEP_ANALYSIS_EXTENSIONS = {
 
 MAX_DEEP_CONTENT_BYTES = 300 * 1024  # 300KB
 MAX_FILES_TO_ANALYZE = 30
-MAX_DEEP_FILE_SIZE = 8192  # 파일당 8KB
+
+# ── 프롬프트 섹션별 토큰 예산 (모델 입력 예산 안에서 우선순위대로 배정) ──
+PHASE1_TREE_TOKENS = 6_000
+PHASE1_FILES_TOKENS = 30_000
+DEEP_FILES_TOKENS = 80_000
+PHASE1_SUMMARY_TOKENS = 1_500  # 다른 프롬프트에 포함하는 Phase 1 결과
+REPO_CONTEXT_TOKENS = 3_000  # 작업 계획용 리포 분석 컨텍스트 (기본 + 심층)
+# 컨텍스트 캐시에 올리는 리포 분석 컨텍스트 (한 번 올려두고 참조하므로 더 넉넉하게)
+CACHED_REPO_CONTEXT_TOKENS = 32_000
+REPO_SUMMARY_TOKENS = 300  # 리포 미지정 시 연결 리포별 요약
+USER_INPUT_TOKENS = 8_000
+
+# 작업 계획 본문 구성 (단건/배치 프롬프트 공통)
+WORK_PLAN_SECTIONS = """
+### 작업 계획
+1. 구체적인 단계별 작업 내용 (실제 파일 경로와 모듈명 사용)
+2. 기존 코드 구조를 고려한 구현 방법
+3. 기술적 고려사항
+
+### 예상 동작
+- 구현 완료 후 시스템의 예상 동작
+- 사용자 시나리오 관점의 기대 결과
+
+### 체크리스트
+- [ ] 구현 확인 항목
+- [ ] 테스트 항목
+
+### 주의사항
+- 구현 시 주의할 점 (기존 코드와의 호환성 등)
+
+"""
+# 배치 작업 계획: 한 번의 호출로 처리하는 같은 리포 일감 수, 일감별 설명 토큰 상한
+WORK_PLAN_BATCH_SIZE = 8
+BATCH_ISSUE_INPUT_TOKENS = 2_000
+
+# 스트리밍 호출 시도 횟수 (첫 조각 전 429/5xx·네트워크 오류만 재시도)
+STREAM_MAX_ATTEMPTS = 2
+# 스트리밍 작업 계획의 중간 결과를 DB(behavior_example)에 반영하는 최소 간격(초)
+PLAN_FLUSH_INTERVAL = 1.0
+_PLAN_META_RE = re.compile(r"```json\s*\n(.*?)\n\s*```", re.DOTALL)
+# map-reduce 병합 단계에서 최종 제안 수 상한
+MAX_REDUCED_SUGGESTIONS = 20
+# reduce 프롬프트 예산이 부족할 때 후보를 남기는 순서
+DEEP_SEVERITY_ORDER = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+
+# 커밋 분석: 마지막 분석 이후 새 커밋이 이 수 이하면 기존 요약을 증분 갱신
+MAX_INCREMENTAL_COMMITS = 30
+
+
+@dataclass
+class RepoSnapshot:
+    """분석 시점의 리포지토리 상태 (커밋 SHA + 파일별 blob SHA)"""
+    commit_sha: Optional[str]
+    blob_shas: dict[str, str] = field(default_factory=dict)
+    total_bytes: int = 0
+    truncated: bool = False
+    tree_sha: Optional[str] = None
+
+    @classmethod
+    def from_tree(cls, tree_data: dict, commit_sha: Optional[str] = None) -> "RepoSnapshot":
+        """트리 응답에서 파일 경로 → blob SHA 매핑 추출 (트리 순서 유지)"""
+        blob_shas: dict[str, str] = {}
+        total_bytes = 0
+        for item in tree_data.get("tree", []):
+            if item.get("type") == "blob":
+                blob_shas[item["path"]] = item.get("sha", "")
+                total_bytes += item.get("size") or 0
+        return cls(
+            commit_sha=commit_sha,
+            blob_shas=blob_shas,
+            total_bytes=total_bytes,
+            truncated=bool(tree_data.get("truncated")),
+            tree_sha=tree_data.get("sha"),
+        )
+
+    @property
+    def paths(self) -> list[str]:
+        return list(self.blob_shas)
+
+
+@dataclass
+class WorkPlanMetadata:
+    """작업 계획 생성에 쓰는 라벨 / 연결 리포 목록"""
+    labels: list[Label]
+    repos: list[ConnectedRepo]
+
+    @property
+    def label_names(self) -> list[str]:
+        return [l.name for l in self.labels]
+
+    @property
+    def label_map(self) -> dict[str, int]:
+        return {l.name: l.id for l in self.labels}
+
+    @property
+    def repo_map(self) -> dict[str, ConnectedRepo]:
+        return {r.full_name: r for r in self.repos}
+
+    @property
+    def repo_list_text(self) -> str:
+        return "\n".join(
+            f"- {r.full_name}: {r.description}" if r.description else f"- {r.full_name}"
+            for r in self.repos
+        ) or "(연결된 리포지토리 없음)"
 
 
 class GeminiAnalysisService:
     """리포지토리 분석 서비스 (Gemini API)"""
 
-    def __init__(self, github_service: GitHubAPIService):
+    def __init__(
+        self,
+        github_service: GitHubAPIService,
+        blob_store: Optional[BlobStore] = None,
+        commit_store: Optional[CommitDetailStore] = None,
+        llm_cache: Optional[LLMResponseCache] = None,
+        plan_broker: Optional[PlanStreamBroker] = None,
+        scheduler: Optional[LLMScheduler] = None,
+        context_cache: Optional[RepoContextCache] = None,
+        latency_tracker: Optional[LatencyTracker] = None,
+    ):
         self.github = github_service
+        self.blob_store = blob_store or _default_blob_store
+        self.commit_store = commit_store or commit_detail_store
+        self.llm_cache = llm_cache or llm_response_cache
+        self.plan_broker = plan_broker or plan_stream_broker
+        self.scheduler = scheduler or llm_scheduler
+        self.context_cache = context_cache or repo_context_cache
+        self.latency = latency_tracker or gemini_latency_tracker
 
     async def analyze_repo(
-        self, repo_id: int, db: AsyncSession, auto_deep_analysis: bool = True
+        self,
+        repo_id: int,
+        db: AsyncSession,
+        auto_deep_analysis: bool = True,
+        use_cache: bool = True,
     ) -> None:
-        """Phase 1: 리포지토리를 분석하고 결과를 DB에 저장"""
+        """Phase 1: 리포지토리를 분석하고 결과를 DB에 저장
+
+        루트 트리 SHA가 마지막 분석과 같으면 Gemini 호출 없이 기존 결과를 유지한다.
+        use_cache=False면 지문과 LLM 응답 캐시를 무시하고 다시 분석한다 (Phase 2에도 전달).
+        """
         result = await db.execute(
             select(ConnectedRepo).where(ConnectedRepo.id == repo_id)
         )
@@ -91,6 +251,9 @@ class GeminiAnalysisService:
             logger.error("ConnectedRepo not found: id=%d", repo_id)
             return
 
+        previous_completed = (
+            repo.analysis_status == "completed" and bool(repo.analysis_result)
+        )
         repo.analysis_status = "analyzing"
         repo.analysis_error = None
         await db.commit()
@@ -99,36 +262,52 @@ class GeminiAnalysisService:
             owner, repo_name = repo.full_name.split("/", 1)
 
             # 트리 조회
-            tree_data = await self.github.get_repo_tree(
+            commit_sha, tree_data = await self.github.resolve_repo_tree(
                 owner, repo_name, repo.default_branch
             )
-            file_paths = [
-                item["path"]
-                for item in tree_data.get("tree", [])
-                if item.get("type") == "blob"
-            ]
+            snapshot = RepoSnapshot.from_tree(tree_data, commit_sha)
+            file_paths = snapshot.paths
+
+            if (
+                use_cache
+                and previous_completed
+                and snapshot.tree_sha
+                and snapshot.tree_sha == repo.analysis_tree_sha
+            ):
+                repo.analysis_status = "completed"
+                await db.commit()
+                logger.info("Phase 1 분석 스킵 (트리 변경 없음): %s", repo.full_name)
+                if auto_deep_analysis:
+                    await self.analyze_repo_deep(repo_id, db)
+                return
 
             # 주요 파일 내용 가져오기
-            files_content = await self._fetch_key_files(owner, repo_name, file_paths)
+            files_content = await self._fetch_key_files(
+                owner, repo_name, file_paths, snapshot
+            )
 
             # 프롬프트 생성 + Gemini 호출
             prompt = self._build_prompt(
                 repo.full_name, repo.description, file_paths, files_content
             )
-            analysis = await self._call_gemini(prompt)
+            analysis = await self._call_gemini(
+                prompt, use_cache=use_cache, priority=LLMPriority.REPO_ANALYSIS
+            )
 
             # 결과 저장
             repo.analysis_status = "completed"
             repo.analysis_result = analysis
             repo.analysis_error = None
             repo.analyzed_at = datetime.utcnow()
+            repo.analysis_tree_sha = snapshot.tree_sha
             await db.commit()
+            self.context_cache.invalidate_repo(repo_id)
 
             logger.info("Phase 1 분석 완료: %s (id=%d)", repo.full_name, repo_id)
 
             # Phase 2 자동 체이닝
             if auto_deep_analysis:
-                await self.analyze_repo_deep(repo_id, db)
+                await self.analyze_repo_deep(repo_id, db, use_cache=use_cache)
 
         except Exception as e:
             logger.exception("분석 실패: %s (id=%d)", repo.full_name, repo_id)
@@ -138,7 +317,11 @@ class GeminiAnalysisService:
             await db.commit()
 
     async def _fetch_key_files(
-        self, owner: str, repo: str, all_paths: list[str]
+        self,
+        owner: str,
+        repo: str,
+        all_paths: list[str],
+        snapshot: Optional[RepoSnapshot] = None,
     ) -> dict[str, str]:
         """주요 파일들의 내용 가져오기 (100KB 제한)"""
         path_set = set(all_paths)
@@ -151,28 +334,144 @@ class GeminiAnalysisService:
             if ep in path_set and ep not in files_to_fetch:
                 files_to_fetch.append(ep)
 
+        return await self._collect_files(
+            owner, repo, files_to_fetch, snapshot, MAX_CONTENT_BYTES
+        )
+
+    async def _collect_files(
+        self,
+        owner: str,
+        repo: str,
+        paths: list[str],
+        snapshot: Optional[RepoSnapshot],
+        max_bytes: int,
+    ) -> dict[str, str]:
+        """우선순위 순서대로 파일 내용을 모으되 max_bytes를 넘지 않도록 선택
+
+        blob SHA를 아는 파일은 blob 저장소에서 먼저 찾는다. 없는 파일이 많으면
+        tarball 한 번으로 받아오고, 그래도 없는 파일만 파일 단위로 요청한다.
+
+        파일 요청은 우선순위 순서의 슬라이딩 윈도우로 동시에 보내지만, 채택 여부는
+        항상 우선순위 순서대로 판단하므로 결과는 순차 조회와 동일하다.
+        예산이 차면 남은 요청은 취소한다.
+        """
+        blob_shas = snapshot.blob_shas if snapshot else {}
+        stored = await self.blob_store.get_many(
+            blob_shas[p] for p in paths if blob_shas.get(p)
+        )
+        archived: dict[str, bytes] = {}
+        fetched: dict[str, bytes] = {}
+
+        missing = [p for p in paths if blob_shas.get(p) and blob_shas[p] not in stored]
+        if missing and self._use_archive(snapshot, len(missing)):
+            extracted = await self._fetch_from_archive(
+                owner, repo, snapshot.commit_sha, missing, max_bytes
+            )
+            for path, data in extracted.items():
+                archived[blob_shas[path]] = data
+
+        timings: dict[str, float] = {}
+
+        async def load(path: str) -> Optional[str]:
+            started = time.perf_counter()
+            sha = blob_shas.get(path)
+            if not sha:
+                source = "contents"
+                content = await self._get_file_content(owner, repo, path)
+            else:
+                if sha in stored:
+                    source, data = "store", stored[sha]
+                elif sha in archived:
+                    source, data = "archive", archived[sha]
+                else:
+                    source = "blob"
+                    data = await self.github.get_blob(owner, repo, sha)
+                    if data is not None:
+                        fetched[sha] = data
+                content = data.decode("utf-8", errors="replace") if data else None
+            elapsed = time.perf_counter() - started
+            timings[path] = elapsed
+            github_file_fetch_duration.observe(elapsed, source=source)
+            return content
+
+        concurrency = max(1, settings.github_fetch_concurrency)
+        tasks: dict[int, asyncio.Task] = {}
+
+        def schedule(index: int) -> None:
+            if index < len(paths):
+                tasks[index] = asyncio.create_task(load(paths[index]))
+
+        for index in range(concurrency):
+            schedule(index)
+
         result: dict[str, str] = {}
         total_bytes = 0
-
-        for file_path in files_to_fetch:
-            if total_bytes >= MAX_CONTENT_BYTES:
-                break
-            try:
-                content = await self._get_file_content(owner, repo, file_path)
+        try:
+            for index, path in enumerate(paths):
+                if total_bytes >= max_bytes:
+                    break
+                task = tasks.pop(index)
+                schedule(index + concurrency)
+                try:
+                    content = await task
+                except Exception as e:
+                    logger.warning("파일 조회 실패: %s — %s", path, e)
+                    continue
                 if content:
                     content_bytes = len(content.encode("utf-8"))
-                    if total_bytes + content_bytes <= MAX_CONTENT_BYTES:
-                        result[file_path] = content
+                    if total_bytes + content_bytes <= max_bytes:
+                        result[path] = content
                         total_bytes += content_bytes
-            except Exception as e:
-                logger.warning("파일 조회 실패: %s — %s", file_path, e)
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
 
+        if timings:
+            slowest = max(timings, key=timings.get)
+            logger.info(
+                "파일 수집: %s/%s 채택 %d/%d개 (%d bytes), 최장 %s %.2fs, 취소 %d개",
+                owner, repo, len(result), len(timings), total_bytes,
+                slowest, timings[slowest], len(tasks),
+            )
+            logger.debug(
+                "파일별 조회 시간: %s",
+                {path: round(elapsed, 3) for path, elapsed in timings.items()},
+            )
+
+        await self.blob_store.put_many({**archived, **fetched})
         return result
 
+    @staticmethod
+    def _use_archive(snapshot: Optional[RepoSnapshot], missing_count: int) -> bool:
+        """tarball 일괄 다운로드 사용 여부 (대형 리포는 파일별 요청)"""
+        mode = settings.github_fetch_mode
+        if mode == "blob" or not snapshot or not snapshot.commit_sha:
+            return False
+        if snapshot.truncated or snapshot.total_bytes > settings.github_archive_max_bytes:
+            return False
+        if mode == "archive":
+            return True
+        return missing_count >= settings.github_archive_min_files
+
+    async def _fetch_from_archive(
+        self, owner: str, repo: str, ref: str, paths: list[str], max_file_bytes: int
+    ) -> dict[str, bytes]:
+        """tarball에서 파일 추출 (실패 시 빈 결과 → 파일별 요청으로 대체)"""
+        try:
+            return await fetch_files_from_archive(
+                self.github, owner, repo, ref, paths,
+                max_file_bytes=max_file_bytes,
+                max_download_bytes=settings.github_archive_max_bytes,
+            )
+        except Exception as e:
+            logger.warning("tarball 추출 실패, 파일별 요청으로 대체: %s/%s — %s", owner, repo, e)
+            return {}
+
     async def _get_file_content(
         self, owner: str, repo: str, path: str
     ) -> Optional[str]:
-        """GitHub Contents API로 파일 내용 조회 (base64 디코딩)"""
+        """GitHub Contents API로 파일 내용 조회 (base64 디코딩, blob SHA를 모를 때 사용)"""
         url = f"https://api.github.com/repos/{owner}/{repo}/contents/{path}"
         response = await request_with_retry(
             "GET", url, headers=self.github.headers
@@ -191,31 +490,24 @@ class GeminiAnalysisService:
         file_paths: list[str],
         files_content: dict[str, str],
     ) -> str:
-        """Gemini 분석 프롬프트 생성"""
-        tree_lines = file_paths[:500]
-        tree_text = "\n".join(tree_lines)
-        if len(file_paths) > 500:
-            tree_text += f"\n... and {len(file_paths) - 500} more files"
-
-        files_section = ""
-        for path, content in files_content.items():
-            truncated = content[:10240]
-            if len(content) > 10240:
-                truncated += "\n... (truncated)"
-            files_section += f"\n### {path}\n```\n{truncated}\n```\n"
-
-        return f"""You are a senior software engineer. Analyze the following GitHub repository and provide a comprehensive project analysis.
-
-Repository: {full_name}
-{f'Description: {description}' if description else ''}
-
-## File Tree
-```
-{tree_text}
-```
-
-## Key File Contents
-{files_section}
+        """Gemini 분석 프롬프트 생성 (주요 파일 > 파일 트리 순으로 토큰 예산 배정)"""
+        packer = PromptPacker.for_model(GEMINI_MODEL_FLASH)
+        packer.add_fixed(
+            "You are a senior software engineer. Analyze the following GitHub repository "
+            "and provide a comprehensive project analysis.\n\n"
+            f"Repository: {full_name}\n"
+            f"{f'Description: {description}' if description else ''}\n\n"
+            "## File Tree\n```\n"
+        )
+        packer.add(
+            "file_tree", "\n".join(file_paths),
+            priority=2, max_tokens=PHASE1_TREE_TOKENS,
+        )
+        packer.add_fixed("\n```\n\n## Key File Contents\n")
+        packer.add_files(
+            "key_files", files_content, priority=1, max_tokens=PHASE1_FILES_TOKENS
+        )
+        packer.add_fixed("""
 
 ## Required Analysis (respond in Korean)
 
@@ -248,31 +540,224 @@ What is this project? What problem does it solve? (2-3 sentences)
 - Dependencies and setup instructions
 
 Keep the analysis concise but comprehensive. Focus on information that would help a developer quickly understand the codebase and start contributing.
-"""
+""")
+        packed = packer.pack()
+        if packed.dropped:
+            logger.info("Phase 1 프롬프트 축약 (%s): %s", full_name, packed.report())
+        return packed.text
 
     async def _call_gemini(
-        self, prompt: str, model: str = GEMINI_MODEL_FLASH
+        self,
+        prompt: str,
+        model: str = GEMINI_MODEL_FLASH,
+        generation_config: Optional[dict] = None,
+        use_cache: bool = True,
+        priority: LLMPriority = LLMPriority.DEEP_ANALYSIS,
+        cached_content: Optional[CachedContext] = None,
     ) -> str:
-        """Gemini API 호출 (model: flash 또는 pro)"""
+        """Gemini API 호출 (model: flash 또는 pro)
+
+        같은 (모델, 프롬프트, 생성 설정)의 응답이 캐시에 있으면 API를 호출하지 않는다.
+        use_cache=False는 명시적 재생성용으로, 캐시를 읽지 않고 새 응답으로 덮어쓴다.
+        실제 호출은 전역 스케줄러에서 priority 순서와 모델별 RPM/TPM 한도에 따라 실행된다.
+        cached_content가 주어지면 서버 측 캐시 컨텍스트 뒤에 prompt를 이어 보내고,
+        API가 그 참조를 거부하면 컨텍스트 원문을 prompt 앞에 붙여 한 번 다시 호출한다.
+        입력 크기로 모델을 고르고, 응답이 늦거나 실패하면 백업 모델로 hedge 요청한다.
+        """
         if not settings.gemini_api_key:
             raise ValueError("GEMINI_API_KEY가 설정되지 않았습니다")
 
-        url = f"{GEMINI_BASE_URL}/{model}:generateContent?key={settings.gemini_api_key}"
-        body = {
+        tokens = estimate_tokens(prompt)
+        model = self._choose_model(model, tokens, cached_content)
+        cache_config = self._response_cache_config(generation_config, cached_content)
+        if use_cache:
+            cached = await self.llm_cache.get(model, prompt, cache_config)
+            if cached is not None:
+                return cached
+        else:
+            self.llm_cache.record_bypass(model)
+
+        body: dict = {
             "contents": [{"parts": [{"text": prompt}]}],
         }
+        if generation_config:
+            body["generationConfig"] = generation_config
+        if cached_content:
+            body["cachedContent"] = cached_content.name
 
-        response = await request_with_retry(
-            "POST",
-            url,
-            json=body,
-            headers={"Content-Type": "application/json"},
-            timeout=120.0,
-            max_retries=2,
+        try:
+            text, answered_model = await self._hedged_request(
+                model, body, tokens, priority, self._backup_model(model, cached_content)
+            )
+        except CachedContentError as e:
+            logger.warning("캐시 컨텍스트 참조 거부, 원문을 포함해 재시도: %s", e)
+            self.context_cache.discard(cached_content)
+            return await self._call_gemini(
+                self._inline_prompt(prompt, cached_content), model,
+                generation_config, use_cache, priority,
+            )
+        # 백업 모델의 응답은 그 모델의 키로 저장 (요청 모델의 응답으로 재사용하지 않음)
+        await self.llm_cache.put(answered_model, prompt, text, cache_config)
+        return text
+
+    @staticmethod
+    def _choose_model(
+        model: str, tokens: int, cached_content: Optional[CachedContext]
+    ) -> str:
+        """입력 크기로 모델 선택: 작은 입력의 Pro 요청은 Flash로 처리
+
+        캐시 컨텍스트는 생성한 모델에서만 쓸 수 있으므로 이때는 바꾸지 않는다.
+        """
+        threshold = settings.gemini_pro_min_input_tokens
+        if (
+            model == GEMINI_MODEL_PRO
+            and threshold
+            and tokens < threshold
+            and cached_content is None
+        ):
+            gemini_model_downgrades.inc(from_model=model, to_model=GEMINI_MODEL_FLASH)
+            return GEMINI_MODEL_FLASH
+        return model
+
+    @staticmethod
+    def _backup_model(
+        model: str, cached_content: Optional[CachedContext]
+    ) -> Optional[str]:
+        """hedge/대체 요청에 쓸 모델 (hedging 비활성화 시 None)"""
+        if settings.gemini_hedge_percentile <= 0:
+            return None
+        if settings.gemini_hedge_backup_model == "same" or cached_content is not None:
+            return model
+        return GEMINI_MODEL_FLASH
+
+    def _hedge_delay(self, model: str) -> Optional[float]:
+        """백업 요청을 보내기까지 기다릴 시간 (응답 시간 표본이 부족하면 None)"""
+        percentile = self.latency.percentile(model, settings.gemini_hedge_percentile)
+        if percentile is None:
+            return None
+        return max(settings.gemini_hedge_min_delay_seconds, percentile)
+
+    async def _hedged_request(
+        self,
+        model: str,
+        body: dict,
+        tokens: int,
+        priority: LLMPriority,
+        backup_model: Optional[str],
+    ) -> tuple[str, str]:
+        """primary 요청이 hedge 지연 안에 끝나지 않으면 backup_model로 백업 요청
+
+        먼저 성공한 응답과 그 모델을 반환하고 나머지 요청은 취소한다.
+        백업 모델이 다르면 primary 실패 시에도 백업으로 대체한다.
+        hedge 지연은 스케줄러 대기를 제외하고 primary가 실제로 시작된 시점부터 잰다.
+        """
+        if backup_model is None:
+            return await self._request_gemini(model, body, tokens, priority), model
+
+        started = asyncio.Event()
+        primary = asyncio.create_task(
+            self._request_gemini(model, body, tokens, priority, started)
+        )
+        tasks = {primary: model}
+        delay = self._hedge_delay(model)
+        hedged = False
+        error: Optional[BaseException] = None
+        try:
+            if delay is not None:
+                waiter = asyncio.create_task(started.wait())
+                await asyncio.wait({primary, waiter}, return_when=asyncio.FIRST_COMPLETED)
+                waiter.cancel()
+
+            while tasks:
+                done, _ = await asyncio.wait(
+                    tasks, timeout=None if hedged else delay,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    hedged = True
+                    gemini_hedged_requests.inc(model=model, outcome="fired")
+                    logger.info(
+                        "Gemini hedge 요청: %s 응답이 %.1fs를 넘어 %s로 백업 요청",
+                        model, delay, backup_model,
+                    )
+                    backup = asyncio.create_task(
+                        self._request_gemini(backup_model, body, tokens, priority)
+                    )
+                    tasks[backup] = backup_model
+                    continue
+
+                for task in done:
+                    answered_model = tasks.pop(task)
+                    if task.exception() is None:
+                        if hedged:
+                            gemini_hedged_requests.inc(
+                                model=model,
+                                outcome="primary_won" if task is primary else "backup_won",
+                            )
+                        return task.result(), answered_model
+                    error = task.exception()
+
+                if not tasks and not hedged and backup_model != model:
+                    hedged = True
+                    gemini_hedged_requests.inc(model=model, outcome="fallback")
+                    logger.warning(
+                        "Gemini %s 호출 실패, %s로 대체: %s", model, backup_model, error
+                    )
+                    backup = asyncio.create_task(
+                        self._request_gemini(backup_model, body, tokens, priority)
+                    )
+                    tasks[backup] = backup_model
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if hedged:
+            gemini_hedged_requests.inc(model=model, outcome="failed")
+        raise error
+
+    async def _request_gemini(
+        self,
+        model: str,
+        body: dict,
+        tokens: int,
+        priority: LLMPriority,
+        started: Optional[asyncio.Event] = None,
+    ) -> str:
+        """generateContent 단일 요청 (스케줄러 슬롯 안에서 실행, 성공 시 응답 시간 기록)"""
+        url = f"{GEMINI_BASE_URL}/{model}:generateContent?key={settings.gemini_api_key}"
+        async with self.scheduler.slot(model, tokens, priority):
+            if started is not None:
+                started.set()
+            began = time.perf_counter()
+            try:
+                response = await request_with_retry(
+                    "POST",
+                    url,
+                    json=body,
+                    headers={"Content-Type": "application/json"},
+                    timeout=120.0,
+                    max_retries=2,
+                )
+            except Exception:
+                gemini_requests.inc(model=model, outcome="error")
+                raise
+            finally:
+                elapsed = time.perf_counter() - began
+                gemini_request_duration.observe(elapsed, model=model)
+
+        gemini_requests.inc(
+            model=model,
+            outcome="success" if response.status_code == 200 else f"http_{response.status_code}",
         )
 
         if response.status_code != 200:
             error_detail = response.text[:500]
+            if "cachedContent" in body and is_cached_content_rejection(
+                response.status_code, error_detail
+            ):
+                raise CachedContentError(
+                    f"Gemini API 오류 ({response.status_code}): {error_detail}"
+                )
             raise RuntimeError(
                 f"Gemini API 오류 ({response.status_code}): {error_detail}"
             )
@@ -286,12 +771,162 @@ Keep the analysis concise but comprehensive. Focus on information that would hel
         if not parts:
             raise RuntimeError("Gemini 응답에 parts가 없습니다")
 
+        self.latency.observe(model, elapsed)
         return parts[0].get("text", "")
 
+    @staticmethod
+    def _inline_prompt(prompt: str, cached_content: CachedContext) -> str:
+        """캐시 참조 대신 컨텍스트 원문을 앞에 붙인 프롬프트"""
+        return f"{cached_content.text}\n\n{prompt}"
+
+    @staticmethod
+    def _response_cache_config(
+        generation_config: Optional[dict], cached_content: Optional[CachedContext]
+    ) -> Optional[dict]:
+        """응답 캐시 키용 설정 (캐시 컨텍스트는 이름 대신 내용 버전으로 구분)"""
+        if not cached_content:
+            return generation_config
+        return {**(generation_config or {}), "cachedContent": cached_content.version}
+
+    async def _stream_gemini(
+        self,
+        prompt: str,
+        model: str = GEMINI_MODEL_FLASH,
+        use_cache: bool = True,
+        priority: LLMPriority = LLMPriority.INTERACTIVE,
+        cached_content: Optional[CachedContext] = None,
+    ) -> AsyncIterator[str]:
+        """streamGenerateContent(SSE) 호출, 응답 텍스트 조각을 도착 순서대로 반환
+
+        캐시 히트면 저장된 응답 전체를 한 조각으로 반환한다.
+        첫 조각을 받기 전의 429/5xx·네트워크 오류는 request_with_retry와 같은 정책으로
+        재시도하고, 조각을 보낸 뒤의 실패는 이어 받을 수 없으므로 그대로 전파한다.
+        API가 cached_content 참조를 거부하면 컨텍스트 원문을 포함해 다시 요청한다.
+        """
+        if not settings.gemini_api_key:
+            raise ValueError("GEMINI_API_KEY가 설정되지 않았습니다")
+
+        cache_config = self._response_cache_config(None, cached_content)
+        if use_cache:
+            cached = await self.llm_cache.get(model, prompt, cache_config)
+            if cached is not None:
+                yield cached
+                return
+        else:
+            self.llm_cache.record_bypass(model)
+
+        url = (
+            f"{GEMINI_BASE_URL}/{model}:streamGenerateContent"
+            f"?alt=sse&key={settings.gemini_api_key}"
+        )
+        body: dict = {"contents": [{"parts": [{"text": prompt}]}]}
+        if cached_content:
+            body["cachedContent"] = cached_content.name
+        chunks: list[str] = []
+        rejected = False
+        for attempt in range(STREAM_MAX_ATTEMPTS):
+            can_retry = attempt < STREAM_MAX_ATTEMPTS - 1
+            wait: Optional[float] = None
+            outcome = "error"
+            await self.scheduler.acquire(model, estimate_tokens(prompt), priority)
+            started = time.perf_counter()
+            try:
+                async with stream_request(
+                    "POST",
+                    url,
+                    json=body,
+                    headers={"Content-Type": "application/json"},
+                    timeout=120.0,
+                ) as response:
+                    if response.status_code != 200:
+                        outcome = f"http_{response.status_code}"
+                        error_detail = (await response.aread()).decode("utf-8", "replace")[:500]
+                        rejected = cached_content is not None and is_cached_content_rejection(
+                            response.status_code, error_detail
+                        )
+                        # 본문을 보내기 전이므로 429/5xx는 재시도
+                        wait = retry_delay(response, attempt) if can_retry else None
+                        if wait is None and not rejected:
+                            raise RuntimeError(
+                                f"Gemini API 오류 ({response.status_code}): {error_detail}"
+                            )
+                    else:
+                        async for line in response.aiter_lines():
+                            if not line.startswith("data:"):
+                                continue
+                            try:
+                                data = json.loads(line[len("data:"):].strip())
+                            except json.JSONDecodeError:
+                                continue
+                            candidates = data.get("candidates") or [{}]
+                            parts = candidates[0].get("content", {}).get("parts", [])
+                            text = "".join(part.get("text", "") for part in parts)
+                            if not text:
+                                continue
+                            if not chunks:
+                                gemini_stream_first_chunk.observe(
+                                    time.perf_counter() - started, model=model
+                                )
+                            chunks.append(text)
+                            yield text
+                        outcome = "success"
+            except httpx.TransportError:
+                # 이미 보낸 조각이 있으면 이어 받을 수 없으므로 실패
+                if chunks or not can_retry:
+                    raise
+                wait = retry_delay(None, attempt)
+            finally:
+                self.scheduler.release()
+                gemini_requests.inc(model=model, outcome=outcome)
+                gemini_request_duration.observe(time.perf_counter() - started, model=model)
+
+            if outcome == "success" or rejected:
+                break
+            logger.warning(
+                "Gemini 스트리밍 실패 (%s), %.1f초 후 재시도 (%d/%d)",
+                outcome, wait, attempt + 1, STREAM_MAX_ATTEMPTS,
+            )
+            await asyncio.sleep(wait)
+
+        if rejected:
+            logger.warning("캐시 컨텍스트 참조 거부, 원문을 포함해 재시도: %s", cached_content.name)
+            self.context_cache.discard(cached_content)
+            async for text in self._stream_gemini(
+                self._inline_prompt(prompt, cached_content), model, use_cache, priority
+            ):
+                yield text
+            return
+
+        if not chunks:
+            raise RuntimeError("Gemini 스트리밍 응답에 내용이 없습니다")
+        await self.llm_cache.put(model, prompt, "".join(chunks), cache_config)
+
+    @staticmethod
+    def _partial_plan(raw: str) -> str:
+        """생성 중인 응답에서 앞쪽 JSON 메타데이터 블록을 뺀 작업 계획 부분
+
+        메타데이터 블록이 아직 닫히지 않았으면 빈 문자열을 반환한다.
+        """
+        text = raw.lstrip()
+        if len(text) < len("```json") and "```json".startswith(text):
+            return ""
+        if not text.startswith("```json"):
+            return text
+        match = _PLAN_META_RE.search(text)
+        return text[match.end():].lstrip() if match else ""
+
     # ── Phase 2: 심층 분석 ──────────────────────────────────
 
-    async def analyze_repo_deep(self, repo_id: int, db: AsyncSession) -> None:
-        """Phase 2: 소스 코드 심층 분석 + 개선 제안 생성"""
+    async def analyze_repo_deep(
+        self, repo_id: int, db: AsyncSession, use_cache: bool = True
+    ) -> None:
+        """Phase 2: 소스 코드 심층 분석 + 개선 제안 생성
+
+        이전 분석의 지문(트리 SHA + 파일별 blob SHA)이 있으면 변경된 파일만 다시 검토하고,
+        변경 없는 파일의 기존 제안은 유지한다. use_cache=False면 전체를 다시 분석한다.
+        다시 보고된 문제는 기존 열린 이슈에 연결하고, 더 이상 보고되지 않은 제안의 이슈 중
+        아무도 손대지 않은 것은 삭제한다 (이슈 중복 생성 방지).
+        """
         result = await db.execute(
             select(ConnectedRepo).where(ConnectedRepo.id == repo_id)
         )
@@ -300,6 +935,13 @@ Keep the analysis concise but comprehensive. Focus on information that would hel
             logger.error("ConnectedRepo not found: id=%d", repo_id)
             return
 
+        previous_files: Optional[dict[str, str]] = None
+        if use_cache and repo.deep_analysis_status == "completed" and repo.deep_analysis_files:
+            try:
+                previous_files = json.loads(repo.deep_analysis_files)
+            except json.JSONDecodeError:
+                previous_files = None
+
         repo.deep_analysis_status = "analyzing"
         repo.deep_analysis_error = None
         await db.commit()
@@ -308,50 +950,150 @@ Keep the analysis concise but comprehensive. Focus on information that would hel
             owner, repo_name = repo.full_name.split("/", 1)
 
             # 트리 조회
-            tree_data = await self.github.get_repo_tree(
+            commit_sha, tree_data = await self.github.resolve_repo_tree(
                 owner, repo_name, repo.default_branch
             )
-            file_paths = [
-                item["path"]
-                for item in tree_data.get("tree", [])
-                if item.get("type") == "blob"
-            ]
+            snapshot = RepoSnapshot.from_tree(tree_data, commit_sha)
+            file_paths = snapshot.paths
+
+            if (
+                previous_files is not None
+                and snapshot.tree_sha
+                and snapshot.tree_sha == repo.deep_analysis_tree_sha
+            ):
+                repo.deep_analysis_status = "completed"
+                await db.commit()
+                logger.info("심층 분석 스킵 (트리 변경 없음): %s", repo.full_name)
+                return
 
-            # 핵심 소스 파일 선택
+            # 핵심 소스 파일 선택 (map-reduce가 가능하면 더 넓게)
             selected_files = self._select_deep_analysis_files(
-                file_paths, repo.language
+                file_paths, repo.language,
+                limit=(
+                    MAX_FILES_TO_ANALYZE
+                    if settings.deep_analysis_mode == "single"
+                    else settings.deep_analysis_max_files
+                ),
             )
 
             if not selected_files:
                 repo.deep_analysis_status = "completed"
                 repo.deep_analysis_result = "분석할 소스 코드 파일이 없습니다."
                 repo.deep_analyzed_at = datetime.utcnow()
+                repo.deep_analysis_tree_sha = snapshot.tree_sha
+                repo.deep_analysis_files = None
                 await db.commit()
                 return
 
-            # 파일 내용 수집
-            files_content = await self._fetch_deep_files(
-                owner, repo_name, selected_files
+            # 증분 분석: 이전 지문과 blob SHA가 다른 파일만 검토
+            kept_suggestions: list[DeepAnalysisSuggestion] = []
+            stale_suggestions: list[DeepAnalysisSuggestion] = []
+            reviewed_files: dict[str, str] = {}
+            suggestion_result = await db.execute(
+                select(DeepAnalysisSuggestion).where(
+                    DeepAnalysisSuggestion.connected_repo_id == repo_id
+                )
             )
+            existing_suggestions = list(suggestion_result.scalars().all())
+            if previous_files is not None:
+                files_to_review, stale_paths = self._diff_deep_fingerprint(
+                    previous_files, selected_files, snapshot.blob_shas
+                )
+                reviewed_files = {
+                    path: sha for path, sha in previous_files.items()
+                    if path not in stale_paths
+                }
+                for suggestion in existing_suggestions:
+                    if stale_paths.isdisjoint(self._affected_files(suggestion)):
+                        kept_suggestions.append(suggestion)
+                    else:
+                        stale_suggestions.append(suggestion)
+            else:
+                files_to_review = selected_files
+                stale_suggestions = existing_suggestions
+
+            suggestions_data: list[dict] = []
+            markdown_report = ""
+            if files_to_review:
+                # 파일 내용 수집
+                files_content = await self._fetch_deep_files(
+                    owner, repo_name, files_to_review, snapshot,
+                    max_bytes=(
+                        MAX_DEEP_CONTENT_BYTES
+                        if settings.deep_analysis_mode == "single"
+                        else settings.deep_analysis_max_bytes
+                    ),
+                )
+                previous_findings = (
+                    kept_suggestions if previous_files is not None else None
+                )
 
-            # 프롬프트 생성 + Gemini 호출
-            prompt = self._build_deep_prompt(
-                repo.full_name, repo.description,
-                repo.analysis_result, files_content,
-            )
-            raw_response = await self._call_gemini(prompt, model=GEMINI_MODEL_PRO)
+                shards = self._shard_deep_files(
+                    files_content, settings.deep_analysis_shard_tokens
+                )
+                if settings.deep_analysis_mode != "single" and len(shards) > 1:
+                    suggestions_data, markdown_report = await self._review_deep_map_reduce(
+                        repo, shards, previous_findings, use_cache
+                    )
+                else:
+                    if len(files_content) > MAX_FILES_TO_ANALYZE:
+                        # 단일 호출은 기존 한도(파일 수) 안에서만 수행
+                        files_content = dict(
+                            list(files_content.items())[:MAX_FILES_TO_ANALYZE]
+                        )
+                    # 프롬프트 생성 + Gemini 호출 (Phase 1 결과는 가능하면 컨텍스트 캐시로)
+                    phase1_context = await self._phase1_context(repo)
+                    prompt = self._build_deep_prompt(
+                        repo.full_name, repo.description,
+                        None if phase1_context else repo.analysis_result,
+                        files_content,
+                        previous_findings=previous_findings,
+                    )
+                    raw_response = await self._call_gemini(
+                        prompt, model=GEMINI_MODEL_PRO, use_cache=use_cache,
+                        priority=LLMPriority.DEEP_ANALYSIS,
+                        cached_content=phase1_context,
+                    )
+
+                    # 응답 파싱
+                    suggestions_data, markdown_report = self._parse_deep_response(
+                        raw_response
+                    )
+                reviewed_files.update(
+                    (path, snapshot.blob_shas.get(path, "")) for path in files_content
+                )
 
-            # 응답 파싱
-            suggestions_data, markdown_report = self._parse_deep_response(
-                raw_response
-            )
+            # 유지되는 제안과 같은 문제를 다시 보고한 것은 버림
+            suggestions_data = [
+                s for s in suggestions_data
+                if not any(self._same_finding(s, kept) for kept in kept_suggestions)
+            ]
 
-            # 기존 제안 삭제
-            await db.execute(
-                delete(DeepAnalysisSuggestion).where(
-                    DeepAnalysisSuggestion.connected_repo_id == repo_id
+            # 기존 제안 정리 (증분: 변경 파일의 제안만, 전체: 모두 삭제)
+            for suggestion in stale_suggestions:
+                await db.delete(suggestion)
+            if previous_files is not None:
+                markdown_report = self._merge_deep_report(
+                    markdown_report, files_to_review, kept_suggestions
+                )
+
+            # 다시 보고된 문제는 기존 열린 이슈에 연결 (영향 파일은 폐기된 제안 기준으로 대조)
+            issue_result = await db.execute(
+                select(Issue).where(
+                    Issue.repo_full_name == repo.full_name,
+                    Issue.status != IssueStatus.DONE,
                 )
             )
+            kept_issue_ids = {suggestion.issue_id for suggestion in kept_suggestions}
+            open_issues = {
+                issue.id: issue for issue in issue_result.scalars().all()
+                if issue.id not in kept_issue_ids
+            }
+            stale_files = {
+                suggestion.issue_id: self._affected_files(suggestion)
+                for suggestion in stale_suggestions if suggestion.issue_id
+            }
+            reused_issue_ids: set[int] = set()
 
             # 새 제안 저장
             new_suggestions = []
@@ -367,10 +1109,25 @@ Keep the analysis concise but comprehensive. Focus on information that would hel
                     ),
                     suggested_fix=s.get("suggested_fix"),
                 )
+                issue_id = self._matching_issue_id(
+                    s, open_issues, stale_files, reused_issue_ids
+                )
                 db.add(suggestion)
-                new_suggestions.append((suggestion, s))
+                if issue_id is not None:
+                    suggestion.issue_id = issue_id
+                    reused_issue_ids.add(issue_id)
+                else:
+                    new_suggestions.append((suggestion, s))
             await db.flush()
 
+            # 더 이상 보고되지 않은 제안의 이슈: 아무도 손대지 않았으면 삭제, 아니면 유지
+            removed_issue_count = 0
+            for issue_id in stale_files.keys() - reused_issue_ids:
+                issue = open_issues.get(issue_id)
+                if issue is not None and self._untouched_issue(issue):
+                    await db.delete(issue)
+                    removed_issue_count += 1
+
             # 제안 → Issue 자동 생성
             severity_priority_map = {
                 "critical": IssuePriority.HIGH,
@@ -387,7 +1144,7 @@ Keep the analysis concise but comprehensive. Focus on information that would hel
                 "documentation": "문서화",
             }
 
-            issue_count = 0
+            created_issue_ids: list[int] = []
             for suggestion, s_data in new_suggestions:
                 cat_label = category_labels.get(s_data["category"], s_data["category"])
                 desc_parts = [
@@ -422,19 +1179,40 @@ Keep the analysis concise but comprehensive. Focus on information that would hel
                 db.add(new_issue)
                 await db.flush()
                 suggestion.issue_id = new_issue.id
-                issue_count += 1
+                created_issue_ids.append(new_issue.id)
 
             repo.deep_analysis_status = "completed"
             repo.deep_analysis_result = markdown_report
             repo.deep_analysis_error = None
             repo.deep_analyzed_at = datetime.utcnow()
+            repo.deep_analysis_tree_sha = snapshot.tree_sha
+            repo.deep_analysis_files = json.dumps(reviewed_files, ensure_ascii=False)
             await db.commit()
+            self.context_cache.invalidate_repo(repo_id, kind="analysis")
 
             logger.info(
-                "심층 분석 완료: %s (id=%d, 제안 %d개, 이슈 %d개 자동 생성)",
-                repo.full_name, repo_id, len(suggestions_data), issue_count,
+                "심층 분석 완료: %s (id=%d, %s, 검토 파일 %d개, 새 제안 %d개, "
+                "유지 제안 %d개, 이슈 %d개 자동 생성, %d개 재연결, %d개 삭제)",
+                repo.full_name, repo_id,
+                "증분" if previous_files is not None else "전체",
+                len(files_to_review), len(suggestions_data),
+                len(kept_suggestions), len(created_issue_ids),
+                len(reused_issue_ids), removed_issue_count,
             )
 
+            # 자동 생성된 이슈의 작업 계획은 리포 단위 배치로 생성 (실패해도 분석 결과는 유지)
+            if created_issue_ids:
+                try:
+                    await self.generate_work_plans_batch(
+                        created_issue_ids, db, use_cache=use_cache,
+                        priority=LLMPriority.BACKGROUND_PLAN,
+                    )
+                except Exception:
+                    logger.exception(
+                        "심층 분석 이슈 작업 계획 생성 실패: %s (id=%d)",
+                        repo.full_name, repo_id,
+                    )
+
         except Exception as e:
             logger.exception("심층 분석 실패: %s (id=%d)", repo.full_name, repo_id)
             repo.deep_analysis_status = "failed"
@@ -442,8 +1220,206 @@ Keep the analysis concise but comprehensive. Focus on information that would hel
             repo.deep_analyzed_at = datetime.utcnow()
             await db.commit()
 
+    @staticmethod
+    def _diff_deep_fingerprint(
+        previous_files: dict[str, str],
+        selected_files: list[str],
+        blob_shas: dict[str, str],
+    ) -> tuple[list[str], set[str]]:
+        """이전 지문과 현재 트리 비교
+
+        반환: (다시 검토할 선택 파일, 기존 제안을 폐기할 경로)
+        폐기 경로는 검토 대상 파일과, 이전에 검토했지만 삭제되었거나 내용이 바뀐 파일이다.
+        """
+        files_to_review = [
+            path for path in selected_files
+            if previous_files.get(path) != blob_shas.get(path)
+        ]
+        stale_paths = set(files_to_review)
+        stale_paths.update(
+            path for path, sha in previous_files.items()
+            if blob_shas.get(path) != sha
+        )
+        return files_to_review, stale_paths
+
+    @staticmethod
+    def _affected_files(suggestion: DeepAnalysisSuggestion) -> set[str]:
+        try:
+            return set(json.loads(suggestion.affected_files or "[]"))
+        except (json.JSONDecodeError, TypeError):
+            return set()
+
+    @staticmethod
+    def _finding_title(title: str) -> str:
+        """제안/이슈 제목 비교용 정규화 (대소문자·공백 차이 무시)"""
+        return " ".join(title[:255].lower().split())
+
+    @classmethod
+    def _same_finding(cls, data: dict, suggestion: DeepAnalysisSuggestion) -> bool:
+        """새 제안(dict)이 기존 제안과 같은 문제인지 (제목이 같고 영향 파일이 겹침)"""
+        if cls._finding_title(data["title"]) != cls._finding_title(suggestion.title):
+            return False
+        files = set(data.get("affected_files") or [])
+        existing = cls._affected_files(suggestion)
+        return bool(files & existing) or not (files or existing)
+
+    @classmethod
+    def _matching_issue_id(
+        cls,
+        data: dict,
+        open_issues: dict[int, Issue],
+        stale_files: dict[int, set[str]],
+        reused_issue_ids: set[int],
+    ) -> Optional[int]:
+        """새 제안과 같은 문제를 다루는 열린 이슈
+
+        제목이 같아야 하며, 폐기된 제안에서 만들어진 이슈는 영향 파일도 겹쳐야 한다.
+        """
+        title = cls._finding_title(data["title"])
+        files = set(data.get("affected_files") or [])
+        for issue_id, issue in open_issues.items():
+            if issue_id in reused_issue_ids or cls._finding_title(issue.title) != title:
+                continue
+            previous = stale_files.get(issue_id)
+            if previous is None or files & previous or not (files or previous):
+                return issue_id
+        return None
+
+    @staticmethod
+    def _untouched_issue(issue: Issue) -> bool:
+        """자동 생성 후 진행·PR·큐·코멘트가 없는 이슈"""
+        return (
+            issue.status == IssueStatus.TODO
+            and not issue.pr_url
+            and not issue.queue_items
+            and not issue.comments
+        )
+
+    @staticmethod
+    def _merge_deep_report(
+        new_report: str,
+        reviewed_paths: list[str],
+        kept_suggestions: list[DeepAnalysisSuggestion],
+    ) -> str:
+        """증분 분석 리포트: 변경 파일 리포트 + 유지된 기존 제안 목록"""
+        lines: list[str] = []
+        if reviewed_paths:
+            lines.append(f"## 변경된 파일 분석 ({len(reviewed_paths)}개)")
+            lines.append("")
+            lines.append(new_report or "(새로운 제안 없음)")
+        else:
+            lines.append("변경된 분석 대상 파일이 없습니다.")
+        if kept_suggestions:
+            lines.append("")
+            lines.append(f"## 변경 없는 파일의 기존 제안 ({len(kept_suggestions)}개 유지)")
+            for suggestion in kept_suggestions:
+                lines.append(
+                    f"- [{suggestion.severity.value}] {suggestion.title}"
+                )
+        return "\n".join(lines)
+
+    @staticmethod
+    def _shard_deep_files(
+        files_content: dict[str, str], shard_tokens: int
+    ) -> list[dict[str, str]]:
+        """우선순위 순서를 유지하며 파일을 토큰 한도별 샤드로 분할
+
+        한 파일이 샤드 한도를 넘으면 한도에 맞게 잘라 단독 샤드로 둔다.
+        """
+        shards: list[dict[str, str]] = []
+        current: dict[str, str] = {}
+        current_tokens = 0
+        for path, content in files_content.items():
+            content = truncate_to_tokens(content, shard_tokens)
+            tokens = estimate_tokens(content)
+            if current and current_tokens + tokens > shard_tokens:
+                shards.append(current)
+                current, current_tokens = {}, 0
+            current[path] = content
+            current_tokens += tokens
+        if current:
+            shards.append(current)
+        return shards
+
+    async def _review_deep_map_reduce(
+        self,
+        repo: ConnectedRepo,
+        shards: list[dict[str, str]],
+        previous_findings: Optional[list[DeepAnalysisSuggestion]],
+        use_cache: bool,
+    ) -> tuple[list[dict], str]:
+        """샤드별 Flash 검토(map)를 병렬 실행한 뒤 Pro 한 번으로 중복 제거·순위화(reduce)
+
+        일부 샤드가 실패해도 나머지 결과로 병합하며, 모든 샤드가 실패하면 예외를 전파한다.
+        """
+        semaphore = asyncio.Semaphore(max(1, settings.deep_analysis_shard_concurrency))
+        started = time.perf_counter()
+
+        async def review(index: int, shard: dict[str, str]) -> list[dict]:
+            async with semaphore:
+                prompt = self._build_deep_shard_prompt(
+                    repo.full_name, repo.description, shard, index, len(shards)
+                )
+                raw = await self._call_gemini(
+                    prompt, model=GEMINI_MODEL_FLASH, use_cache=use_cache,
+                    priority=LLMPriority.DEEP_ANALYSIS,
+                )
+                suggestions, _ = self._parse_deep_response(raw)
+                return suggestions
+
+        results = await asyncio.gather(
+            *(review(i, shard) for i, shard in enumerate(shards)),
+            return_exceptions=True,
+        )
+        candidates: list[dict] = []
+        failures: list[BaseException] = []
+        for result in results:
+            if isinstance(result, BaseException):
+                failures.append(result)
+            else:
+                candidates.extend(result)
+        if len(failures) == len(shards):
+            raise failures[0]
+        for failure in failures:
+            logger.warning("심층 분석 샤드 검토 실패: %s: %s", repo.full_name, failure)
+
+        logger.info(
+            "심층 분석 map 단계: %s 샤드 %d개 (실패 %d), 후보 제안 %d개, %.1fs",
+            repo.full_name, len(shards), len(failures), len(candidates),
+            time.perf_counter() - started,
+        )
+
+        file_count = sum(len(shard) for shard in shards)
+        phase1_context = await self._phase1_context(repo)
+        prompt = self._build_deep_reduce_prompt(
+            repo.full_name, repo.description,
+            None if phase1_context else repo.analysis_result,
+            candidates, file_count, previous_findings,
+        )
+        raw_response = await self._call_gemini(
+            prompt, model=GEMINI_MODEL_PRO, use_cache=use_cache,
+            priority=LLMPriority.DEEP_ANALYSIS, cached_content=phase1_context,
+        )
+        return self._parse_deep_response(raw_response)
+
+    async def _phase1_context(self, repo: ConnectedRepo) -> Optional[CachedContext]:
+        """심층 분석(Pro)마다 다시 보내는 Phase 1 결과의 컨텍스트 캐시 항목
+
+        캐시하기에 짧거나 생성에 실패하면 None이며, 호출자는 요약을 프롬프트에 직접 넣는다.
+        """
+        if not repo.analysis_result:
+            return None
+        return await self.context_cache.get_or_create(
+            repo.id, GEMINI_MODEL_PRO,
+            f"## Phase 1 프로젝트 개요 ({repo.full_name})\n{repo.analysis_result}\n",
+            kind="phase1",
+        )
+
     def _select_deep_analysis_files(
-        self, all_paths: list[str], language: Optional[str]
+        self,
+        all_paths: list[str],
+        language: Optional[str],
+        limit: int = MAX_FILES_TO_ANALYZE,
     ) -> list[str]:
         """심층 분석할 핵심 소스 파일 선택 (우선순위 정렬)"""
         # SKIP_DIRS 필터링
@@ -495,29 +1471,20 @@ Keep the analysis concise but comprehensive. Focus on information that would hel
             return score
 
         source_files.sort(key=priority_score, reverse=True)
-        return source_files[:MAX_FILES_TO_ANALYZE]
+        return source_files[:limit]
 
     async def _fetch_deep_files(
-        self, owner: str, repo: str, selected_paths: list[str]
+        self,
+        owner: str,
+        repo: str,
+        selected_paths: list[str],
+        snapshot: Optional[RepoSnapshot] = None,
+        max_bytes: int = MAX_DEEP_CONTENT_BYTES,
     ) -> dict[str, str]:
-        """심층 분석용 파일 내용 수집 (300KB 제한)"""
-        result: dict[str, str] = {}
-        total_bytes = 0
-
-        for path in selected_paths:
-            if total_bytes >= MAX_DEEP_CONTENT_BYTES:
-                break
-            try:
-                content = await self._get_file_content(owner, repo, path)
-                if content:
-                    content_bytes = len(content.encode("utf-8"))
-                    if total_bytes + content_bytes <= MAX_DEEP_CONTENT_BYTES:
-                        result[path] = content
-                        total_bytes += content_bytes
-            except Exception as e:
-                logger.warning("심층 분석 파일 조회 실패: %s — %s", path, e)
-
-        return result
+        """심층 분석용 파일 내용 수집 (기본 300KB 제한)"""
+        return await self._collect_files(
+            owner, repo, selected_paths, snapshot, max_bytes
+        )
 
     def _build_deep_prompt(
         self,
@@ -525,32 +1492,47 @@ Keep the analysis concise but comprehensive. Focus on information that would hel
         description: Optional[str],
         phase1_result: Optional[str],
         files_content: dict[str, str],
+        previous_findings: Optional[list[DeepAnalysisSuggestion]] = None,
     ) -> str:
-        """Phase 2 심층 분석 프롬프트 생성"""
-        files_section = ""
-        for path, content in files_content.items():
-            truncated = content[:MAX_DEEP_FILE_SIZE]
-            if len(content) > MAX_DEEP_FILE_SIZE:
-                truncated += "\n... (truncated)"
-            files_section += f"\n### {path}\n```\n{truncated}\n```\n"
-
-        phase1_section = ""
-        if phase1_result:
-            # Phase 1 결과 요약 (3000자 제한)
-            phase1_section = f"""
-## Phase 1 프로젝트 개요
-{phase1_result[:3000]}
+        """Phase 2 심층 분석 프롬프트 생성
+
+        previous_findings가 주어지면 증분 분석으로, 변경된 파일만 검토하고
+        변경 없는 파일의 기존 제안과 중복되지 않도록 지시한다.
+        """
+        previous_section = ""
+        if previous_findings is not None:
+            finding_lines = "\n".join(
+                f"- [{f.category.value}/{f.severity.value}] {f.title}"
+                f" ({', '.join(sorted(self._affected_files(f))) or '전체'})"
+                for f in previous_findings
+            ) or "(없음)"
+            previous_section = f"""
+## 증분 분석
+아래 소스 코드는 마지막 분석 이후 변경되었거나 새로 분석 대상이 된 파일만 포함합니다.
+이 파일들에 대한 제안만 생성하고, 변경 없는 파일에 대한 다음 기존 제안과 중복되지 않게 하세요.
+
+### 유지되는 기존 제안
+{finding_lines}
 """
 
-        return f"""You are a senior software architect performing a deep code review.
-Analyze the source code and identify concrete improvement opportunities.
-
-Repository: {full_name}
-{f'Description: {description}' if description else ''}
-{phase1_section}
-
-## Source Code ({len(files_content)} files)
-{files_section}
+        packer = PromptPacker.for_model(GEMINI_MODEL_PRO)
+        packer.add_fixed(
+            "You are a senior software architect performing a deep code review.\n"
+            "Analyze the source code and identify concrete improvement opportunities.\n\n"
+            f"Repository: {full_name}\n"
+            f"{f'Description: {description}' if description else ''}\n"
+        )
+        packer.add(
+            "phase1_summary",
+            f"\n## Phase 1 프로젝트 개요\n{phase1_result}\n" if phase1_result else None,
+            priority=3, max_tokens=PHASE1_SUMMARY_TOKENS,
+        )
+        packer.add("previous_findings", previous_section, priority=2)
+        packer.add_files(
+            "source", files_content, priority=1, max_tokens=DEEP_FILES_TOKENS,
+            header=f"\n## Source Code ({len(files_content)} files)\n",
+        )
+        packer.add_fixed(f"""
 
 ## 분석 지침
 
@@ -584,41 +1566,251 @@ Repository: {full_name}
 ]
 ```
 
-- 5~15개의 실행 가능한 제안을 생성하세요
+- {"0~10개" if previous_findings is not None else "5~15개"}의 실행 가능한 제안을 생성하세요
 - severity 순으로 정렬 (critical > high > medium > low)
 - 모든 텍스트는 한국어로 작성 (파일 경로와 category/severity 값 제외)
 - JSON은 반드시 유효한 JSON이어야 합니다
+""")
+        packed = packer.pack()
+        if packed.dropped:
+            logger.info("심층 분석 프롬프트 축약 (%s): %s", full_name, packed.report())
+        return packed.text
+
+    @staticmethod
+    def _build_deep_shard_prompt(
+        full_name: str,
+        description: Optional[str],
+        shard: dict[str, str],
+        index: int,
+        total: int,
+    ) -> str:
+        """map 단계: 샤드 하나의 파일에 대한 제안만 JSON으로 요청"""
+        packer = PromptPacker.for_model(GEMINI_MODEL_FLASH)
+        packer.add_fixed(
+            "You are a senior software engineer reviewing one part of a larger codebase.\n\n"
+            f"Repository: {full_name}\n"
+            f"{f'Description: {description}' if description else ''}\n"
+        )
+        packer.add_files(
+            "source", shard, priority=1,
+            header=f"\n## Source Code (part {index + 1}/{total}, {len(shard)} files)\n",
+        )
+        packer.add_fixed("""
+## 지침
+위 파일들에서 코드 품질, 보안, 성능, 아키텍처, 테스트, 문서화 측면의 구체적인 개선 사항을 찾으세요.
+리포트 없이 아래 형식의 JSON 블록만 출력하세요.
+
+```json
+[
+  {
+    "category": "code_quality|security|performance|architecture|testing|documentation",
+    "severity": "low|medium|high|critical",
+    "title": "간결한 제안 제목 (최대 100자)",
+    "description": "문제에 대한 상세 설명과 왜 중요한지",
+    "affected_files": ["경로/파일.py"],
+    "suggested_fix": "구체적인 수정 방법 또는 단계"
+  }
+]
+```
+
+- 위에 제시된 파일에 대한 제안만 작성하세요 (0~8개)
+- 모든 텍스트는 한국어로 작성 (파일 경로와 category/severity 값 제외)
+""")
+        packed = packer.pack()
+        if packed.dropped:
+            logger.info(
+                "심층 분석 샤드 프롬프트 축약 (%s, %d/%d): %s",
+                full_name, index + 1, total, packed.report(),
+            )
+        return packed.text
+
+    def _build_deep_reduce_prompt(
+        self,
+        full_name: str,
+        description: Optional[str],
+        phase1_result: Optional[str],
+        candidates: list[dict],
+        file_count: int,
+        previous_findings: Optional[list[DeepAnalysisSuggestion]] = None,
+    ) -> str:
+        """reduce 단계: 샤드별 후보 제안을 병합·중복 제거·순위화하고 리포트 작성
+
+        후보가 예산을 넘으면 severity가 낮은 것부터 통째로 제외한다 (JSON이 잘리지 않도록).
+        """
+        previous_section = None
+        if previous_findings is not None:
+            finding_lines = "\n".join(
+                f"- [{f.category.value}/{f.severity.value}] {f.title}"
+                for f in previous_findings
+            ) or "(없음)"
+            previous_section = f"""
+## 변경 없는 파일의 기존 제안 (중복 금지)
+{finding_lines}
 """
+        ordered = sorted(
+            candidates,
+            key=lambda c: DEEP_SEVERITY_ORDER.get(c.get("severity"), len(DEEP_SEVERITY_ORDER)),
+        )
+
+        packer = PromptPacker.for_model(GEMINI_MODEL_PRO)
+        packer.add_fixed(
+            "You are a senior software architect consolidating a deep code review.\n"
+            "여러 리뷰어가 코드베이스를 나누어 검토한 후보 제안 목록입니다.\n\n"
+            f"Repository: {full_name}\n"
+            f"{f'Description: {description}' if description else ''}\n"
+        )
+        packer.add(
+            "phase1_summary",
+            f"\n## Phase 1 프로젝트 개요\n{phase1_result}\n" if phase1_result else None,
+            priority=3, max_tokens=PHASE1_SUMMARY_TOKENS,
+        )
+        packer.add("previous_findings", previous_section, priority=2)
+        packer.add_items(
+            "candidates", [json.dumps(c, ensure_ascii=False) for c in ordered], priority=1,
+            header=f"\n## 후보 제안 (검토 파일 {file_count}개)\n```json\n[\n",
+            footer="\n]\n```\n", separator=",\n",
+        )
+        packer.add_fixed(f"""
+## 지침
+1. 같은 문제를 가리키는 제안은 하나로 합치고 affected_files를 합치세요
+2. 여러 파일에 걸친 패턴은 아키텍처 수준 제안으로 묶으세요
+3. 영향도 기준으로 최대 {MAX_REDUCED_SUGGESTIONS}개를 골라 severity 순으로 정렬하세요 (critical > high > medium > low)
+
+## 응답 형식
+먼저 마크다운으로 심층 분석 리포트를 작성하고, 끝에 최종 제안을 후보와 같은 형식의 JSON 블록으로 포함하세요.
+- 모든 텍스트는 한국어로 작성 (파일 경로와 category/severity 값 제외)
+- JSON은 반드시 유효한 JSON이어야 합니다
+""")
+        packed = packer.pack()
+        if packed.dropped:
+            logger.info("심층 분석 reduce 프롬프트 축약 (%s): %s", full_name, packed.report())
+        return packed.text
 
     # ── 일감 AI 자동 생성 ──────────────────────────────────
 
     @staticmethod
-    def _build_repo_analysis_context(repo: ConnectedRepo) -> str:
-        """리포지토리의 기본 분석 + 심층 분석 결과를 프롬프트 컨텍스트로 빌드"""
-        sections = [f"\n## 리포지토리: {repo.full_name}"]
-        if repo.description:
-            sections.append(f"설명: {repo.description}")
-
-        # 기본 분석 결과
-        if repo.analysis_result:
-            analysis_text = repo.analysis_result
-            if len(analysis_text) > 2000:
-                analysis_text = analysis_text[:2000] + "\n... (이하 생략)"
-            sections.append(f"\n### 기본 분석 결과\n{analysis_text}")
+    def _build_repo_analysis_context(
+        repo: ConnectedRepo, budget_tokens: int = REPO_CONTEXT_TOKENS
+    ) -> str:
+        """리포지토리의 기본 분석 + 심층 분석 결과를 프롬프트 컨텍스트로 빌드
 
-        # 심층 분석 결과
-        if repo.deep_analysis_result:
-            deep_text = repo.deep_analysis_result
-            if len(deep_text) > 3000:
-                deep_text = deep_text[:3000] + "\n... (이하 생략)"
-            sections.append(f"\n### 심층 분석 결과\n{deep_text}")
+        budget_tokens 안에서 기본 분석에 최대 40%를 먼저 배정하고
+        남은 예산을 심층 분석 결과에 사용한다.
+        """
+        packer = PromptPacker(budget_tokens)
+        packer.add_fixed(f"\n## 리포지토리: {repo.full_name}\n")
+        if repo.description:
+            packer.add_fixed(f"설명: {repo.description}\n")
+        packer.add(
+            "analysis",
+            f"\n### 기본 분석 결과\n{repo.analysis_result}\n" if repo.analysis_result else None,
+            priority=1, max_tokens=budget_tokens * 2 // 5,
+        )
+        packer.add(
+            "deep_analysis",
+            f"\n### 심층 분석 결과\n{repo.deep_analysis_result}\n"
+            if repo.deep_analysis_result else None,
+            priority=2,
+        )
+        return packer.pack().text
+
+    async def _load_work_plan_metadata(self, db: AsyncSession) -> WorkPlanMetadata:
+        """작업 계획 생성에 쓰는 라벨/연결 리포 목록 조회 (배치에서는 한 번만)"""
+        label_result = await db.execute(select(Label))
+        repo_result = await db.execute(select(ConnectedRepo))
+        return WorkPlanMetadata(
+            labels=list(label_result.scalars().all()),
+            repos=list(repo_result.scalars().all()),
+        )
 
-        return "\n".join(sections)
+    async def _work_plan_repo_context(
+        self, repo_name: Optional[str], metadata: WorkPlanMetadata
+    ) -> tuple[str, Optional[CachedContext]]:
+        """작업 계획 프롬프트의 리포 컨텍스트 (리포 지정 시 가능하면 컨텍스트 캐시 참조)"""
+        if repo_name and repo_name in metadata.repo_map:
+            target_repo = metadata.repo_map[repo_name]
+            cached_context = await self.context_cache.get_or_create(
+                target_repo.id, GEMINI_MODEL_FLASH,
+                self._build_repo_analysis_context(target_repo, CACHED_REPO_CONTEXT_TOKENS),
+            )
+            if cached_context:
+                return (
+                    f"\n## 리포지토리: {target_repo.full_name}\n"
+                    "분석 결과는 앞서 제공된 컨텍스트를 참고하세요.\n"
+                ), cached_context
+            return self._build_repo_analysis_context(target_repo), None
+        if not repo_name and metadata.repos:
+            # 리포 미지정 시에도 연결된 리포 분석 결과 요약 제공
+            summaries = []
+            for r in metadata.repos:
+                parts = [f"### {r.full_name}"]
+                if r.description:
+                    parts.append(r.description)
+                if r.analysis_result:
+                    # 기본 분석 결과 앞부분만
+                    parts.append(truncate_to_tokens(
+                        r.analysis_result, REPO_SUMMARY_TOKENS, "\n... (이하 생략)"
+                    ))
+                summaries.append("\n".join(parts))
+            return "\n## 연결된 리포지토리 분석 요약\n" + "\n\n".join(summaries), None
+        return "", None
+
+    async def _apply_plan_meta(
+        self, issue: Issue, meta: dict, metadata: WorkPlanMetadata, db: AsyncSession
+    ) -> None:
+        """AI가 생성한 메타데이터(제목/우선순위/리포/라벨)를 일감에 반영"""
+        # 제목 업데이트
+        if meta.get("title"):
+            issue.title = str(meta["title"])[:255]
+        # 우선순위 업데이트
+        priority_val = meta.get("priority", "medium")
+        priority_map = {
+            "low": IssuePriority.LOW,
+            "medium": IssuePriority.MEDIUM,
+            "high": IssuePriority.HIGH,
+        }
+        if priority_val in priority_map:
+            issue.priority = priority_map[priority_val]
+        # 리포지토리 업데이트
+        ai_repo = meta.get("repo_full_name")
+        if ai_repo and ai_repo in metadata.repo_map:
+            issue.repo_full_name = ai_repo
+        # 라벨 업데이트
+        ai_labels = meta.get("labels", [])
+        if ai_labels and isinstance(ai_labels, list):
+            matched_label_ids = [
+                metadata.label_map[name]
+                for name in ai_labels
+                if name in metadata.label_map
+            ]
+            if matched_label_ids:
+                # 기존 라벨 제거 후 새 라벨 연결
+                await db.execute(
+                    issue_labels.delete().where(
+                        issue_labels.c.issue_id == issue.id
+                    )
+                )
+                for lid in matched_label_ids:
+                    await db.execute(
+                        issue_labels.insert().values(
+                            issue_id=issue.id, label_id=lid
+                        )
+                    )
 
     async def generate_work_plan(
-        self, issue_id: int, db: AsyncSession
+        self,
+        issue_id: int,
+        db: AsyncSession,
+        use_cache: bool = True,
+        metadata: Optional[WorkPlanMetadata] = None,
+        priority: LLMPriority = LLMPriority.INTERACTIVE,
     ) -> None:
-        """일감의 제목, 우선순위, 카테고리, 리포지토리, 작업 계획을 AI로 자동 생성"""
+        """일감의 제목, 우선순위, 카테고리, 리포지토리, 작업 계획을 AI로 자동 생성
+
+        use_cache=False면 같은 입력이라도 작업 계획을 새로 생성한다 (재생성 요청).
+        metadata가 주어지면 라벨/리포 목록을 다시 조회하지 않는다 (배치 생성).
+        사용자가 기다리지 않는 백그라운드 생성은 priority를 낮춰 호출한다.
+        """
         result = await db.execute(
             select(Issue).where(Issue.id == issue_id)
         )
@@ -629,57 +1821,34 @@ Repository: {full_name}
 
         issue.ai_plan_status = "generating"
         await db.commit()
+        previous_plan = issue.behavior_example
 
         try:
-            # 사용 가능한 라벨 목록 조회
-            label_result = await db.execute(select(Label))
-            available_labels = list(label_result.scalars().all())
-            label_names = [l.name for l in available_labels]
-            label_map = {l.name: l.id for l in available_labels}
-
-            # 연결된 리포지토리 목록 조회 (분석 결과 포함)
-            repo_result = await db.execute(select(ConnectedRepo))
-            connected_repos = list(repo_result.scalars().all())
-            repo_names = [r.full_name for r in connected_repos]
-            repo_map = {r.full_name: r for r in connected_repos}
-            repo_descriptions = []
-            for r in connected_repos:
-                desc = f"- {r.full_name}"
-                if r.description:
-                    desc += f": {r.description}"
-                repo_descriptions.append(desc)
-            repo_list_text = "\n".join(repo_descriptions) if repo_descriptions else "(연결된 리포지토리 없음)"
+            # 사용 가능한 라벨 / 연결된 리포지토리 목록 (분석 결과 포함)
+            if metadata is None:
+                metadata = await self._load_work_plan_metadata(db)
 
             # 리포 분석 컨텍스트 수집
-            repo_context = ""
-            target_repo_name = issue.repo_full_name
-            if target_repo_name and target_repo_name in repo_map:
-                target_repo = repo_map[target_repo_name]
-                repo_context = self._build_repo_analysis_context(target_repo)
-            elif not target_repo_name and connected_repos:
-                # 리포 미지정 시에도 연결된 리포 분석 결과 요약 제공
-                summaries = []
-                for r in connected_repos:
-                    summary = f"### {r.full_name}"
-                    if r.description:
-                        summary += f"\n{r.description}"
-                    if r.analysis_result:
-                        # 기본 분석 결과 앞부분만
-                        summary += f"\n{r.analysis_result[:500]}"
-                    summaries.append(summary)
-                if summaries:
-                    repo_context = "\n## 연결된 리포지토리 분석 요약\n" + "\n\n".join(summaries)
-
-            prompt = f"""당신은 소프트웨어 개발 프로젝트 매니저입니다.
+            repo_context, cached_context = await self._work_plan_repo_context(
+                issue.repo_full_name, metadata
+            )
+
+            # 지시문은 고정, 사용자 입력 > 리포 컨텍스트 > 리포 목록 순으로 토큰 예산 배정
+            packer = PromptPacker.for_model(GEMINI_MODEL_FLASH)
+            packer.add_fixed("""당신은 소프트웨어 개발 프로젝트 매니저입니다.
 사용자가 아래 설명을 입력하여 일감(task)을 등록했습니다.
 이 설명과 리포지토리 분석 결과를 참고하여 일감의 메타데이터와 구체적인 작업 계획을 생성해주세요.
 
 ## 사용자 입력
-{issue.description or '(설명 없음)'}
-{repo_context}
-
-## 연결된 리포지토리 목록
-{repo_list_text}
+""")
+            packer.add(
+                "user_input", issue.description or "(설명 없음)",
+                priority=0, max_tokens=USER_INPUT_TOKENS,
+            )
+            packer.add("repo_context", f"\n{repo_context}" if repo_context else None, priority=1)
+            packer.add_fixed("\n\n## 연결된 리포지토리 목록\n")
+            packer.add("repo_list", metadata.repo_list_text, priority=2)
+            packer.add_fixed(f"""
 
 ## 생성해야 할 항목
 
@@ -698,78 +1867,30 @@ Repository: {full_name}
 
 - **title**: 설명의 핵심을 담은 간결한 제목
 - **priority**: 작업의 긴급도/복잡도 기반 (high=긴급하거나 복잡, medium=보통, low=간단)
-- **labels**: 다음 라벨 중 해당하는 것을 선택: {json.dumps(label_names, ensure_ascii=False)}
+- **labels**: 다음 라벨 중 해당하는 것을 선택: {json.dumps(metadata.label_names, ensure_ascii=False)}
 - **repo_full_name**: 이 일감과 가장 관련 있는 리포지토리를 위 목록에서 선택. 관련 리포가 없으면 null
 
 **그 다음** 마크다운으로 작업 계획을 작성하세요.
 리포지토리의 기본 분석/심층 분석 결과가 제공된 경우, 실제 프로젝트 구조와 기술 스택을 반영하여 구체적으로 작성하세요.
-
-### 작업 계획
-1. 구체적인 단계별 작업 내용 (실제 파일 경로와 모듈명 사용)
-2. 기존 코드 구조를 고려한 구현 방법
-3. 기술적 고려사항
-
-### 예상 동작
-- 구현 완료 후 시스템의 예상 동작
-- 사용자 시나리오 관점의 기대 결과
-
-### 체크리스트
-- [ ] 구현 확인 항목
-- [ ] 테스트 항목
-
-### 주의사항
-- 구현 시 주의할 점 (기존 코드와의 호환성 등)
-
+{WORK_PLAN_SECTIONS}
 **중요**: 모든 텍스트는 한국어로, 구체적이고 실행 가능하게 작성하세요.
-"""
-
-            raw_result = await self._call_gemini(prompt)
+""")
+            packed = packer.pack()
+            if packed.dropped:
+                logger.info("작업 계획 프롬프트 축약 (issue_id=%d): %s", issue_id, packed.report())
+            prompt = packed.text
+
+            raw_result = await self._stream_work_plan(
+                issue, db, prompt, use_cache, previous_plan, cached_context, priority
+            )
 
             # JSON 블록 파싱
-            json_match = re.search(
-                r"```json\s*\n(.*?)\n\s*```", raw_result, re.DOTALL
-            )
+            json_match = _PLAN_META_RE.search(raw_result)
 
             if json_match:
                 try:
                     meta = json.loads(json_match.group(1))
-                    # 제목 업데이트
-                    if meta.get("title"):
-                        issue.title = str(meta["title"])[:255]
-                    # 우선순위 업데이트
-                    priority_val = meta.get("priority", "medium")
-                    priority_map = {
-                        "low": IssuePriority.LOW,
-                        "medium": IssuePriority.MEDIUM,
-                        "high": IssuePriority.HIGH,
-                    }
-                    if priority_val in priority_map:
-                        issue.priority = priority_map[priority_val]
-                    # 리포지토리 업데이트
-                    ai_repo = meta.get("repo_full_name")
-                    if ai_repo and ai_repo in repo_names:
-                        issue.repo_full_name = ai_repo
-                    # 라벨 업데이트
-                    ai_labels = meta.get("labels", [])
-                    if ai_labels and isinstance(ai_labels, list):
-                        matched_label_ids = [
-                            label_map[name]
-                            for name in ai_labels
-                            if name in label_map
-                        ]
-                        if matched_label_ids:
-                            # 기존 라벨 제거 후 새 라벨 연결
-                            await db.execute(
-                                issue_labels.delete().where(
-                                    issue_labels.c.issue_id == issue.id
-                                )
-                            )
-                            for lid in matched_label_ids:
-                                await db.execute(
-                                    issue_labels.insert().values(
-                                        issue_id=issue.id, label_id=lid
-                                    )
-                                )
+                    await self._apply_plan_meta(issue, meta, metadata, db)
                 except (json.JSONDecodeError, KeyError) as e:
                     logger.warning("AI 메타데이터 파싱 실패: %s", e)
 
@@ -781,6 +1902,7 @@ Repository: {full_name}
             issue.behavior_example = markdown_plan
             issue.ai_plan_status = "completed"
             await db.commit()
+            self.plan_broker.finish(issue_id, "completed")
 
             logger.info(
                 "AI 일감 생성 완료: issue_id=%d, title=%s",
@@ -790,14 +1912,308 @@ Repository: {full_name}
         except Exception as e:
             logger.exception("AI 일감 생성 실패: issue_id=%d", issue_id)
             issue.ai_plan_status = "failed"
+            # 스트리밍 중 기록된 부분 결과 대신 이전 계획 유지
+            issue.behavior_example = previous_plan
             await db.commit()
+            self.plan_broker.finish(issue_id, "failed")
+
+    async def generate_work_plans_batch(
+        self,
+        issue_ids: list[int],
+        db: AsyncSession,
+        use_cache: bool = True,
+        priority: LLMPriority = LLMPriority.INTERACTIVE,
+    ) -> None:
+        """여러 일감의 작업 계획을 리포별로 묶어 생성
+
+        같은 리포의 일감을 WORK_PLAN_BATCH_SIZE개씩 한 번의 Gemini 호출(다중 일감 JSON 응답)로
+        처리하고, 라벨/리포 목록은 배치 전체에서 한 번만 조회한다.
+        일감이 하나뿐인 묶음과 응답에서 빠진 일감은 단건 생성(스트리밍)으로 처리한다.
+        priority는 배치 호출과 단건 생성 모두에 적용된다.
+        """
+        result = await db.execute(select(Issue).where(Issue.id.in_(issue_ids)))
+        issues = list(result.scalars().all())
+        if not issues:
+            return
+        previous_plans = {issue.id: issue.behavior_example for issue in issues}
+        for issue in issues:
+            issue.ai_plan_status = "generating"
+        await db.commit()
+
+        # 상태를 커밋한 뒤의 예외로 일감이 generating에 머물지 않도록 남은 일감은 실패 처리
+        pending = set(previous_plans)
+        try:
+            metadata = await self._load_work_plan_metadata(db)
+            groups: dict[Optional[str], list[Issue]] = {}
+            for issue in issues:
+                groups.setdefault(issue.repo_full_name, []).append(issue)
+            chunks = [
+                group[i:i + WORK_PLAN_BATCH_SIZE]
+                for group in groups.values()
+                for i in range(0, len(group), WORK_PLAN_BATCH_SIZE)
+            ]
+            single_ids = [chunk[0].id for chunk in chunks if len(chunk) == 1]
+            batches = [chunk for chunk in chunks if len(chunk) > 1]
+
+            # 묶음별 Gemini 호출은 병렬, DB 반영은 같은 세션에서 순차 처리
+            requests = [
+                await self._build_batch_plan_prompt(chunk, metadata) for chunk in batches
+            ]
+            responses = await asyncio.gather(
+                *(
+                    self._call_gemini(
+                        prompt, generation_config={"responseMimeType": "application/json"},
+                        use_cache=use_cache, priority=priority,
+                        cached_content=cached_context,
+                    )
+                    for prompt, cached_context in requests
+                ),
+                return_exceptions=True,
+            )
+
+            for chunk, response in zip(batches, responses):
+                if isinstance(response, BaseException):
+                    logger.error(
+                        "AI 일감 배치 생성 실패 (%s, %d건): %s",
+                        chunk[0].repo_full_name, len(chunk), response,
+                    )
+                    await self._fail_batch_plans(chunk, previous_plans, db)
+                    pending.difference_update(issue.id for issue in chunk)
+                    continue
+
+                plans = self._parse_batch_plans(response)
+                completed: list[Issue] = []
+                for issue in chunk:
+                    plan = plans.get(issue.id)
+                    if not plan or not str(plan.get("plan") or "").strip():
+                        single_ids.append(issue.id)
+                        continue
+                    await self._apply_plan_meta(issue, plan, metadata, db)
+                    issue.behavior_example = str(plan["plan"]).strip()
+                    issue.ai_plan_status = "completed"
+                    completed.append(issue)
+                await db.commit()
+                for issue in completed:
+                    pending.discard(issue.id)
+                    self.plan_broker.finish(issue.id, "completed")
+                logger.info(
+                    "AI 일감 배치 생성 완료: %s %d/%d건",
+                    chunk[0].repo_full_name, len(completed), len(chunk),
+                )
+
+            for issue_id in single_ids:
+                await self.generate_work_plan(
+                    issue_id, db, use_cache, metadata=metadata, priority=priority
+                )
+                pending.discard(issue_id)
+        except Exception:
+            logger.exception("AI 일감 배치 생성 중단: issue_ids=%s", sorted(pending))
+            await db.rollback()
+            result = await db.execute(select(Issue).where(Issue.id.in_(pending)))
+            await self._fail_batch_plans(list(result.scalars().all()), previous_plans, db)
+
+    async def _fail_batch_plans(
+        self, issues: list[Issue], previous_plans: dict[int, Optional[str]], db: AsyncSession
+    ) -> None:
+        """배치 생성 실패: 이전 작업 계획을 복원하고 실패 상태를 구독자에게 알림"""
+        for issue in issues:
+            issue.ai_plan_status = "failed"
+            issue.behavior_example = previous_plans[issue.id]
+        await db.commit()
+        for issue in issues:
+            self.plan_broker.finish(issue.id, "failed")
+
+    async def _build_batch_plan_prompt(
+        self, issues: list[Issue], metadata: WorkPlanMetadata
+    ) -> tuple[str, Optional[CachedContext]]:
+        """같은 리포 일감 여러 개의 작업 계획을 JSON 배열로 요청하는 프롬프트"""
+        repo_context, cached_context = await self._work_plan_repo_context(
+            issues[0].repo_full_name, metadata
+        )
+        packer = PromptPacker.for_model(GEMINI_MODEL_FLASH)
+        packer.add_fixed("""당신은 소프트웨어 개발 프로젝트 매니저입니다.
+아래 일감(task)들이 한꺼번에 등록되었습니다.
+각 설명과 리포지토리 분석 결과를 참고하여 일감마다 메타데이터와 구체적인 작업 계획을 생성해주세요.
+
+## 일감 목록
+""")
+        for issue in issues:
+            packer.add_fixed(f"\n### issue_id: {issue.id}\n")
+            packer.add(
+                f"issue_{issue.id}", issue.description or "(설명 없음)",
+                priority=0, max_tokens=BATCH_ISSUE_INPUT_TOKENS,
+            )
+        packer.add("repo_context", f"\n\n{repo_context}" if repo_context else None, priority=1)
+        packer.add_fixed("\n\n## 연결된 리포지토리 목록\n")
+        packer.add("repo_list", metadata.repo_list_text, priority=2)
+        packer.add_fixed(f"""
+
+## 응답 형식
+
+일감마다 하나의 객체를 담은 JSON 배열만 출력하세요:
+
+```json
+[
+  {{
+    "issue_id": 123,
+    "title": "간결한 일감 제목 (최대 80자, 한국어)",
+    "priority": "low|medium|high",
+    "labels": ["사용 가능한 라벨 중 선택"],
+    "repo_full_name": "owner/repo 또는 null",
+    "plan": "마크다운 작업 계획"
+  }}
+]
+```
+
+- **issue_id**: 위 목록의 issue_id를 그대로 사용하고, 모든 일감을 빠짐없이 포함
+- **priority**: 작업의 긴급도/복잡도 기반 (high=긴급하거나 복잡, medium=보통, low=간단)
+- **labels**: 다음 라벨 중 해당하는 것을 선택: {json.dumps(metadata.label_names, ensure_ascii=False)}
+- **repo_full_name**: 이 일감과 가장 관련 있는 리포지토리를 위 목록에서 선택. 관련 리포가 없으면 null
+- **plan**: 아래 구성의 마크다운 작업 계획. 리포지토리 분석 결과가 제공된 경우 실제 프로젝트 구조와 기술 스택을 반영
+{WORK_PLAN_SECTIONS}
+**중요**: 모든 텍스트는 한국어로, 구체적이고 실행 가능하게 작성하세요.
+""")
+        packed = packer.pack()
+        if packed.dropped:
+            logger.info(
+                "배치 작업 계획 프롬프트 축약 (%s): %s",
+                issues[0].repo_full_name, packed.report(),
+            )
+        return packed.text, cached_context
+
+    @staticmethod
+    def _parse_batch_plans(raw: str) -> dict[int, dict]:
+        """다중 일감 응답(JSON 배열)을 issue_id별로 분리 (형식이 어긋나면 빈 dict)"""
+        text = raw.strip()
+        match = _PLAN_META_RE.search(text)
+        if match:
+            text = match.group(1)
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            logger.warning("배치 작업 계획 응답 파싱 실패")
+            return {}
+        if isinstance(data, dict):
+            data = data.get("plans", [])
+        plans: dict[int, dict] = {}
+        for item in data if isinstance(data, list) else []:
+            if not isinstance(item, dict):
+                continue
+            try:
+                plans[int(item["issue_id"])] = item
+            except (KeyError, TypeError, ValueError):
+                continue
+        return plans
+
+    async def _stream_work_plan(
+        self,
+        issue: Issue,
+        db: AsyncSession,
+        prompt: str,
+        use_cache: bool,
+        previous_plan: Optional[str],
+        cached_context: Optional[CachedContext] = None,
+        priority: LLMPriority = LLMPriority.INTERACTIVE,
+    ) -> str:
+        """작업 계획을 스트리밍으로 생성하며 진행 상황을 브로커와 DB에 반영
+
+        구독자에게는 메타데이터 JSON 블록을 제외한 계획 본문 조각만 전달하고,
+        DB에는 PLAN_FLUSH_INTERVAL마다 지금까지의 본문을 기록한다 (폴링 클라이언트용).
+        """
+        self.plan_broker.start(issue.id)
+        chunks: list[str] = []
+        sent = 0
+        last_flush = time.monotonic()
+        async for chunk in self._stream_gemini(
+            prompt, use_cache=use_cache, priority=priority,
+            cached_content=cached_context,
+        ):
+            chunks.append(chunk)
+            partial = self._partial_plan("".join(chunks))
+            if len(partial) > sent:
+                self.plan_broker.publish(issue.id, partial[sent:])
+                sent = len(partial)
+            if partial and time.monotonic() - last_flush >= PLAN_FLUSH_INTERVAL:
+                issue.behavior_example = partial
+                await db.commit()
+                last_flush = time.monotonic()
+        return "".join(chunks)
 
     # ── Phase 3: 커밋 히스토리 분석 ──────────────────────────────
 
+    async def refresh_commit_analysis(
+        self, repo_id: int, db: AsyncSession, force: bool = False
+    ) -> bool:
+        """기본 브랜치 head 기준으로 커밋 분석 갱신 (실제로 분석했으면 True)
+
+        - head가 마지막 분석 SHA와 같으면 건너뜀
+        - 마지막 분석 이후 새 커밋이 MAX_INCREMENTAL_COMMITS개 이하면
+          새 커밋만 보내 기존 요약을 갱신
+        - 그 외(최초 분석, force, 강제 push 등)에는 최근 30개로 전체 분석
+        """
+        result = await db.execute(
+            select(ConnectedRepo).where(ConnectedRepo.id == repo_id)
+        )
+        repo = result.scalar_one_or_none()
+        if not repo or repo.commit_analysis_status == "analyzing":
+            return False
+
+        owner, repo_name = repo.full_name.split("/", 1)
+        head_sha = await self.github.resolve_commit_sha(
+            owner, repo_name, repo.default_branch
+        )
+        if not head_sha:
+            return False
+
+        can_update = (
+            not force
+            and repo.commit_analysis_status == "completed"
+            and repo.commit_analysis_result
+            and repo.commit_analyzed_sha
+        )
+        if can_update and repo.commit_analyzed_sha == head_sha:
+            logger.info("커밋 분석 스킵 (변경 없음): %s", repo.full_name)
+            return False
+
+        if can_update:
+            comparison = await self.github.compare_commits(
+                owner, repo_name, repo.commit_analyzed_sha, head_sha
+            )
+            if (
+                comparison
+                and comparison["status"] == "ahead"
+                and 0 < comparison["ahead_by"] <= MAX_INCREMENTAL_COMMITS
+            ):
+                await self.analyze_commits(
+                    repo_id, db, comparison["commits"],
+                    head_sha=head_sha,
+                    previous_analysis=repo.commit_analysis_result,
+                )
+                return True
+
+        commits = await self.github.get_commits(
+            owner, repo_name, sha=head_sha, per_page=30
+        )
+        if not commits:
+            return False
+        await self.analyze_commits(
+            repo_id, db, commits, head_sha=head_sha, use_cache=not force
+        )
+        return True
+
     async def analyze_commits(
-        self, repo_id: int, db: AsyncSession, commits_data: List[dict]
+        self,
+        repo_id: int,
+        db: AsyncSession,
+        commits_data: List[dict],
+        head_sha: Optional[str] = None,
+        previous_analysis: Optional[str] = None,
+        use_cache: bool = True,
     ) -> None:
-        """커밋 히스토리를 AI로 분석하고 결과를 DB에 저장"""
+        """커밋 히스토리를 AI로 분석하고 결과를 DB에 저장
+
+        previous_analysis가 있으면 commits_data(새 커밋)로 기존 요약을 갱신한다.
+        """
         result = await db.execute(
             select(ConnectedRepo).where(ConnectedRepo.id == repo_id)
         )
@@ -811,20 +2227,36 @@ Repository: {full_name}
         await db.commit()
 
         try:
-            prompt = self._build_commit_analysis_prompt(
-                repo.full_name, repo.description, commits_data
+            # 목록 API에는 변경 통계가 없으므로 커밋 상세 저장소로 채움
+            owner, repo_name = repo.full_name.split("/", 1)
+            commits_data = await self.commit_store.enrich_commits(
+                self.github, owner, repo_name, commits_data
+            )
+            if previous_analysis:
+                prompt = self._build_commit_update_prompt(
+                    repo.full_name, previous_analysis, commits_data
+                )
+            else:
+                prompt = self._build_commit_analysis_prompt(
+                    repo.full_name, repo.description, commits_data
+                )
+            analysis = await self._call_gemini(
+                prompt, use_cache=use_cache, priority=LLMPriority.COMMIT_ANALYSIS
             )
-            analysis = await self._call_gemini(prompt)
 
             repo.commit_analysis_status = "completed"
             repo.commit_analysis_result = analysis
             repo.commit_analysis_error = None
             repo.commit_analyzed_at = datetime.utcnow()
+            repo.commit_analyzed_sha = head_sha or (
+                commits_data[0]["sha"] if commits_data else repo.commit_analyzed_sha
+            )
             await db.commit()
 
             logger.info(
-                "커밋 분석 완료: %s (id=%d, 커밋 %d개)",
+                "커밋 분석 완료: %s (id=%d, 커밋 %d개, %s)",
                 repo.full_name, repo_id, len(commits_data),
+                "증분" if previous_analysis else "전체",
             )
 
         except Exception as e:
@@ -834,24 +2266,63 @@ Repository: {full_name}
             repo.commit_analyzed_at = datetime.utcnow()
             await db.commit()
 
-    def _build_commit_analysis_prompt(
-        self,
-        full_name: str,
-        description: Optional[str],
-        commits_data: List[dict],
-    ) -> str:
-        """커밋 히스토리 분석 프롬프트 생성"""
-        commits_section = ""
+    @staticmethod
+    def _format_commits_section(commits_data: List[dict]) -> str:
+        """프롬프트용 커밋 목록 (작성자, 제목, 변경 통계, 주요 파일)"""
+        lines: list[str] = []
         for c in commits_data:
             stats_info = ""
             if c.get("stats"):
                 s = c["stats"]
                 stats_info = f" (+{s.get('additions', 0)} -{s.get('deletions', 0)})"
-            commits_section += (
+            lines.append(
                 f"- [{c.get('author_date', '')}] "
                 f"{c.get('author_name', 'Unknown')} <{c.get('author_email', '')}>\n"
                 f"  {c.get('message', '').split(chr(10))[0]}{stats_info}\n"
             )
+            if c.get("files"):
+                files = c["files"]
+                files_info = "  files: " + ", ".join(files[:5])
+                if len(files) > 5:
+                    files_info += f" 외 {len(files) - 5}개"
+                lines.append(files_info + "\n")
+        return "".join(lines)
+
+    def _build_commit_update_prompt(
+        self,
+        full_name: str,
+        previous_analysis: str,
+        new_commits: List[dict],
+    ) -> str:
+        """기존 커밋 분석을 새 커밋으로 갱신하는 프롬프트"""
+        return f"""You are a senior software engineer maintaining a running analysis of a repository's commit history.
+
+Repository: {full_name}
+
+## 기존 커밋 히스토리 분석
+{previous_analysis}
+
+## 이후 새로 추가된 커밋 ({len(new_commits)}개)
+{self._format_commits_section(new_commits)}
+
+## 요청 (한국어로 응답)
+
+새 커밋을 반영하여 기존 분석을 갱신하세요.
+- 기존 분석과 같은 섹션 구성(최근 작업 방향 요약, 주요 변경 사항 카테고리, 코드 품질/패턴 트렌드, 기여자별 작업 분석, 다음 작업 제안)을 유지하세요.
+- 새 커밋으로 달라진 내용만 수정·추가하고, 여전히 유효한 내용은 그대로 두세요.
+- "다음 작업 제안"에서 새 커밋으로 이미 완료된 항목은 제거하세요.
+
+갱신된 전체 분석을 마크다운으로 출력하세요.
+"""
+
+    def _build_commit_analysis_prompt(
+        self,
+        full_name: str,
+        description: Optional[str],
+        commits_data: List[dict],
+    ) -> str:
+        """커밋 히스토리 분석 프롬프트 생성"""
+        commits_section = self._format_commits_section(commits_data)
 
         return f"""You are a senior software engineer analyzing a repository's recent commit history.
 
@@ -927,3 +2398,30 @@ Repository: {full_name}
             markdown_report = raw_response[: json_match.start()].rstrip()
 
         return suggestions, markdown_report
+
+
+def schedule_work_plans(
+    issue_ids: list[int],
+    github_token: Optional[str] = None,
+    use_cache: bool = True,
+    priority: LLMPriority = LLMPriority.INTERACTIVE,
+) -> None:
+    """일감들의 AI 작업 계획을 백그라운드에서 리포별 배치로 생성
+
+    호출 전에 일감의 ai_plan_status를 generating으로 커밋해 두어야 한다.
+    """
+
+    async def _generate_plans():
+        async with async_session_maker() as bg_db:
+            try:
+                service = GeminiAnalysisService(GitHubAPIService(github_token or ""))
+                await service.generate_work_plans_batch(
+                    issue_ids, bg_db, use_cache=use_cache, priority=priority
+                )
+            except Exception:
+                logger.exception(
+                    "Background batch work plan generation failed: issue_ids=%s",
+                    issue_ids,
+                )
+
+    asyncio.create_task(_generate_plans())
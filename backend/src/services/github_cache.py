@@ -0,0 +1,213 @@
+"""GitHub API 조건부 요청(ETag / Last-Modified) 캐시"""
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional, Callable
+
+import httpx
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import get_settings
+from src.database import async_session_maker
+from src.models.github_http_cache import GitHubHttpCache
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# 캐시 응답을 재구성할 때 보존하는 헤더
+_PRESERVED_HEADERS = ("Content-Type", "Link", "ETag", "Last-Modified")
+# 이 횟수만큼 저장할 때마다 만료/한도 초과 항목 정리
+EVICT_EVERY_PUTS = 100
+
+
+@dataclass
+class CachedResponse:
+    """캐시에 저장된 GitHub 응답"""
+    etag: Optional[str]
+    last_modified: Optional[str]
+    headers: dict[str, str]
+    body: str
+
+    def conditional_headers(self) -> dict[str, str]:
+        """조건부 요청 헤더 (If-None-Match 우선)"""
+        if self.etag:
+            return {"If-None-Match": self.etag}
+        if self.last_modified:
+            return {"If-Modified-Since": self.last_modified}
+        return {}
+
+    def to_response(self, request: Optional[httpx.Request] = None) -> httpx.Response:
+        """304 응답 대신 반환할 200 응답 재구성"""
+        return httpx.Response(
+            200,
+            content=self.body.encode("utf-8"),
+            headers=self.headers,
+            request=request,
+        )
+
+
+class GitHubResponseCache:
+    """GitHub API 응답을 DB에 저장하고 304 응답 시 재사용하는 캐시
+
+    키는 (토큰 해시, Accept, URL, 쿼리 파라미터)로 구성되어 사용자별로 분리된다.
+    마지막으로 저장된 지 max_age_seconds가 지난 항목(토큰 교체로 더 이상 쓰이지 않는 항목 포함)은
+    미스로 취급해 삭제하고, 항목 수가 max_entries를 넘으면 오래 갱신되지 않은 것부터 삭제한다.
+    캐시 저장소 오류는 요청 실패로 이어지지 않도록 경고 로그만 남긴다.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] = async_session_maker,
+        max_age_seconds: int = settings.github_cache_max_age_seconds,
+        max_entries: int = settings.github_cache_max_entries,
+    ):
+        self.session_factory = session_factory
+        self.max_age_seconds = max_age_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+
+    @staticmethod
+    def make_key(
+        access_token: str,
+        url: str,
+        params: Optional[dict] = None,
+        accept: str = "",
+    ) -> str:
+        """토큰별로 분리된 캐시 키 생성"""
+        token_hash = hashlib.sha256(access_token.encode()).hexdigest()
+        query = json.dumps(params or {}, sort_keys=True, default=str)
+        raw = "\n".join([token_hash, accept, url, query])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        """캐시 조회"""
+        try:
+            async with self.session_factory() as db:
+                entry = await db.get(GitHubHttpCache, key)
+                if not entry or self._expired(entry):
+                    return None
+                return CachedResponse(
+                    etag=entry.etag,
+                    last_modified=entry.last_modified,
+                    headers=json.loads(entry.headers) if entry.headers else {},
+                    body=entry.body,
+                )
+        except Exception as e:
+            logger.warning("GitHub 캐시 조회 실패: %s", e)
+            return None
+
+    async def put(
+        self,
+        key: str,
+        url: str,
+        response: httpx.Response,
+        repo_full_name: Optional[str] = None,
+    ) -> None:
+        """검증자(ETag/Last-Modified)가 있는 200 응답 저장"""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+
+        headers = {
+            name: response.headers[name]
+            for name in _PRESERVED_HEADERS
+            if name in response.headers
+        }
+        try:
+            async with self.session_factory() as db:
+                entry = await db.get(GitHubHttpCache, key)
+                if entry is None:
+                    entry = GitHubHttpCache(cache_key=key, url=url, body="")
+                    db.add(entry)
+                entry.repo_full_name = repo_full_name
+                entry.etag = etag
+                entry.last_modified = last_modified
+                entry.headers = json.dumps(headers)
+                entry.body = response.text
+                await db.commit()
+        except Exception as e:
+            logger.warning("GitHub 캐시 저장 실패: %s", e)
+            return
+
+        self._puts += 1
+        if self._puts % EVICT_EVERY_PUTS == 0:
+            await self.evict()
+
+    def _expired(self, entry: GitHubHttpCache) -> bool:
+        return self.max_age_seconds > 0 and (
+            entry.updated_at < datetime.utcnow() - timedelta(seconds=self.max_age_seconds)
+        )
+
+    async def evict(self) -> int:
+        """보관 기간이 지난 항목 삭제 후 항목 수 한도를 넘으면 오래된 순으로 삭제
+
+        저장 중 주기적으로, 그리고 앱 시작 시 호출된다. 삭제한 항목 수를 반환한다.
+        """
+        removed = 0
+        try:
+            async with self.session_factory() as db:
+                if self.max_age_seconds > 0:
+                    cutoff = datetime.utcnow() - timedelta(seconds=self.max_age_seconds)
+                    result = await db.execute(
+                        delete(GitHubHttpCache).where(GitHubHttpCache.updated_at < cutoff)
+                    )
+                    removed += result.rowcount or 0
+
+                if self.max_entries > 0:
+                    total = await db.scalar(select(func.count()).select_from(GitHubHttpCache))
+                    excess = (total or 0) - self.max_entries
+                    if excess > 0:
+                        oldest = (
+                            select(GitHubHttpCache.cache_key)
+                            .order_by(GitHubHttpCache.updated_at)
+                            .limit(excess)
+                        )
+                        result = await db.execute(
+                            delete(GitHubHttpCache).where(GitHubHttpCache.cache_key.in_(oldest))
+                        )
+                        removed += result.rowcount or 0
+                await db.commit()
+        except Exception as e:
+            logger.warning("GitHub 캐시 정리 실패: %s", e)
+            return removed
+
+        if removed:
+            logger.info("GitHub 캐시 정리: %d개 항목 삭제", removed)
+        return removed
+
+    async def invalidate_repo(self, repo_full_name: str) -> None:
+        """특정 리포지토리의 캐시 항목 전체 삭제"""
+        try:
+            async with self.session_factory() as db:
+                await db.execute(
+                    delete(GitHubHttpCache).where(
+                        GitHubHttpCache.repo_full_name == repo_full_name
+                    )
+                )
+                await db.commit()
+        except Exception as e:
+            logger.warning("GitHub 캐시 무효화 실패: %s — %s", repo_full_name, e)
+
+    def record_hit(self) -> None:
+        self.hits += 1
+
+    def record_miss(self) -> None:
+        self.misses += 1
+
+    def stats(self) -> dict:
+        """히트/미스 카운터"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+github_response_cache = GitHubResponseCache()
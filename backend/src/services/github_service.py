@@ -1,15 +1,21 @@
 """GitHub OAuth 및 API 서비스"""
-from typing import Optional, List
-import httpx
+import asyncio
+from contextlib import AbstractAsyncContextManager
+from typing import AsyncIterator, Optional, List
+from urllib.parse import parse_qs, urlsplit
 import re
+import httpx
 from fastapi import HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.auth import principal_cache
 from src.config import get_settings
 from src.crypto import encrypt_token
-from src.http_client import request_with_retry, DEFAULT_TIMEOUT
+from src.http_client import request_with_retry, stream_request, DEFAULT_TIMEOUT
 from src.models.user import User
+from src.services.github_cache import GitHubResponseCache, github_response_cache
+from src.services.tree_cache import RepoTreeCache, repo_tree_cache
 
 settings = get_settings()
 
@@ -17,6 +23,7 @@ GITHUB_AUTHORIZE_URL = "https://github.com/login/oauth/authorize"
 GITHUB_TOKEN_URL = "https://github.com/login/oauth/access_token"
 GITHUB_API_URL = "https://api.github.com"
 HTTP_TIMEOUT = DEFAULT_TIMEOUT
+ARCHIVE_TIMEOUT = 60.0
 
 
 class GitHubService:
@@ -49,56 +56,61 @@ class GitHubService:
         user.github_repo_token = encrypt_token(access_token)
         await self.db.commit()
         await self.db.refresh(user)
+        principal_cache.invalidate_user(user.id)
         return user
 
     async def exchange_code_for_token(self, code: str) -> str:
         """인증 코드를 액세스 토큰으로 교환"""
-        async with httpx.AsyncClient(timeout=HTTP_TIMEOUT) as client:
-            response = await client.post(
-                GITHUB_TOKEN_URL,
-                data={
-                    "client_id": settings.github_client_id,
-                    "client_secret": settings.github_client_secret,
-                    "code": code,
-                },
-                headers={"Accept": "application/json"},
-            )
+        # 인증 코드는 일회용이므로 재시도하지 않는다
+        response = await request_with_retry(
+            "POST",
+            GITHUB_TOKEN_URL,
+            data={
+                "client_id": settings.github_client_id,
+                "client_secret": settings.github_client_secret,
+                "code": code,
+            },
+            headers={"Accept": "application/json"},
+            timeout=HTTP_TIMEOUT,
+            max_retries=1,
+        )
 
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="GitHub 토큰 교환 실패"
-                )
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="GitHub 토큰 교환 실패"
+            )
 
-            data = response.json()
-            access_token = data.get("access_token")
+        data = response.json()
+        access_token = data.get("access_token")
 
-            if not access_token:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=data.get("error_description", "토큰 획득 실패")
-                )
+        if not access_token:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=data.get("error_description", "토큰 획득 실패")
+            )
 
-            return access_token
+        return access_token
 
     async def get_github_user(self, access_token: str) -> dict:
         """GitHub 사용자 정보 조회"""
-        async with httpx.AsyncClient(timeout=HTTP_TIMEOUT) as client:
-            response = await client.get(
-                f"{GITHUB_API_URL}/user",
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Accept": "application/vnd.github+json",
-                },
-            )
+        response = await request_with_retry(
+            "GET",
+            f"{GITHUB_API_URL}/user",
+            headers={
+                "Authorization": f"Bearer {access_token}",
+                "Accept": "application/vnd.github+json",
+            },
+            timeout=HTTP_TIMEOUT,
+        )
 
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="GitHub 사용자 정보 조회 실패"
-                )
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="GitHub 사용자 정보 조회 실패"
+            )
 
-            return response.json()
+        return response.json()
 
     async def get_or_create_user(self, access_token: str) -> User:
         """GitHub 사용자 조회 또는 생성"""
@@ -131,6 +143,7 @@ class GitHubService:
 
         await self.db.commit()
         await self.db.refresh(user)
+        principal_cache.invalidate_user(user.id)
         return user
 
     async def get_user_by_id(self, user_id: int) -> Optional[User]:
@@ -144,19 +157,148 @@ class GitHubService:
 class GitHubAPIService:
     """GitHub API 호출 서비스"""
 
-    def __init__(self, access_token: str):
+    def __init__(
+        self,
+        access_token: str,
+        cache: Optional[GitHubResponseCache] = None,
+        tree_cache: Optional[RepoTreeCache] = None,
+    ):
         self.access_token = access_token
         self.headers = {
             "Authorization": f"Bearer {access_token}",
             "Accept": "application/vnd.github+json",
         }
+        self.cache = cache or github_response_cache
+        self.tree_cache = tree_cache or repo_tree_cache
+
+    async def _cached_get(
+        self,
+        url: str,
+        params: Optional[dict] = None,
+        repo_full_name: Optional[str] = None,
+        accept: Optional[str] = None,
+    ) -> httpx.Response:
+        """ETag/Last-Modified 조건부 GET — 304 응답 시 캐시된 본문을 200으로 반환"""
+        headers = dict(self.headers)
+        if accept:
+            headers["Accept"] = accept
+        key = self.cache.make_key(
+            self.access_token, url, params, headers["Accept"]
+        )
+        cached = await self.cache.get(key)
+
+        if cached:
+            headers.update(cached.conditional_headers())
+
+        response = await request_with_retry(
+            "GET", url, headers=headers, params=params,
+        )
+
+        if response.status_code == 304 and cached:
+            self.cache.record_hit()
+            return cached.to_response(request=response.request)
+
+        self.cache.record_miss()
+        if response.status_code == 200:
+            await self.cache.put(key, url, response, repo_full_name)
+        return response
+
+    @staticmethod
+    def _raise_for_status(
+        response: httpx.Response,
+        detail: str,
+        not_found_detail: Optional[str] = None,
+    ) -> None:
+        """200이 아닌 응답을 HTTPException으로 변환"""
+        if response.status_code == 404 and not_found_detail:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=not_found_detail,
+            )
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=detail,
+            )
+
+    @staticmethod
+    def _last_page(response: httpx.Response) -> int:
+        """Link 헤더의 rel="last"에서 마지막 페이지 번호 추출 (없으면 1)"""
+        last_url = response.links.get("last", {}).get("url")
+        if not last_url:
+            return 1
+        pages = parse_qs(urlsplit(last_url).query).get("page")
+        try:
+            return int(pages[0]) if pages else 1
+        except ValueError:
+            return 1
+
+    async def iter_pages(
+        self,
+        url: str,
+        params: Optional[dict] = None,
+        *,
+        detail: str,
+        not_found_detail: Optional[str] = None,
+        per_page: int = 100,
+        max_pages: Optional[int] = None,
+        repo_full_name: Optional[str] = None,
+    ) -> AsyncIterator[tuple[int, List[dict]]]:
+        """목록 엔드포인트의 페이지를 도착하는 순서대로 (page, items)로 스트리밍
+
+        1페이지 응답의 Link: rel="last"로 전체 페이지 수를 알아낸 뒤
+        나머지 페이지를 세마포어로 동시성을 제한하여 병렬 조회한다.
+        """
+        base_params = {**(params or {}), "per_page": per_page}
+
+        async def fetch(page: int) -> tuple[int, List[dict]]:
+            response = await self._cached_get(
+                url, params={**base_params, "page": page},
+                repo_full_name=repo_full_name,
+            )
+            self._raise_for_status(response, detail, not_found_detail)
+            return page, response.json()
+
+        first = await self._cached_get(
+            url, params={**base_params, "page": 1}, repo_full_name=repo_full_name,
+        )
+        self._raise_for_status(first, detail, not_found_detail)
+        yield 1, first.json()
+
+        last_page = self._last_page(first)
+        if max_pages is not None:
+            last_page = min(last_page, max_pages)
+        if last_page <= 1:
+            return
+
+        semaphore = asyncio.Semaphore(settings.github_pagination_concurrency)
+
+        async def bounded_fetch(page: int) -> tuple[int, List[dict]]:
+            async with semaphore:
+                return await fetch(page)
+
+        tasks = [
+            asyncio.create_task(bounded_fetch(page))
+            for page in range(2, last_page + 1)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def fetch_all_pages(self, url: str, params: Optional[dict] = None, **kwargs) -> List[dict]:
+        """모든 페이지를 병렬 조회한 뒤 페이지 순서대로 합쳐 반환"""
+        pages: dict[int, List[dict]] = {}
+        async for page, items in self.iter_pages(url, params, **kwargs):
+            pages[page] = items
+        return [item for page in sorted(pages) for item in pages[page]]
 
     async def get_repos(self, per_page: int = 100, page: int = 1) -> List[dict]:
         """사용자 리포지토리 목록 조회 (단일 페이지)"""
-        response = await request_with_retry(
-            "GET",
+        response = await self._cached_get(
             f"{GITHUB_API_URL}/user/repos",
-            headers=self.headers,
             params={
                 "per_page": per_page,
                 "page": page,
@@ -174,21 +316,12 @@ class GitHubAPIService:
         return response.json()
 
     async def get_all_repos(self) -> List[dict]:
-        """사용자의 전체 리포지토리 목록 조회 (모든 페이지 순회)"""
-        all_repos: List[dict] = []
-        page = 1
-        per_page = 100  # GitHub API 최대값
-
-        while True:
-            repos = await self.get_repos(per_page=per_page, page=page)
-            if not repos:
-                break
-            all_repos.extend(repos)
-            if len(repos) < per_page:
-                break
-            page += 1
-
-        return all_repos
+        """사용자의 전체 리포지토리 목록 조회 (모든 페이지 병렬 조회)"""
+        return await self.fetch_all_pages(
+            f"{GITHUB_API_URL}/user/repos",
+            {"sort": "updated", "direction": "desc"},
+            detail="리포지토리 목록 조회 실패",
+        )
 
     async def get_repo_structure(self, owner: str, repo: str, path: str = "") -> List[dict]:
         """리포지토리 디렉토리 구조 조회"""
@@ -214,49 +347,107 @@ class GitHubAPIService:
 
     _FALLBACK_BRANCHES = ["main", "master"]
 
+    async def resolve_commit_sha(self, owner: str, repo: str, ref: str) -> Optional[str]:
+        """브랜치/태그를 커밋 SHA로 해석 (없으면 None)
+
+        SHA 미디어 타입은 40자 SHA 문자열만 반환하고 ETag 조건부 요청이 가능하므로
+        브랜치가 움직이지 않았다면 304로 끝난다.
+        """
+        self._validate_owner_repo(owner, repo)
+        response = await self._cached_get(
+            f"{GITHUB_API_URL}/repos/{owner}/{repo}/commits/{ref}",
+            repo_full_name=f"{owner}/{repo}",
+            accept="application/vnd.github.sha",
+        )
+        if response.status_code in (404, 409, 422):
+            return None
+        self._raise_for_status(response, "커밋 SHA 조회 실패")
+        return response.text.strip() or None
+
     async def get_repo_tree(self, owner: str, repo: str, branch: str = "main") -> dict:
         """리포지토리 전체 트리 조회 (main → master 순으로 시도)"""
+        _, tree = await self.resolve_repo_tree(owner, repo, branch)
+        return tree
+
+    async def resolve_repo_tree(
+        self, owner: str, repo: str, branch: str = "main"
+    ) -> tuple[str, dict]:
+        """브랜치를 커밋 SHA로 해석하고 (커밋 SHA, 재귀 트리) 반환
+
+        SHA 기준 트리 캐시를 조회하므로 커밋이 바뀌지 않았다면 트리를 다시 내려받지 않는다.
+        """
         self._validate_owner_repo(owner, repo)
 
         branches_to_try = (
             self._FALLBACK_BRANCHES if branch == "main" else [branch]
         )
 
-        response = None
+        status_code = 404
         for b in branches_to_try:
-            url = f"{GITHUB_API_URL}/repos/{owner}/{repo}/git/trees/{b}?recursive=1"
-            response = await request_with_retry("GET", url, headers=self.headers)
+            commit_sha = await self.resolve_commit_sha(owner, repo, b)
+            if not commit_sha:
+                continue
+
+            cached = self.tree_cache.get_by_commit(commit_sha)
+            if cached is not None:
+                return commit_sha, cached
+
+            # SHA로 조회하는 트리는 불변이므로 조건부 요청 캐시를 거치지 않는다
+            response = await request_with_retry(
+                "GET",
+                f"{GITHUB_API_URL}/repos/{owner}/{repo}/git/trees/{commit_sha}",
+                headers=self.headers,
+                params={"recursive": 1},
+            )
             if response.status_code == 200:
-                return response.json()
+                data = response.json()
+                self.tree_cache.put(commit_sha, data)
+                return commit_sha, data
+            status_code = response.status_code
 
         raise HTTPException(
-            status_code=response.status_code if response else 500,
+            status_code=status_code,
             detail="리포지토리 트리 조회 실패"
         )
 
-    async def get_repo_issues(self, owner: str, repo: str, state: str = "open") -> list:
-        """리포지토리 이슈 목록 조회"""
+    def stream_tarball(
+        self, owner: str, repo: str, ref: str
+    ) -> AbstractAsyncContextManager[httpx.Response]:
+        """리포지토리 tarball(gzip) 스트리밍 요청 (codeload 리다이렉트 추종)"""
         self._validate_owner_repo(owner, repo)
+        return stream_request(
+            "GET",
+            f"{GITHUB_API_URL}/repos/{owner}/{repo}/tarball/{ref}",
+            headers=self.headers,
+            timeout=ARCHIVE_TIMEOUT,
+            follow_redirects=True,
+        )
 
-        url = f"{GITHUB_API_URL}/repos/{owner}/{repo}/issues"
+    async def get_blob(self, owner: str, repo: str, sha: str) -> Optional[bytes]:
+        """blob SHA로 파일 원본 바이트 조회 (raw 미디어 타입, base64 디코딩 불필요)"""
+        self._validate_owner_repo(owner, repo)
+        headers = {**self.headers, "Accept": "application/vnd.github.raw"}
         response = await request_with_retry(
             "GET",
-            url,
-            headers=self.headers,
-            params={"state": state, "per_page": 30, "sort": "updated"},
+            f"{GITHUB_API_URL}/repos/{owner}/{repo}/git/blobs/{sha}",
+            headers=headers,
         )
+        if response.status_code != 200:
+            return None
+        return response.content
 
-        if response.status_code == 404:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="리포지토리를 찾을 수 없습니다",
-            )
+    async def get_repo_issues(self, owner: str, repo: str, state: str = "open") -> list:
+        """리포지토리 이슈 목록 조회 (최근 업데이트 순, 최대 github_issues_max_pages 페이지)"""
+        self._validate_owner_repo(owner, repo)
 
-        if response.status_code != 200:
-            raise HTTPException(
-                status_code=response.status_code,
-                detail="이슈 목록 조회 실패",
-            )
+        issues = await self.fetch_all_pages(
+            f"{GITHUB_API_URL}/repos/{owner}/{repo}/issues",
+            {"state": state, "sort": "updated"},
+            detail="이슈 목록 조회 실패",
+            not_found_detail="리포지토리를 찾을 수 없습니다",
+            max_pages=settings.github_issues_max_pages,
+            repo_full_name=f"{owner}/{repo}",
+        )
 
         # GitHub API는 이슈 엔드포인트에서 PR도 반환하므로 필터링
         return [
@@ -277,7 +468,7 @@ class GitHubAPIService:
                 "created_at": issue["created_at"],
                 "updated_at": issue["updated_at"],
             }
-            for issue in response.json()
+            for issue in issues
             if "pull_request" not in issue
         ]
 
@@ -285,35 +476,12 @@ class GitHubAPIService:
         """리포지토리 브랜치 목록 전체 조회"""
         self._validate_owner_repo(owner, repo)
 
-        all_branches: List[dict] = []
-        page = 1
-        per_page = 100
-
-        while True:
-            url = f"{GITHUB_API_URL}/repos/{owner}/{repo}/branches"
-            response = await request_with_retry(
-                "GET", url, headers=self.headers,
-                params={"per_page": per_page, "page": page},
-            )
-
-            if response.status_code == 404:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="리포지토리를 찾을 수 없습니다",
-                )
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail="브랜치 목록 조회 실패",
-                )
-
-            branches = response.json()
-            if not branches:
-                break
-            all_branches.extend(branches)
-            if len(branches) < per_page:
-                break
-            page += 1
+        all_branches = await self.fetch_all_pages(
+            f"{GITHUB_API_URL}/repos/{owner}/{repo}/branches",
+            detail="브랜치 목록 조회 실패",
+            not_found_detail="리포지토리를 찾을 수 없습니다",
+            repo_full_name=f"{owner}/{repo}",
+        )
 
         return [
             {
@@ -336,8 +504,8 @@ class GitHubAPIService:
         if sha:
             params["sha"] = sha
 
-        response = await request_with_retry(
-            "GET", url, headers=self.headers, params=params,
+        response = await self._cached_get(
+            url, params=params, repo_full_name=f"{owner}/{repo}",
         )
 
         if response.status_code == 404:
@@ -351,25 +519,77 @@ class GitHubAPIService:
                 detail="커밋 목록 조회 실패",
             )
 
-        return [
-            {
-                "sha": c["sha"],
-                "message": c["commit"]["message"],
-                "author_name": c["commit"]["author"]["name"],
-                "author_email": c["commit"]["author"]["email"],
-                "author_date": c["commit"]["author"]["date"],
-                "author_login": c["author"]["login"] if c.get("author") else None,
-                "author_avatar_url": c["author"]["avatar_url"] if c.get("author") else None,
-                "html_url": c["html_url"],
-                "stats": {
-                    "additions": c["stats"]["additions"],
-                    "deletions": c["stats"]["deletions"],
-                    "total": c["stats"]["total"],
-                } if c.get("stats") else None,
-                "files_changed": len(c.get("files", [])) if c.get("files") else None,
-            }
-            for c in response.json()
-        ]
+        return [self._format_commit(c) for c in response.json()]
+
+    @staticmethod
+    def _format_commit(c: dict) -> dict:
+        """커밋 API 응답 항목을 내부 커밋 dict로 변환"""
+        return {
+            "sha": c["sha"],
+            "message": c["commit"]["message"],
+            "author_name": c["commit"]["author"]["name"],
+            "author_email": c["commit"]["author"]["email"],
+            "author_date": c["commit"]["author"]["date"],
+            "author_login": c["author"]["login"] if c.get("author") else None,
+            "author_avatar_url": c["author"]["avatar_url"] if c.get("author") else None,
+            "html_url": c["html_url"],
+            "stats": {
+                "additions": c["stats"]["additions"],
+                "deletions": c["stats"]["deletions"],
+                "total": c["stats"]["total"],
+            } if c.get("stats") else None,
+            "files_changed": len(c.get("files", [])) if c.get("files") else None,
+        }
+
+    async def compare_commits(
+        self, owner: str, repo: str, base: str, head: str
+    ) -> Optional[dict]:
+        """base...head 비교 (base가 사라졌으면 None)
+
+        반환: {"status": ahead|behind|diverged|identical, "ahead_by": int,
+               "commits": [최신순 커밋 dict, 최대 250개]}
+        """
+        self._validate_owner_repo(owner, repo)
+        response = await self._cached_get(
+            f"{GITHUB_API_URL}/repos/{owner}/{repo}/compare/{base}...{head}",
+            params={"per_page": 100},
+            repo_full_name=f"{owner}/{repo}",
+        )
+        if response.status_code == 404:
+            return None
+        self._raise_for_status(response, "커밋 비교 실패")
+
+        data = response.json()
+        return {
+            "status": data.get("status"),
+            "ahead_by": data.get("ahead_by", 0),
+            # compare API는 오래된 순으로 반환하므로 get_commits와 같은 최신순으로 맞춤
+            "commits": [self._format_commit(c) for c in reversed(data.get("commits", []))],
+        }
+
+    async def get_commit_detail(self, owner: str, repo: str, sha: str) -> Optional[dict]:
+        """단일 커밋의 변경 통계와 파일 경로 목록 조회 (없으면 None)"""
+        self._validate_owner_repo(owner, repo)
+        response = await request_with_retry(
+            "GET",
+            f"{GITHUB_API_URL}/repos/{owner}/{repo}/commits/{sha}",
+            headers=self.headers,
+        )
+        if response.status_code in (404, 422):
+            return None
+        self._raise_for_status(response, "커밋 상세 조회 실패")
+
+        data = response.json()
+        stats = data.get("stats") or {}
+        files = data.get("files") or []
+        return {
+            "sha": data["sha"],
+            "additions": stats.get("additions", 0),
+            "deletions": stats.get("deletions", 0),
+            "total": stats.get("total", 0),
+            "files_changed": len(files),
+            "files": [f["filename"] for f in files if f.get("filename")],
+        }
 
     async def get_single_issue(self, owner: str, repo: str, issue_number: int) -> dict:
         """리포지토리 단일 이슈 조회"""
@@ -0,0 +1,55 @@
+"""모델별 최근 응답 시간 분위수 추적 (hedged request 지연 기준)"""
+import math
+from collections import deque
+from typing import Optional
+
+from src.config import get_settings
+from src.metrics import gemini_latency_quantile
+
+settings = get_settings()
+
+# 게이지로 노출하는 분위수
+EXPORTED_QUANTILES = (0.5, 0.9, 0.99)
+
+
+class LatencyTracker:
+    """모델별 최근 window개 성공 응답 시간으로 분위수를 계산"""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: dict[str, deque[float]] = {}
+
+    def observe(self, model: str, seconds: float) -> None:
+        samples = self._samples.setdefault(model, deque(maxlen=self.window))
+        samples.append(seconds)
+        ordered = sorted(samples)
+        for q in EXPORTED_QUANTILES:
+            gemini_latency_quantile.set(
+                self._pick(ordered, q), model=model, quantile=str(q)
+            )
+
+    def percentile(self, model: str, q: float) -> Optional[float]:
+        """q 분위수 (표본이 min_samples보다 적으면 None)"""
+        samples = self._samples.get(model)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        return self._pick(sorted(samples), q)
+
+    @staticmethod
+    def _pick(ordered: list[float], q: float) -> float:
+        # nearest-rank
+        index = max(0, min(len(ordered) - 1, math.ceil(q * len(ordered)) - 1))
+        return ordered[index]
+
+    def stats(self) -> dict:
+        return {
+            model: {
+                "samples": len(samples),
+                **{f"p{int(q * 100)}": self._pick(sorted(samples), q) for q in EXPORTED_QUANTILES},
+            }
+            for model, samples in self._samples.items()
+        }
+
+
+gemini_latency_tracker = LatencyTracker(min_samples=settings.gemini_hedge_min_samples)
@@ -0,0 +1,167 @@
+"""LLM 응답 캐시 (모델 + 정규화된 프롬프트 + 생성 설정 해시 기준)"""
+import hashlib
+import json
+import logging
+import re
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import get_settings
+from src.database import async_session_maker
+from src.metrics import llm_cache_requests
+from src.models.llm_response import LLMResponse
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+_TRAILING_WHITESPACE = re.compile(r"[ \t]+$", re.MULTILINE)
+
+
+def normalize_prompt(prompt: str) -> str:
+    """의미 없는 차이(줄바꿈 형식, 줄 끝 공백, 앞뒤 공백)를 제거한 프롬프트"""
+    text = prompt.replace("\r\n", "\n").replace("\r", "\n")
+    return _TRAILING_WHITESPACE.sub("", text).strip()
+
+
+def make_cache_key(
+    model: str, prompt: str, generation_config: Optional[dict] = None
+) -> str:
+    """(모델, 정규화된 프롬프트, 생성 설정) 해시"""
+    config = json.dumps(generation_config or {}, sort_keys=True, default=str)
+    raw = "\n".join([model, config, normalize_prompt(prompt)])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class LLMResponseCache:
+    """LLM 응답을 DB에 저장하고 같은 입력이면 재사용하는 캐시
+
+    TTL이 지난 항목은 미스로 취급하고, 전체 응답 크기가 max_bytes를 넘으면
+    가장 오래 사용되지 않은 항목부터 삭제한다.
+    캐시 저장소 오류는 LLM 호출 실패로 이어지지 않도록 경고 로그만 남긴다.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] = async_session_maker,
+        ttl_seconds: int = settings.llm_cache_ttl_seconds,
+        max_bytes: int = settings.llm_cache_max_bytes,
+    ):
+        self.session_factory = session_factory
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_bytes > 0
+
+    async def get(
+        self, model: str, prompt: str, generation_config: Optional[dict] = None
+    ) -> Optional[str]:
+        """캐시된 응답 조회 (없거나 만료되었으면 None)"""
+        if not self.enabled:
+            return None
+        key = make_cache_key(model, prompt, generation_config)
+        now = datetime.utcnow()
+        response: Optional[str] = None
+        try:
+            async with self.session_factory() as db:
+                entry = await db.get(LLMResponse, key)
+                if entry and entry.created_at > now - timedelta(seconds=self.ttl_seconds):
+                    response = entry.response
+                    entry.hit_count += 1
+                    entry.last_used_at = now
+                    await db.commit()
+        except Exception as e:
+            logger.warning("LLM 캐시 조회 실패: %s", e)
+
+        if response is None:
+            self.misses += 1
+            llm_cache_requests.inc(model=model, outcome="miss")
+        else:
+            self.hits += 1
+            llm_cache_requests.inc(model=model, outcome="hit")
+        return response
+
+    def record_bypass(self, model: str) -> None:
+        """명시적 재생성으로 캐시를 건너뛴 호출 기록"""
+        self.bypasses += 1
+        llm_cache_requests.inc(model=model, outcome="bypass")
+
+    async def put(
+        self,
+        model: str,
+        prompt: str,
+        response: str,
+        generation_config: Optional[dict] = None,
+    ) -> None:
+        """응답 저장 (같은 키는 덮어씀) 후 크기 한도 초과분 정리"""
+        if not self.enabled or not response:
+            return
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        key = make_cache_key(model, prompt, generation_config)
+        now = datetime.utcnow()
+        try:
+            async with self.session_factory() as db:
+                entry = await db.get(LLMResponse, key)
+                if entry:
+                    entry.response = response
+                    entry.size = size
+                    entry.created_at = now
+                    entry.last_used_at = now
+                else:
+                    db.add(LLMResponse(
+                        cache_key=key, model=model, response=response, size=size,
+                        created_at=now, last_used_at=now,
+                    ))
+                await db.commit()
+                await self._evict(db)
+        except Exception as e:
+            logger.warning("LLM 캐시 저장 실패: %s", e)
+
+    async def _evict(self, db: AsyncSession) -> None:
+        """만료 항목 삭제 후 크기 한도를 넘으면 LRU 순으로 삭제"""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.ttl_seconds)
+        await db.execute(delete(LLMResponse).where(LLMResponse.created_at < cutoff))
+
+        total = await db.scalar(select(func.coalesce(func.sum(LLMResponse.size), 0)))
+        excess = (total or 0) - self.max_bytes
+        if excess > 0:
+            result = await db.execute(
+                select(LLMResponse.cache_key, LLMResponse.size)
+                .order_by(LLMResponse.last_used_at)
+            )
+            evicted: list[str] = []
+            for key, size in result.all():
+                if excess <= 0:
+                    break
+                evicted.append(key)
+                excess -= size
+            await db.execute(delete(LLMResponse).where(LLMResponse.cache_key.in_(evicted)))
+            logger.info("LLM 캐시 크기 한도 초과, %d개 항목 삭제", len(evicted))
+        await db.commit()
+
+    async def clear(self) -> None:
+        async with self.session_factory() as db:
+            await db.execute(delete(LLMResponse))
+            await db.commit()
+
+    def stats(self) -> dict:
+        """히트/미스/우회 카운터"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypasses": self.bypasses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+llm_response_cache = LLMResponseCache()
@@ -0,0 +1,200 @@
+"""프로세스 전역 LLM 호출 스케줄러 (우선순위 큐 + 모델별 RPM/TPM 토큰 버킷)
+
+모든 Gemini 호출은 slot()으로 실행 권한을 얻는다. 대기 중인 호출은 우선순위 순으로
+처리되며, 동시 실행 수와 모델별 분당 요청/토큰 한도를 넘지 않도록 조절한다.
+한 모델의 한도가 소진되어도 다른 모델의 호출은 계속 진행된다.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import AsyncIterator, Optional
+
+from src.config import get_settings
+from src.metrics import llm_inflight, llm_queue_depth, llm_queue_wait
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class LLMPriority(IntEnum):
+    """호출 우선순위 (값이 작을수록 먼저 처리)"""
+    INTERACTIVE = 0  # 사용자가 기다리는 작업 계획 생성
+    REPO_ANALYSIS = 1  # Phase 1 리포 분석
+    COMMIT_ANALYSIS = 2  # 커밋 히스토리 분석
+    BACKGROUND_PLAN = 3  # 일괄 생성된 일감의 작업 계획 (심층 분석·가져오기 후속)
+    DEEP_ANALYSIS = 4  # Phase 2 심층 분석
+
+
+class TokenBucket:
+    """분당 한도를 초 단위로 보충하는 토큰 버킷 (capacity=0이면 무제한)"""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """amount를 소비하려면 기다려야 하는 시간 (0이면 즉시 가능)"""
+        if not self.capacity:
+            return 0.0
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float) -> None:
+        if self.capacity:
+            self.tokens -= min(amount, self.capacity)
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    model: str = field(compare=False)
+    tokens: int = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    enqueued: float = field(compare=False)
+
+
+class LLMScheduler:
+    """우선순위 기반 LLM 호출 스케줄러
+
+    같은 모델에서는 우선순위가 높은 대기 호출이 한도 때문에 막혀 있으면
+    낮은 우선순위 호출도 추월하지 않는다 (한도를 먼저 차지하지 않도록).
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        limits: Optional[dict[str, tuple[int, int]]] = None,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.limits = limits or {}
+        self.inflight = 0
+        self._heap: list[_Waiter] = []
+        self._seq = itertools.count()
+        self._buckets: dict[str, tuple[TokenBucket, TokenBucket]] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def _buckets_for(self, model: str) -> tuple[TokenBucket, TokenBucket]:
+        buckets = self._buckets.get(model)
+        if buckets is None:
+            rpm, tpm = self.limits.get(model, (0, 0))
+            buckets = (TokenBucket(rpm), TokenBucket(tpm))
+            self._buckets[model] = buckets
+        return buckets
+
+    @asynccontextmanager
+    async def slot(
+        self, model: str, tokens: int, priority: LLMPriority
+    ) -> AsyncIterator[None]:
+        """실행 권한을 얻을 때까지 대기 후 호출 구간 동안 보유"""
+        await self.acquire(model, tokens, priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, model: str, tokens: int, priority: LLMPriority) -> None:
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(
+            priority=int(priority), seq=next(self._seq), model=model, tokens=tokens,
+            future=loop.create_future(), enqueued=time.monotonic(),
+        )
+        heapq.heappush(self._heap, waiter)
+        self._update_depth()
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # 권한을 받은 직후 취소됨: 반납
+                self.release()
+            else:
+                waiter.future.cancel()
+                self._dispatch()
+            raise
+
+        llm_queue_wait.observe(
+            time.monotonic() - waiter.enqueued,
+            model=model, priority=priority.name.lower(),
+        )
+
+    def release(self) -> None:
+        self.inflight -= 1
+        llm_inflight.set(self.inflight)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """우선순위 순으로 실행 가능한 대기 호출에 권한 부여"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        now = time.monotonic()
+        blocked_models: set[str] = set()
+        retry_after: Optional[float] = None
+        remaining: list[_Waiter] = []
+
+        while self._heap:
+            waiter = heapq.heappop(self._heap)
+            if waiter.future.done():
+                continue  # 취소된 대기
+            if self.inflight >= self.max_concurrency or waiter.model in blocked_models:
+                remaining.append(waiter)
+                continue
+            rpm, tpm = self._buckets_for(waiter.model)
+            wait = max(rpm.wait_time(1, now), tpm.wait_time(waiter.tokens, now))
+            if wait > 0:
+                blocked_models.add(waiter.model)
+                retry_after = wait if retry_after is None else min(retry_after, wait)
+                remaining.append(waiter)
+                continue
+            rpm.consume(1)
+            tpm.consume(waiter.tokens)
+            self.inflight += 1
+            waiter.future.set_result(None)
+
+        for waiter in remaining:
+            heapq.heappush(self._heap, waiter)
+        llm_inflight.set(self.inflight)
+        self._update_depth()
+
+        if retry_after is not None and self._heap:
+            self._timer = asyncio.get_running_loop().call_later(retry_after, self._dispatch)
+
+    def _update_depth(self) -> None:
+        counts = {p: 0 for p in LLMPriority}
+        for waiter in self._heap:
+            if not waiter.future.done():
+                counts[LLMPriority(waiter.priority)] += 1
+        for priority, count in counts.items():
+            llm_queue_depth.set(count, priority=priority.name.lower())
+
+    def stats(self) -> dict:
+        return {
+            "inflight": self.inflight,
+            "max_concurrency": self.max_concurrency,
+            "queued": sum(1 for w in self._heap if not w.future.done()),
+        }
+
+
+llm_scheduler = LLMScheduler(
+    settings.llm_max_concurrency,
+    {
+        "gemini-2.5-flash": (settings.gemini_flash_rpm, settings.gemini_flash_tpm),
+        "gemini-2.5-pro": (settings.gemini_pro_rpm, settings.gemini_pro_tpm),
+    },
+)
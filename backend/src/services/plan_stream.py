@@ -0,0 +1,67 @@
+"""작업 계획 생성 스트림 브로커 (인프로세스 pub/sub)"""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PlanStreamBroker:
+    """일감별 작업 계획 생성 진행 상황을 SSE 구독자에게 전달
+
+    생성 중인 계획 텍스트를 누적해 두어 늦게 접속한 구독자도 snapshot 이벤트로
+    지금까지의 내용을 먼저 받고 이후 chunk 이벤트를 이어 받는다.
+    이벤트는 {"event": "snapshot"|"chunk"|"done", "data": {...}} 형식이다.
+    """
+
+    def __init__(self):
+        self._texts: dict[int, str] = {}
+        self._subscribers: dict[int, set[asyncio.Queue]] = {}
+
+    def is_active(self, issue_id: int) -> bool:
+        return issue_id in self._texts
+
+    def snapshot(self, issue_id: int) -> Optional[str]:
+        return self._texts.get(issue_id)
+
+    def start(self, issue_id: int) -> None:
+        """생성 시작 (이전 누적 텍스트 초기화)"""
+        self._texts[issue_id] = ""
+        self._broadcast(issue_id, {"event": "snapshot", "data": {"text": ""}})
+
+    def publish(self, issue_id: int, text: str) -> None:
+        """새로 생성된 계획 텍스트 조각 전달"""
+        if not text:
+            return
+        self._texts[issue_id] = self._texts.get(issue_id, "") + text
+        self._broadcast(issue_id, {"event": "chunk", "data": {"text": text}})
+
+    def finish(self, issue_id: int, status: str) -> None:
+        """생성 종료 (status: completed/failed)"""
+        self._texts.pop(issue_id, None)
+        self._broadcast(issue_id, {"event": "done", "data": {"status": status}})
+
+    @asynccontextmanager
+    async def subscribe(self, issue_id: int) -> AsyncIterator[asyncio.Queue]:
+        """구독 큐 등록 (생성 중이면 snapshot 이벤트가 먼저 들어 있음)"""
+        queue: asyncio.Queue = asyncio.Queue()
+        text = self._texts.get(issue_id)
+        if text is not None:
+            queue.put_nowait({"event": "snapshot", "data": {"text": text}})
+        self._subscribers.setdefault(issue_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            subscribers = self._subscribers.get(issue_id)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[issue_id]
+
+    def _broadcast(self, issue_id: int, event: dict) -> None:
+        for queue in self._subscribers.get(issue_id, ()):
+            queue.put_nowait(event)
+
+
+plan_stream_broker = PlanStreamBroker()
@@ -0,0 +1,313 @@
+"""토큰 예산 기반 프롬프트 패커
+
+프롬프트를 섹션 단위로 등록하면 우선순위대로 모델별 입력 예산을 배정하고,
+예산을 넘는 섹션은 줄 단위로 자르거나 제외한 뒤 한 번에 조립한다.
+토큰 수는 API 호출 없이 문자 수로 근사한다.
+"""
+import logging
+from dataclasses import dataclass, field
+from typing import Optional
+
+from src.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# 로컬 토큰 추정: ASCII(영문/코드)는 약 4자당 1토큰, 한글 등 비ASCII 문자는 1자당 약 1토큰
+CHARS_PER_TOKEN = 4
+
+# 모델별 컨텍스트 윈도우 (입력 + 출력 토큰)
+MODEL_CONTEXT_TOKENS = {
+    "gemini-2.5-flash": 1_048_576,
+    "gemini-2.5-pro": 1_048_576,
+}
+DEFAULT_CONTEXT_TOKENS = 128_000
+# 응답 생성에 남겨둘 토큰
+OUTPUT_RESERVE_TOKENS = 65_536
+
+# 파일이 이보다 적은 토큰만 배정받게 되면 자르지 않고 통째로 제외
+MIN_FILE_TOKENS = 256
+TRUNCATION_MARK = "\n... (truncated)"
+
+
+def estimate_tokens(text: str) -> int:
+    """API 호출 없이 입력 토큰 수를 근사"""
+    if text.isascii():
+        return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+    # 비ASCII 문자는 UTF-8로 2~4바이트이므로 (바이트 수 - 문자 수) / 2로 개수를 근사
+    non_ascii = (len(text.encode("utf-8")) - len(text)) // 2
+    ascii_chars = len(text) - non_ascii
+    return (ascii_chars + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN + non_ascii
+
+
+def budget_for_model(model: str) -> int:
+    """모델별 입력 토큰 예산 (컨텍스트 윈도우 - 출력 예약, 설정 상한 적용)"""
+    context = MODEL_CONTEXT_TOKENS.get(model, DEFAULT_CONTEXT_TOKENS)
+    return max(0, min(context - OUTPUT_RESERVE_TOKENS, settings.prompt_max_input_tokens))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, mark: str = TRUNCATION_MARK) -> str:
+    """토큰 한도에 맞게 자르기 (가능하면 줄 경계에서, 표시 문자열 포함)"""
+    tokens = estimate_tokens(text)
+    if tokens <= max_tokens:
+        return text
+    budget = max(0, max_tokens - estimate_tokens(mark))
+    # 텍스트 자체의 문자/토큰 비율로 자를 위치를 정하고, 초과하면 한 번 더 줄임
+    limit = len(text) * budget // tokens
+    cut = text[:limit]
+    while cut and estimate_tokens(cut) > budget:
+        cut = cut[: len(cut) * budget // estimate_tokens(cut)]
+    newline = cut.rfind("\n")
+    if newline > len(cut) // 2:
+        cut = cut[:newline]
+    return cut + mark
+
+
+@dataclass
+class DroppedContent:
+    """예산 부족으로 잘리거나 제외된 내용"""
+    name: str
+    original_tokens: int
+    kept_tokens: int
+
+    @property
+    def removed(self) -> bool:
+        return self.kept_tokens == 0
+
+
+@dataclass
+class PackedPrompt:
+    """패킹 결과"""
+    text: str
+    tokens: int
+    budget: int
+    dropped: list[DroppedContent] = field(default_factory=list)
+
+    def report(self) -> str:
+        """제외/축약 내역 요약 (로그용)"""
+        if not self.dropped:
+            return f"{self.tokens}/{self.budget} tokens"
+        parts = [
+            f"{d.name}({'제외' if d.removed else f'{d.original_tokens}→{d.kept_tokens}'})"
+            for d in self.dropped
+        ]
+        return f"{self.tokens}/{self.budget} tokens, 축약: {', '.join(parts)}"
+
+
+@dataclass
+class _Section:
+    name: str
+    text: str = ""
+    priority: int = 0
+    max_tokens: Optional[int] = None
+    min_tokens: int = 0
+    truncatable: bool = True
+    files: Optional[dict[str, str]] = None
+    items: Optional[list[str]] = None
+    header: str = ""
+    footer: str = ""
+    separator: str = ""
+    file_template: str = ""
+
+
+class PromptPacker:
+    """섹션을 우선순위대로 토큰 예산에 채워 넣는 패커
+
+    priority가 낮은 섹션부터 예산을 배정하며, 출력은 등록 순서를 따른다.
+    truncatable=False 섹션(지시문 등)은 자르지 않으며 예산이 부족해도 항상 포함한다.
+    """
+
+    def __init__(self, budget_tokens: int):
+        self.budget_tokens = budget_tokens
+        self._sections: list[_Section] = []
+
+    @classmethod
+    def for_model(cls, model: str) -> "PromptPacker":
+        return cls(budget_for_model(model))
+
+    def add(
+        self,
+        name: str,
+        text: Optional[str],
+        *,
+        priority: int = 0,
+        max_tokens: Optional[int] = None,
+        min_tokens: int = 0,
+        truncatable: bool = True,
+    ) -> "PromptPacker":
+        """텍스트 섹션 추가 (빈 텍스트는 무시)"""
+        if text:
+            self._sections.append(_Section(
+                name=name, text=text, priority=priority, max_tokens=max_tokens,
+                min_tokens=min_tokens, truncatable=truncatable,
+            ))
+        return self
+
+    def add_fixed(self, text: str) -> "PromptPacker":
+        """자르지 않는 고정 섹션 (지시문, 응답 형식 등)"""
+        return self.add("fixed", text, priority=-1, truncatable=False)
+
+    def add_files(
+        self,
+        name: str,
+        files: dict[str, str],
+        *,
+        priority: int = 0,
+        max_tokens: Optional[int] = None,
+        header: str = "",
+        file_template: str = "\n### {path}\n```\n{content}\n```\n",
+    ) -> "PromptPacker":
+        """파일 묶음 섹션 추가
+
+        배정된 예산을 파일 간에 고르게 나누어(작은 파일은 전부, 큰 파일은 남은 몫만큼)
+        한 파일이 예산을 독차지하지 않도록 한다. 몫이 MIN_FILE_TOKENS보다 작아지면
+        우선순위가 낮은(뒤쪽) 파일부터 제외한다.
+        """
+        self._sections.append(_Section(
+            name=name, priority=priority, max_tokens=max_tokens, files=dict(files),
+            header=header, file_template=file_template,
+        ))
+        return self
+
+    def add_items(
+        self,
+        name: str,
+        items: list[str],
+        *,
+        priority: int = 0,
+        max_tokens: Optional[int] = None,
+        header: str = "",
+        footer: str = "",
+        separator: str = "\n",
+    ) -> "PromptPacker":
+        """자르지 않는 항목 목록 섹션 추가 (JSON 배열 원소 등)
+
+        항목은 앞에서부터 예산에 들어가는 만큼만 통째로 포함하고 나머지는 제외한다.
+        중요한 항목을 앞에 두어야 하며, header/footer는 항목이 없어도 항상 포함한다.
+        """
+        self._sections.append(_Section(
+            name=name, priority=priority, max_tokens=max_tokens, items=list(items),
+            header=header, footer=footer, separator=separator,
+        ))
+        return self
+
+    def pack(self) -> PackedPrompt:
+        remaining = self.budget_tokens
+        rendered: dict[int, str] = {}
+        dropped: list[DroppedContent] = []
+
+        order = sorted(range(len(self._sections)), key=lambda i: self._sections[i].priority)
+        for index in order:
+            section = self._sections[index]
+            if section.files is not None:
+                text, section_dropped = self._pack_files(section, remaining)
+                dropped.extend(section_dropped)
+            elif section.items is not None:
+                text = self._pack_items(section, remaining, dropped)
+            else:
+                text = self._pack_text(section, remaining, dropped)
+            rendered[index] = text
+            remaining -= estimate_tokens(text)
+
+        text = "".join(rendered[i] for i in range(len(self._sections)))
+        packed = PackedPrompt(
+            text=text, tokens=estimate_tokens(text),
+            budget=self.budget_tokens, dropped=dropped,
+        )
+        if dropped:
+            logger.debug("프롬프트 패킹: %s", packed.report())
+        return packed
+
+    @staticmethod
+    def _pack_text(section: _Section, remaining: int, dropped: list[DroppedContent]) -> str:
+        tokens = estimate_tokens(section.text)
+        if not section.truncatable:
+            return section.text
+        allowed = min(remaining, section.max_tokens or tokens)
+        if tokens <= allowed:
+            return section.text
+        text = truncate_to_tokens(section.text, allowed) if allowed > 0 else ""
+        # 남은 예산이 잘림 표시보다 작으면 자르지 않고 제외
+        if not text or allowed < section.min_tokens or estimate_tokens(text) > allowed:
+            dropped.append(DroppedContent(section.name, tokens, 0))
+            return ""
+        dropped.append(DroppedContent(section.name, tokens, estimate_tokens(text)))
+        return text
+
+    @staticmethod
+    def _pack_items(section: _Section, remaining: int, dropped: list[DroppedContent]) -> str:
+        items = section.items or []
+        budget = (
+            min(remaining, section.max_tokens or remaining)
+            - estimate_tokens(section.header) - estimate_tokens(section.footer)
+        )
+        separator_tokens = estimate_tokens(section.separator)
+        kept: list[str] = []
+        used = 0
+        for item in items:
+            cost = estimate_tokens(item) + (separator_tokens if kept else 0)
+            if used + cost > budget:
+                break
+            kept.append(item)
+            used += cost
+        if len(kept) < len(items):
+            dropped.append(DroppedContent(
+                f"{section.name}[{len(items) - len(kept)}/{len(items)}개 제외]",
+                sum(estimate_tokens(item) for item in items), used,
+            ))
+        return section.header + section.separator.join(kept) + section.footer
+
+    @staticmethod
+    def _pack_files(section: _Section, remaining: int) -> tuple[str, list[DroppedContent]]:
+        files = section.files or {}
+        budget = min(remaining, section.max_tokens or remaining) - estimate_tokens(section.header)
+        paths = list(files)
+        overhead = {
+            p: estimate_tokens(section.file_template.format(path=p, content="")) for p in paths
+        }
+        sizes = {p: estimate_tokens(files[p]) for p in paths}
+
+        # 모든 포함 파일이 최소 몫 이상을 받을 때까지 뒤쪽 파일부터 제외
+        count = len(paths)
+        allocation: dict[str, int] = {}
+        while count:
+            included = paths[:count]
+            available = budget - sum(overhead[p] for p in included)
+            allocation = _water_fill({p: sizes[p] for p in included}, available)
+            if all(
+                allocation[p] >= sizes[p] or allocation[p] >= MIN_FILE_TOKENS
+                for p in included
+            ):
+                break
+            count -= 1
+        if not count:
+            allocation = {}
+
+        parts: list[str] = []
+        dropped: list[DroppedContent] = []
+        for path in paths:
+            kept = allocation.get(path, 0)
+            if kept <= 0:
+                dropped.append(DroppedContent(f"{section.name}:{path}", sizes[path], 0))
+                continue
+            content = truncate_to_tokens(files[path], kept)
+            if kept < sizes[path]:
+                dropped.append(
+                    DroppedContent(f"{section.name}:{path}", sizes[path], estimate_tokens(content))
+                )
+            parts.append(section.file_template.format(path=path, content=content))
+        if not parts:
+            return "", dropped
+        return section.header + "".join(parts), dropped
+
+
+def _water_fill(sizes: dict[str, int], budget: int) -> dict[str, int]:
+    """작은 항목부터 전부 배정하고 남은 예산을 큰 항목들이 균등 분할"""
+    allocation: dict[str, int] = {}
+    remaining = max(0, budget)
+    ordered = sorted(sizes, key=sizes.get)
+    for position, key in enumerate(ordered):
+        share = remaining // (len(ordered) - position)
+        allocation[key] = min(sizes[key], share)
+        remaining -= allocation[key]
+    return allocation
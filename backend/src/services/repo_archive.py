@@ -0,0 +1,204 @@
+"""리포지토리 tarball 스트리밍 추출
+
+GitHub tarball을 내려받으면서 gzip 해제와 tar 헤더 파싱을 청크 단위로 수행하고,
+요청한 경로의 파일만 메모리에 보관한다. 아카이브 전체를 버퍼링하지 않으며
+필요한 파일을 모두 찾으면 다운로드를 즉시 중단한다.
+"""
+import logging
+import zlib
+from typing import Iterable, Optional
+
+from src.services.github_service import GitHubAPIService
+
+logger = logging.getLogger(__name__)
+
+BLOCK_SIZE = 512
+
+# 일반 파일로 취급하는 tar 타입 플래그 (regular, 구형 regular, contiguous)
+_REGULAR_TYPES = (b"0", b"\0", b"7")
+# 다음 항목의 경로를 지정하는 메타데이터 항목 (GNU long name, pax extended header)
+_META_TYPES = (b"L", b"x")
+
+
+def _cstr(field: bytes) -> str:
+    return field.split(b"\0", 1)[0].decode("utf-8", errors="replace")
+
+
+def _parse_size(field: bytes) -> int:
+    """tar 크기 필드 (8진수 문자열 또는 GNU base-256)"""
+    if field[0] & 0x80:
+        return int.from_bytes(field[1:], "big")
+    text = field.split(b"\0", 1)[0].strip()
+    return int(text, 8) if text else 0
+
+
+def _pax_path(data: bytes) -> Optional[str]:
+    """pax extended header 레코드("<길이> key=value\\n")에서 path 추출"""
+    pos = 0
+    try:
+        while pos < len(data):
+            space = data.index(b" ", pos)
+            length = int(data[pos:space])
+            if length <= 0:
+                break
+            key, _, value = data[space + 1:pos + length - 1].partition(b"=")
+            if key == b"path":
+                return value.decode("utf-8", errors="replace")
+            pos += length
+    except ValueError:
+        pass
+    return None
+
+
+class TarStreamExtractor:
+    """gzip tar 스트림에서 원하는 경로만 추출하는 증분 파서
+
+    GitHub tarball의 최상위 디렉터리(<owner>-<repo>-<sha>/)는 제거한 경로로 비교한다.
+    """
+
+    def __init__(self, wanted: Iterable[str], max_file_bytes: int):
+        self.wanted = set(wanted)
+        self.max_file_bytes = max_file_bytes
+        self.files: dict[str, bytes] = {}
+        self.finished = False
+
+        self._inflater = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        self._buffer = bytearray()
+        self._remaining = 0
+        self._padding = 0
+        self._member: Optional[str] = None
+        self._meta: Optional[bytes] = None
+        self._data = bytearray()
+        self._next_name: Optional[str] = None
+
+    @property
+    def complete(self) -> bool:
+        """아카이브 끝에 도달했거나 원하는 파일을 모두 찾음"""
+        return self.finished or len(self.files) >= len(self.wanted)
+
+    def feed(self, chunk: bytes) -> None:
+        """압축된 청크 입력"""
+        if self.complete:
+            return
+        self._buffer += self._inflater.decompress(chunk)
+        self._process()
+
+    def _process(self) -> None:
+        buf = self._buffer
+        while not self.finished:
+            if self._remaining:
+                take = min(self._remaining, len(buf))
+                if not take:
+                    break
+                if self._member is not None or self._meta is not None:
+                    self._data += buf[:take]
+                del buf[:take]
+                self._remaining -= take
+                if not self._remaining:
+                    self._end_member()
+                continue
+
+            if self._padding:
+                take = min(self._padding, len(buf))
+                if not take:
+                    break
+                del buf[:take]
+                self._padding -= take
+                continue
+
+            if len(buf) < BLOCK_SIZE:
+                break
+            header = bytes(buf[:BLOCK_SIZE])
+            del buf[:BLOCK_SIZE]
+            self._start_member(header)
+
+    def _start_member(self, header: bytes) -> None:
+        if not header.strip(b"\0"):
+            # 빈 블록 = 아카이브 끝
+            self.finished = True
+            return
+
+        name = _cstr(header[0:100])
+        if header[257:262] == b"ustar":
+            prefix = _cstr(header[345:500])
+            if prefix:
+                name = f"{prefix}/{name}"
+        size = _parse_size(header[124:136])
+        typeflag = header[156:157]
+
+        self._remaining = size
+        self._padding = (-size) % BLOCK_SIZE
+        self._data = bytearray()
+        self._member = None
+        self._meta = None
+
+        if typeflag in _META_TYPES:
+            self._meta = typeflag
+        else:
+            if self._next_name:
+                name = self._next_name
+            self._next_name = None
+            if typeflag in _REGULAR_TYPES:
+                path = name.split("/", 1)[1] if "/" in name else name
+                if path in self.wanted and size <= self.max_file_bytes:
+                    self._member = path
+
+        if not size:
+            self._end_member()
+
+    def _end_member(self) -> None:
+        if self._meta == b"L":
+            self._next_name = _cstr(bytes(self._data))
+        elif self._meta == b"x":
+            self._next_name = _pax_path(bytes(self._data)) or self._next_name
+        elif self._member is not None:
+            self.files[self._member] = bytes(self._data)
+        self._member = None
+        self._meta = None
+        self._data = bytearray()
+
+
+async def fetch_files_from_archive(
+    github: GitHubAPIService,
+    owner: str,
+    repo: str,
+    ref: str,
+    paths: Iterable[str],
+    *,
+    max_file_bytes: int,
+    max_download_bytes: int,
+) -> dict[str, bytes]:
+    """tarball을 한 번 스트리밍하여 지정한 경로의 파일 내용만 반환
+
+    다운로드량이 max_download_bytes를 넘으면 그때까지 찾은 파일만 반환하고,
+    호출자는 나머지를 파일 단위로 가져온다.
+    """
+    extractor = TarStreamExtractor(paths, max_file_bytes)
+    if not extractor.wanted:
+        return {}
+
+    downloaded = 0
+    async with github.stream_tarball(owner, repo, ref) as response:
+        if response.status_code != 200:
+            logger.warning(
+                "tarball 다운로드 실패: %s/%s@%s (%d)",
+                owner, repo, ref, response.status_code,
+            )
+            return {}
+        async for chunk in response.aiter_bytes():
+            downloaded += len(chunk)
+            if downloaded > max_download_bytes:
+                logger.info(
+                    "tarball 다운로드 한도 초과, 중단: %s/%s (%d bytes)",
+                    owner, repo, downloaded,
+                )
+                break
+            extractor.feed(chunk)
+            if extractor.complete:
+                break
+
+    logger.info(
+        "tarball 추출: %s/%s %d/%d개 파일 (%d bytes 수신)",
+        owner, repo, len(extractor.files), len(extractor.wanted), downloaded,
+    )
+    return extractor.files
@@ -0,0 +1,124 @@
+"""사용자별 GitHub 리포 목록 캐시 (stale-while-revalidate)"""
+import asyncio
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import get_settings
+from src.database import async_session_maker
+from src.models.user_repo_list import UserRepoList
+from src.services.github_service import GitHubAPIService
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def project_repo(repo: dict) -> dict:
+    """GitHub 리포 JSON에서 RepoResponse 필드만 추출"""
+    return {
+        "id": repo["id"],
+        "name": repo["name"],
+        "full_name": repo["full_name"],
+        "description": repo.get("description"),
+        "private": repo["private"],
+        "html_url": repo["html_url"],
+        "default_branch": repo.get("default_branch", "main"),
+        "updated_at": repo["updated_at"],
+        "language": repo.get("language"),
+        "stargazers_count": repo.get("stargazers_count", 0),
+    }
+
+
+class RepoListCache:
+    """사용자별 리포 목록을 DB에 저장하고 오래되면 백그라운드로 갱신
+
+    - soft TTL 이내: 캐시 반환
+    - soft TTL 경과: 캐시를 즉시 반환하고 백그라운드 갱신 (사용자당 1개만 진행)
+    - max age 경과 또는 캐시 없음 / refresh 요청: GitHub에서 조회 후 반환
+    """
+
+    def __init__(
+        self, session_factory: Callable[[], AsyncSession] = async_session_maker
+    ):
+        self.session_factory = session_factory
+        self._refreshing: dict[int, asyncio.Task] = {}
+
+    async def get_repos(
+        self, user_id: int, access_token: str, refresh: bool = False
+    ) -> tuple[list[dict], datetime]:
+        """(리포 목록, 조회 시각) 반환"""
+        if not refresh:
+            cached = await self._load(user_id)
+            if cached:
+                items, fetched_at = cached
+                age = datetime.utcnow() - fetched_at
+                if age <= timedelta(seconds=settings.repo_list_max_age_seconds):
+                    if age > timedelta(seconds=settings.repo_list_soft_ttl_seconds):
+                        self.refresh_in_background(user_id, access_token)
+                    return items, fetched_at
+        return await self.refresh(user_id, access_token)
+
+    async def refresh(self, user_id: int, access_token: str) -> tuple[list[dict], datetime]:
+        """GitHub에서 전체 목록을 조회하여 저장"""
+        repos = await GitHubAPIService(access_token).get_all_repos()
+        items = [project_repo(repo) for repo in repos]
+        fetched_at = datetime.utcnow()
+        await self._store(user_id, items, fetched_at)
+        return items, fetched_at
+
+    def refresh_in_background(self, user_id: int, access_token: str) -> None:
+        """진행 중인 갱신이 없을 때만 백그라운드 갱신 시작"""
+        task = self._refreshing.get(user_id)
+        if task and not task.done():
+            return
+
+        async def _run():
+            try:
+                await self.refresh(user_id, access_token)
+            except Exception:
+                logger.exception("리포 목록 백그라운드 갱신 실패: user_id=%d", user_id)
+            finally:
+                self._refreshing.pop(user_id, None)
+
+        self._refreshing[user_id] = asyncio.create_task(_run())
+
+    async def invalidate(self, user_id: int) -> None:
+        """저장된 목록 삭제"""
+        try:
+            async with self.session_factory() as db:
+                entry = await db.get(UserRepoList, user_id)
+                if entry:
+                    await db.delete(entry)
+                    await db.commit()
+        except Exception as e:
+            logger.warning("리포 목록 캐시 삭제 실패: user_id=%d — %s", user_id, e)
+
+    async def _load(self, user_id: int) -> Optional[tuple[list[dict], datetime]]:
+        try:
+            async with self.session_factory() as db:
+                entry = await db.get(UserRepoList, user_id)
+                if not entry:
+                    return None
+                return json.loads(entry.items), entry.fetched_at
+        except Exception as e:
+            logger.warning("리포 목록 캐시 조회 실패: user_id=%d — %s", user_id, e)
+            return None
+
+    async def _store(self, user_id: int, items: list[dict], fetched_at: datetime) -> None:
+        try:
+            async with self.session_factory() as db:
+                entry = await db.get(UserRepoList, user_id)
+                if entry is None:
+                    entry = UserRepoList(user_id=user_id, items="[]")
+                    db.add(entry)
+                entry.items = json.dumps(items, ensure_ascii=False)
+                entry.fetched_at = fetched_at
+                await db.commit()
+        except Exception as e:
+            logger.warning("리포 목록 캐시 저장 실패: user_id=%d — %s", user_id, e)
+
+
+repo_list_cache = RepoListCache()
@@ -1,7 +1,6 @@
 """텔레그램 알림 서비스"""
 from typing import Optional
 import logging
-import httpx
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -0,0 +1,105 @@
+"""커밋/트리 SHA 기준 리포지토리 트리 캐시 (내용 주소 기반 LRU)"""
+import logging
+import sys
+from collections import OrderedDict
+from typing import Optional
+
+from src.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# 커밋 SHA → 트리 SHA 매핑 최대 개수 (매핑 자체는 수십 바이트라 개수로만 제한)
+MAX_COMMIT_MAPPINGS = 10_000
+
+
+def estimate_size(value) -> int:
+    """파싱된 JSON 값의 메모리 점유량 추정 (컨테이너와 원소의 sys.getsizeof 합)
+
+    인터닝으로 공유되는 문자열·작은 정수도 각각 세므로 실제보다 약간 크게 잡힌다.
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += sys.getsizeof(key) + estimate_size(item)
+    elif isinstance(value, list):
+        for item in value:
+            size += estimate_size(item)
+    return size
+
+
+class RepoTreeCache:
+    """재귀 트리 응답을 트리 SHA로 저장하는 크기 제한 LRU 캐시
+
+    한도(max_bytes)는 응답 본문 길이가 아니라 파싱된 dict의 추정 메모리 점유량 기준이다.
+    파싱된 트리는 보통 본문보다 몇 배 크다.
+
+    커밋과 트리는 불변이므로 같은 SHA의 트리는 다시 내려받거나 파싱할 필요가 없다.
+    브랜치 → 커밋 SHA 해석은 각 사용자의 토큰으로 수행되므로(접근 권한 확인),
+    해석에 성공한 사용자끼리는 같은 리포의 트리를 공유해도 안전하다.
+
+    반환되는 dict는 여러 호출자가 공유하므로 호출자는 수정하지 않아야 한다.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._trees: OrderedDict[str, tuple[dict, int]] = OrderedDict()
+        self._commit_to_tree: OrderedDict[str, str] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_by_commit(self, commit_sha: str) -> Optional[dict]:
+        """커밋 SHA로 트리 조회"""
+        tree_sha = self._commit_to_tree.get(commit_sha)
+        entry = self._trees.get(tree_sha) if tree_sha else None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._trees.move_to_end(tree_sha)
+        self._commit_to_tree.move_to_end(commit_sha)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, commit_sha: str, tree: dict) -> None:
+        """트리 저장 (파싱된 트리의 추정 메모리 점유량으로 LRU 한도 계산)"""
+        tree_sha = tree.get("sha")
+        if not tree_sha:
+            return
+
+        self._commit_to_tree[commit_sha] = tree_sha
+        self._commit_to_tree.move_to_end(commit_sha)
+        while len(self._commit_to_tree) > MAX_COMMIT_MAPPINGS:
+            self._commit_to_tree.popitem(last=False)
+
+        if tree_sha in self._trees:
+            self._trees.move_to_end(tree_sha)
+            return
+        size = estimate_size(tree)
+        if size > self.max_bytes:
+            logger.info("트리가 캐시 한도보다 커서 저장하지 않음: %s (%d bytes)", tree_sha, size)
+            return
+
+        self._trees[tree_sha] = (tree, size)
+        self.total_bytes += size
+        while self.total_bytes > self.max_bytes and self._trees:
+            _, (_, evicted_size) = self._trees.popitem(last=False)
+            self.total_bytes -= evicted_size
+
+    def clear(self) -> None:
+        self._trees.clear()
+        self._commit_to_tree.clear()
+        self.total_bytes = 0
+
+    def stats(self) -> dict:
+        """히트/미스 및 점유량"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._trees),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+repo_tree_cache = RepoTreeCache(settings.tree_cache_max_bytes)
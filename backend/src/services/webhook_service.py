@@ -0,0 +1,175 @@
+"""GitHub 웹훅 처리 서비스"""
+import asyncio
+import hashlib
+import hmac
+import logging
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.crypto import decrypt_token
+from src.database import async_session_maker
+from src.models.connected_repo import ConnectedRepo
+from src.models.issue import Issue
+from src.models.user import User
+from src.services.gemini_service import GeminiAnalysisService
+from src.services.github_cache import GitHubResponseCache, github_response_cache
+from src.services.github_service import GitHubAPIService
+
+logger = logging.getLogger(__name__)
+
+
+def verify_signature(secret: str, body: bytes, signature: Optional[str]) -> bool:
+    """X-Hub-Signature-256 헤더 검증 (sha256=<hex HMAC>)"""
+    if not secret or not signature or not signature.startswith("sha256="):
+        return False
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature[len("sha256="):])
+
+
+def _pr_status(pull_request: dict) -> str:
+    if pull_request.get("merged") or pull_request.get("merged_at"):
+        return "merged"
+    if pull_request.get("state") == "closed":
+        return "closed"
+    return "open"
+
+
+def _changed_files(payload: dict) -> set[str]:
+    """push 이벤트에 포함된 커밋들의 변경 파일 경로"""
+    changed: set[str] = set()
+    for commit in payload.get("commits") or []:
+        for key in ("added", "modified", "removed"):
+            changed.update(commit.get(key) or [])
+    return changed
+
+
+async def _run_repo_analysis(repo_id: int, github_token: str) -> None:
+    """Phase 1 (+ Phase 2 자동 체이닝) 백그라운드 분석"""
+    async with async_session_maker() as bg_db:
+        try:
+            service = GeminiAnalysisService(GitHubAPIService(github_token))
+            await service.analyze_repo(repo_id, bg_db)
+        except Exception:
+            logger.exception("웹훅 리포 분석 실패: repo_id=%d", repo_id)
+
+
+async def _run_commit_analysis(repo_id: int, github_token: str) -> None:
+    """커밋 히스토리 백그라운드 분석 (마지막 분석 이후 새 커밋만 반영)"""
+    async with async_session_maker() as bg_db:
+        try:
+            service = GeminiAnalysisService(GitHubAPIService(github_token))
+            await service.refresh_commit_analysis(repo_id, bg_db)
+        except Exception:
+            logger.exception("웹훅 커밋 분석 실패: repo_id=%d", repo_id)
+
+
+class GitHubWebhookService:
+    """push / pull_request / issues 이벤트 처리
+
+    트리와 blob 캐시는 SHA 기준(내용 주소)이라 push 후에도 낡은 내용을 돌려주지 않는다.
+    무효화가 필요한 것은 브랜치 → SHA 해석과 목록 응답을 담은 ETag 캐시뿐이다.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        cache: Optional[GitHubResponseCache] = None,
+    ):
+        self.db = db
+        self.cache = cache or github_response_cache
+
+    async def handle(self, event: str, payload: dict) -> dict:
+        """이벤트 타입별 처리 결과 반환"""
+        if event == "ping":
+            return {"event": event, "message": "pong"}
+        if event == "push":
+            return await self.handle_push(payload)
+        if event == "pull_request":
+            return await self.handle_pull_request(payload)
+        if event == "issues":
+            return await self.handle_issues(payload)
+        return {"event": event, "message": "처리하지 않는 이벤트입니다"}
+
+    async def handle_push(self, payload: dict) -> dict:
+        """기본 브랜치 push: 캐시 무효화 후 변경이 있을 때만 분석 예약"""
+        repository = payload.get("repository") or {}
+        full_name = repository.get("full_name")
+        if not full_name:
+            return {"event": "push", "message": "리포지토리 정보가 없습니다"}
+
+        await self.cache.invalidate_repo(full_name)
+
+        default_branch = repository.get("default_branch")
+        if payload.get("ref") != f"refs/heads/{default_branch}":
+            return {"event": "push", "repo": full_name, "scheduled": []}
+
+        has_new_commits = (
+            not payload.get("deleted")
+            and payload.get("before") != payload.get("after")
+            and bool(payload.get("commits"))
+        )
+        has_file_changes = has_new_commits and bool(_changed_files(payload))
+
+        scheduled: list[str] = []
+        if not has_new_commits:
+            return {"event": "push", "repo": full_name, "scheduled": scheduled}
+
+        analysis_jobs: list[tuple[int, str]] = []
+        commit_jobs: list[tuple[int, str]] = []
+        for repo, token in await self._connected_repos(full_name):
+            if has_file_changes and repo.analysis_status != "analyzing":
+                repo.analysis_status = "pending"
+                analysis_jobs.append((repo.id, token))
+                scheduled.append(f"analysis:{repo.id}")
+            if repo.commit_analysis_status != "analyzing":
+                # 상태는 실제 분석 시작 시 analyzing으로 바뀐다 (head가 그대로면 건너뜀)
+                commit_jobs.append((repo.id, token))
+                scheduled.append(f"commit_analysis:{repo.id}")
+        # pending 상태를 먼저 커밋한 뒤 작업 시작 (작업이 기록한 analyzing을 덮어쓰지 않도록)
+        await self.db.commit()
+        for repo_id, token in analysis_jobs:
+            asyncio.create_task(_run_repo_analysis(repo_id, token))
+        for repo_id, token in commit_jobs:
+            asyncio.create_task(_run_commit_analysis(repo_id, token))
+
+        logger.info("push 웹훅 처리: %s → %s", full_name, scheduled)
+        return {"event": "push", "repo": full_name, "scheduled": scheduled}
+
+    async def handle_pull_request(self, payload: dict) -> dict:
+        """PR 상태 변경을 연결된 일감의 pr_status에 반영"""
+        pull_request = payload.get("pull_request") or {}
+        pr_url = pull_request.get("html_url")
+        if not pr_url:
+            return {"event": "pull_request", "updated": 0}
+
+        pr_status = _pr_status(pull_request)
+        result = await self.db.execute(select(Issue).where(Issue.pr_url == pr_url))
+        issues = result.scalars().all()
+        for issue in issues:
+            issue.pr_status = pr_status
+        await self.db.commit()
+
+        return {"event": "pull_request", "pr_status": pr_status, "updated": len(issues)}
+
+    async def handle_issues(self, payload: dict) -> dict:
+        """GitHub 이슈 변경: 이슈 목록 캐시 무효화"""
+        full_name = (payload.get("repository") or {}).get("full_name")
+        if full_name:
+            await self.cache.invalidate_repo(full_name)
+        return {"event": "issues", "repo": full_name}
+
+    async def _connected_repos(self, full_name: str) -> list[tuple[ConnectedRepo, str]]:
+        """리포를 연동한 모든 사용자의 (ConnectedRepo, 복호화된 토큰)"""
+        result = await self.db.execute(
+            select(ConnectedRepo, User)
+            .join(User, User.id == ConnectedRepo.user_id)
+            .where(ConnectedRepo.full_name == full_name)
+        )
+        repos: list[tuple[ConnectedRepo, str]] = []
+        for repo, user in result.all():
+            encrypted = user.github_repo_token or user.github_access_token
+            if encrypted:
+                repos.append((repo, decrypt_token(encrypted)))
+        return repos
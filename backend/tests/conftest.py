@@ -1,7 +1,9 @@
 """테스트 공통 설정"""
+import httpx
 import pytest
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 
+from src import circuit_breaker, http_client
 from src.database import Base
 
 
@@ -22,3 +24,40 @@ async def db_session():
         await conn.run_sync(Base.metadata.drop_all)
 
     await engine.dispose()
+
+
+@pytest.fixture
+async def db_session_factory():
+    """테스트용 인메모리 SQLite 세션 팩토리 (자체 세션을 여는 캐시/스토어용)"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    await engine.dispose()
+
+
+@pytest.fixture
+def mock_upstream():
+    """업스트림 공유 클라이언트를 MockTransport 기반 클라이언트로 교체
+
+    mock_upstream(UPSTREAM_GITHUB, handler) 형태로 호출하며,
+    종료 시 클라이언트와 재시도 예산/레이트 리밋/서킷 상태를 정리한다.
+    """
+    installed: list[str] = []
+
+    def _install(upstream: str, handler) -> None:
+        http_client._clients[upstream] = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        )
+        installed.append(upstream)
+
+    yield _install
+
+    for upstream in installed:
+        http_client._clients.pop(upstream, None)
+    http_client._retry_budgets.clear()
+    http_client._rate_limits.clear()
+    circuit_breaker._breakers.clear()
@@ -1,6 +1,14 @@
 """인증(JWT) 단위 테스트"""
 from unittest.mock import patch
-from src.auth import create_access_token, create_refresh_token, verify_token
+from src.auth import (
+    create_access_token,
+    create_refresh_token,
+    get_current_principal,
+    principal_cache,
+    verify_token,
+)
+from src.crypto import encrypt_token
+from src.models.user import User
 
 
 @patch("src.auth.settings")
@@ -49,3 +57,32 @@ def test_verify_wrong_type(mock_settings):
     token = create_access_token(user_id=42)
     payload = verify_token(token, expected_type="refresh")
     assert payload is None
+
+
+async def test_principal_cache_skips_decode_and_db_on_hit(db_session_factory):
+    principal_cache.clear()
+    async with db_session_factory() as db:
+        user = User(
+            github_id=1, github_login="gary",
+            github_access_token=encrypt_token("access"),
+            github_repo_token=encrypt_token("repo-token"),
+        )
+        db.add(user)
+        await db.commit()
+        user_id = user.id
+
+    token = create_access_token(user_id)
+    async with db_session_factory() as db:
+        first = await get_current_principal(access_token=token, db=db)
+    assert first.github_token == "repo-token"
+
+    async with db_session_factory() as db:
+        with patch("src.auth.verify_token", side_effect=AssertionError("디코딩 생략 기대")), \
+                patch.object(db, "execute", side_effect=AssertionError("DB 조회 생략 기대")):
+            second = await get_current_principal(access_token=token, db=db)
+        assert second.user.id == user_id
+        assert second.user in db
+        assert second.github_token == "repo-token"
+
+    principal_cache.invalidate_user(user_id)
+    assert principal_cache.get(token) is None
@@ -0,0 +1,114 @@
+"""blob 저장소 및 분석용 파일 수집 테스트"""
+import asyncio
+
+import httpx
+import pytest
+
+from src.http_client import UPSTREAM_GITHUB
+from src.services.blob_store import BlobStore
+from src.services.gemini_service import GeminiAnalysisService, RepoSnapshot
+from src.services.github_cache import GitHubResponseCache
+from src.services.github_service import GitHubAPIService
+
+
+@pytest.fixture
+def analysis_service(db_session_factory, mock_upstream):
+    """blob 요청 경로를 기록하는 가짜 GitHub + 테스트 DB blob 저장소"""
+    requested: list[str] = []
+    blobs = {"sha-readme": b"# hello", "sha-main": b"print('hi')"}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(request.url.path)
+        sha = request.url.path.rsplit("/", 1)[-1]
+        if sha not in blobs:
+            return httpx.Response(404)
+        return httpx.Response(200, content=blobs[sha])
+
+    mock_upstream(UPSTREAM_GITHUB, handler)
+    github = GitHubAPIService("token", cache=GitHubResponseCache(db_session_factory))
+    service = GeminiAnalysisService(github, blob_store=BlobStore(db_session_factory))
+    return service, requested
+
+
+async def test_unchanged_blobs_are_not_refetched(analysis_service):
+    service, requested = analysis_service
+    tree = {"tree": [
+        {"path": "README.md", "type": "blob", "sha": "sha-readme"},
+        {"path": "main.py", "type": "blob", "sha": "sha-main"},
+        {"path": "src", "type": "tree", "sha": "sha-dir"},
+    ]}
+    snapshot = RepoSnapshot.from_tree(tree)
+
+    first = await service._fetch_key_files("owner", "repo", snapshot.paths, snapshot)
+    assert first == {"README.md": "# hello", "main.py": "print('hi')"}
+    assert all("/git/blobs/" in path for path in requested)
+    assert len(requested) == 2
+
+    requested.clear()
+    second = await service._fetch_key_files("owner", "repo", snapshot.paths, snapshot)
+    assert second == first
+    assert requested == []
+
+
+async def test_blob_store_round_trip(db_session_factory):
+    store = BlobStore(db_session_factory)
+    await store.put_many({"a": b"x" * 1000})
+    await store.put_many({"a": b"x" * 1000})  # 중복 저장은 무시
+
+    assert await store.get_many(["a", "missing"]) == {"a": b"x" * 1000}
+    assert store.stats()["misses"] == 1
+
+
+async def test_concurrent_put_of_same_sha_keeps_batch(db_session_factory):
+    store = BlobStore(db_session_factory)
+
+    # 같은 리포를 동시에 분석: 겹치는 SHA가 있어도 각 배치의 나머지 blob은 저장
+    await asyncio.gather(
+        store.put_many({"shared": b"s", "only-a": b"a"}),
+        store.put_many({"shared": b"s", "only-b": b"b"}),
+    )
+    await store.put_many({"shared": b"s", "only-c": b"c"})
+
+    assert await store.get_many(["shared", "only-a", "only-b", "only-c"]) == {
+        "shared": b"s", "only-a": b"a", "only-b": b"b", "only-c": b"c",
+    }
+
+
+async def test_size_cap_evicts_least_recently_used_blob(db_session_factory):
+    store = BlobStore(db_session_factory, max_bytes=25)
+    await store.put_many({"a": b"a" * 10})
+    await store.put_many({"b": b"b" * 10})
+    assert await store.get_many(["a"]) == {"a": b"a" * 10}  # a를 최근 사용으로 갱신
+
+    await store.put_many({"c": b"c" * 10})
+
+    assert set(await store.get_many(["a", "b", "c"])) == {"a", "c"}
+
+
+async def test_concurrent_fetch_keeps_priority_order_and_budget(db_session_factory, mock_upstream):
+    sizes = {"a": 40, "b": 70, "c": 30, "d": 30, "e": 10}
+    delays = {"a": 0.03, "b": 0.0, "c": 0.02, "d": 0.0, "e": 0.0}
+    completed: list[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        sha = request.url.path.rsplit("/", 1)[-1]
+        await asyncio.sleep(delays[sha])
+        completed.append(sha)
+        return httpx.Response(200, content=b"x" * sizes[sha])
+
+    mock_upstream(UPSTREAM_GITHUB, handler)
+    github = GitHubAPIService("token", cache=GitHubResponseCache(db_session_factory))
+    service = GeminiAnalysisService(github, blob_store=BlobStore(db_session_factory))
+    snapshot = RepoSnapshot(
+        commit_sha=None, blob_shas={path: path for path in sizes}
+    )
+
+    result = await service._collect_files(
+        "owner", "repo", list(sizes), snapshot, max_bytes=100
+    )
+
+    # 순차 조회와 같은 결과: a(40) 채택, b(70) 초과로 건너뜀, c(30) 채택, d(30) 채택 → 예산 100 소진
+    assert list(result) == ["a", "c", "d"]
+    assert "e" not in result
+    # 뒤쪽 파일이 먼저 끝나도 결과 순서에는 영향이 없다
+    assert completed.index("b") < completed.index("a")
@@ -0,0 +1,120 @@
+"""증분 커밋 분석 테스트"""
+import pytest
+
+from src.models.connected_repo import ConnectedRepo
+from src.services.gemini_service import GeminiAnalysisService
+
+
+def _commit(sha: str) -> dict:
+    return {"sha": sha, "message": f"commit {sha}", "author_name": "gary",
+            "author_email": "g@example.com", "author_date": "2026-01-01T00:00:00Z"}
+
+
+class _FakeGitHub:
+    def __init__(self, head: str, compare: dict | None = None):
+        self.head = head
+        self.compare = compare
+        self.calls: list[str] = []
+
+    async def resolve_commit_sha(self, owner, repo, ref):
+        self.calls.append("resolve")
+        return self.head
+
+    async def compare_commits(self, owner, repo, base, head):
+        self.calls.append(f"compare:{base}...{head}")
+        return self.compare
+
+    async def get_commits(self, owner, repo, sha="", per_page=30):
+        self.calls.append(f"list:{sha}")
+        return [_commit(self.head), _commit("older")]
+
+
+class _NoopCommitStore:
+    async def enrich_commits(self, github, owner, repo, commits, fetch_missing=True):
+        return commits
+
+
+@pytest.fixture
+def make_service(monkeypatch):
+    prompts: list[str] = []
+
+    def _factory(github: _FakeGitHub) -> GeminiAnalysisService:
+        service = GeminiAnalysisService(github, commit_store=_NoopCommitStore())
+
+        async def fake_call_gemini(prompt, model=None, **kwargs):
+            prompts.append(prompt)
+            return f"analysis #{len(prompts)}"
+
+        monkeypatch.setattr(service, "_call_gemini", fake_call_gemini)
+        return service
+
+    return _factory, prompts
+
+
+async def _repo(db_session, **kwargs) -> ConnectedRepo:
+    repo = ConnectedRepo(
+        user_id=1, github_repo_id=1, full_name="owner/repo", name="repo",
+        html_url="https://github.com/owner/repo", **kwargs,
+    )
+    db_session.add(repo)
+    await db_session.commit()
+    return repo
+
+
+async def test_first_run_is_full_and_records_head(db_session, make_service):
+    factory, prompts = make_service
+    repo = await _repo(db_session)
+    github = _FakeGitHub(head="h1")
+
+    assert await factory(github).refresh_commit_analysis(repo.id, db_session)
+
+    await db_session.refresh(repo)
+    assert repo.commit_analyzed_sha == "h1"
+    assert repo.commit_analysis_result == "analysis #1"
+    assert github.calls == ["resolve", "list:h1"]
+
+
+async def test_unchanged_head_skips_gemini(db_session, make_service):
+    factory, prompts = make_service
+    repo = await _repo(
+        db_session, commit_analysis_status="completed",
+        commit_analysis_result="기존 분석", commit_analyzed_sha="h1",
+    )
+
+    assert not await factory(_FakeGitHub(head="h1")).refresh_commit_analysis(repo.id, db_session)
+    assert prompts == []
+
+
+async def test_new_commits_update_existing_summary(db_session, make_service):
+    factory, prompts = make_service
+    repo = await _repo(
+        db_session, commit_analysis_status="completed",
+        commit_analysis_result="기존 분석", commit_analyzed_sha="h1",
+    )
+    github = _FakeGitHub(
+        head="h2",
+        compare={"status": "ahead", "ahead_by": 1, "commits": [_commit("h2")]},
+    )
+
+    assert await factory(github).refresh_commit_analysis(repo.id, db_session)
+
+    await db_session.refresh(repo)
+    assert github.calls == ["resolve", "compare:h1...h2"]
+    assert "기존 분석" in prompts[0]
+    assert "commit h2" in prompts[0]
+    assert repo.commit_analyzed_sha == "h2"
+
+
+async def test_force_push_falls_back_to_full_analysis(db_session, make_service):
+    factory, prompts = make_service
+    repo = await _repo(
+        db_session, commit_analysis_status="completed",
+        commit_analysis_result="기존 분석", commit_analyzed_sha="h1",
+    )
+    github = _FakeGitHub(
+        head="h3", compare={"status": "diverged", "ahead_by": 2, "commits": []},
+    )
+
+    assert await factory(github).refresh_commit_analysis(repo.id, db_session)
+    assert github.calls[-1] == "list:h3"
+    assert "기존 분석" not in prompts[0]
@@ -0,0 +1,57 @@
+"""커밋 상세 저장소 테스트"""
+import httpx
+import pytest
+
+from src.http_client import UPSTREAM_GITHUB
+from src.services.commit_store import CommitDetailStore
+from src.services.github_cache import GitHubResponseCache
+from src.services.github_service import GitHubAPIService
+
+
+@pytest.fixture
+def github(db_session_factory, mock_upstream):
+    """커밋 상세 요청을 기록하는 가짜 GitHub"""
+    requested: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sha = request.url.path.rsplit("/", 1)[-1]
+        requested.append(sha)
+        return httpx.Response(200, json={
+            "sha": sha,
+            "stats": {"additions": 3, "deletions": 1, "total": 4},
+            "files": [{"filename": "a.py"}, {"filename": "b.py"}],
+        })
+
+    mock_upstream(UPSTREAM_GITHUB, handler)
+    return GitHubAPIService("token", cache=GitHubResponseCache(db_session_factory)), requested
+
+
+async def test_commit_details_are_fetched_once(db_session_factory, github):
+    api, requested = github
+    store = CommitDetailStore(db_session_factory)
+    commits = [{"sha": "c1", "stats": None}, {"sha": "c2", "stats": None}]
+
+    first = await store.enrich_commits(api, "owner", "repo", commits)
+    second = await store.enrich_commits(api, "owner", "repo", commits)
+
+    assert sorted(requested) == ["c1", "c2"]
+    assert first == second
+    assert first[0]["stats"] == {"additions": 3, "deletions": 1, "total": 4}
+    assert first[0]["files"] == ["a.py", "b.py"]
+    assert first[0]["files_changed"] == 2
+    assert commits[0]["stats"] is None  # 입력 목록은 변경하지 않음
+
+
+async def test_store_only_enrichment_skips_missing(db_session_factory, github):
+    api, requested = github
+    store = CommitDetailStore(db_session_factory)
+    await store.enrich_commits(api, "owner", "repo", [{"sha": "c1"}])
+    requested.clear()
+
+    enriched = await store.enrich_commits(
+        api, "owner", "repo", [{"sha": "c1"}, {"sha": "c2"}], fetch_missing=False
+    )
+
+    assert requested == []
+    assert enriched[0]["files_changed"] == 2
+    assert "stats" not in enriched[1]
@@ -0,0 +1,188 @@
+"""Gemini 컨텍스트 캐시 테스트"""
+import json
+
+import httpx
+import pytest
+
+from src.http_client import UPSTREAM_GEMINI
+from src.models.connected_repo import ConnectedRepo
+from src.models.issue import Issue, IssuePriority
+from src.services import gemini_service
+from src.services.context_cache import LocalContextCacheBackend, RepoContextCache
+from src.services.gemini_service import GeminiAnalysisService
+from src.services.llm_cache import LLMResponseCache
+
+LONG_ANALYSIS = "\n".join(f"- module_{i}: handles feature {i} in the service layer" for i in range(400))
+
+
+async def test_small_context_is_not_cached():
+    backend = LocalContextCacheBackend()
+    cache = RepoContextCache(backend, ttl_seconds=3600)
+
+    assert await cache.get_or_create(1, "gemini-2.5-flash", "짧은 분석") is None
+    assert backend.entries == {}
+
+
+async def test_reuses_entry_until_version_changes():
+    backend = LocalContextCacheBackend()
+    cache = RepoContextCache(backend, ttl_seconds=3600)
+
+    first = await cache.get_or_create(1, "gemini-2.5-flash", LONG_ANALYSIS)
+    again = await cache.get_or_create(1, "gemini-2.5-flash", LONG_ANALYSIS)
+    assert first is not None and again.name == first.name
+    assert cache.stats() == {"entries": 1, "hits": 1, "creates": 1}
+
+    # 분석 결과가 바뀌면 새 항목을 만들고, 진행 중인 호출이 참조할 수 있는 이전 항목은 TTL로 만료
+    updated = await cache.get_or_create(1, "gemini-2.5-flash", LONG_ANALYSIS + "\n- new")
+    assert updated.name != first.name
+    assert set(backend.entries) == {first.name, updated.name}
+    assert cache.stats() == {"entries": 1, "hits": 1, "creates": 2}
+
+
+async def test_invalidate_repo_by_kind():
+    backend = LocalContextCacheBackend()
+    cache = RepoContextCache(backend, ttl_seconds=3600)
+    analysis = await cache.get_or_create(1, "gemini-2.5-flash", LONG_ANALYSIS)
+    phase1 = await cache.get_or_create(1, "gemini-2.5-flash", LONG_ANALYSIS, kind="phase1")
+    other = await cache.get_or_create(2, "gemini-2.5-flash", LONG_ANALYSIS)
+
+    cache.invalidate_repo(1, kind="analysis")
+    assert cache.stats()["entries"] == 2
+    assert (await cache.get_or_create(1, "gemini-2.5-flash", LONG_ANALYSIS)).name != analysis.name
+    assert (await cache.get_or_create(
+        1, "gemini-2.5-flash", LONG_ANALYSIS, kind="phase1"
+    )).name == phase1.name
+
+    cache.invalidate_repo(1)
+    assert cache.stats()["entries"] == 1
+    assert (await cache.get_or_create(2, "gemini-2.5-flash", LONG_ANALYSIS)).name == other.name
+    # 서버 측 항목은 삭제하지 않음
+    assert {analysis.name, phase1.name, other.name} <= set(backend.entries)
+
+
+async def test_create_failure_falls_back_to_inline():
+    class FailingBackend(LocalContextCacheBackend):
+        async def create(self, model, text, ttl_seconds):
+            raise RuntimeError("quota")
+
+    cache = RepoContextCache(FailingBackend(), ttl_seconds=3600)
+    assert await cache.get_or_create(1, "gemini-2.5-flash", LONG_ANALYSIS) is None
+
+
+async def test_work_plan_references_cached_repo_context(
+    db_session, db_session_factory, monkeypatch, mock_upstream
+):
+    bodies: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(json.loads(request.content))
+        data = {"candidates": [{"content": {"parts": [{"text": "### 작업 계획\n1. 구현"}]}}]}
+        return httpx.Response(
+            200, content=f"data: {json.dumps(data)}\r\n\r\n".encode(),
+            headers={"Content-Type": "text/event-stream"},
+        )
+
+    monkeypatch.setattr(gemini_service.settings, "gemini_api_key", "test-key")
+    mock_upstream(UPSTREAM_GEMINI, handler)
+    repo = ConnectedRepo(
+        user_id=1, github_repo_id=1, full_name="owner/repo", name="repo",
+        html_url="https://github.com/owner/repo", analysis_result=LONG_ANALYSIS,
+    )
+    db_session.add(repo)
+    issues = [
+        Issue(
+            title="임시", description=f"기능 {i} 개선", priority=IssuePriority.MEDIUM,
+            repo_full_name="owner/repo",
+        )
+        for i in range(2)
+    ]
+    db_session.add_all(issues)
+    await db_session.commit()
+
+    backend = LocalContextCacheBackend()
+    service = GeminiAnalysisService(
+        None, llm_cache=LLMResponseCache(db_session_factory),
+        context_cache=RepoContextCache(backend, ttl_seconds=3600),
+    )
+    for issue in issues:
+        await service.generate_work_plan(issue.id, db_session)
+
+    # 같은 리포의 두 작업 계획이 하나의 캐시 항목을 참조하고 분석 결과는 다시 보내지 않음
+    assert len(backend.entries) == 1
+    (name, (model, text)), = backend.entries.items()
+    assert model == "gemini-2.5-flash" and "module_399" in text
+    assert [body["cachedContent"] for body in bodies] == [name, name]
+    for body in bodies:
+        assert "module_1:" not in body["contents"][0]["parts"][0]["text"]
+    assert all(issue.ai_plan_status == "completed" for issue in issues)
+
+
+async def test_rejected_cache_reference_retries_inline(
+    db_session_factory, monkeypatch, mock_upstream
+):
+    bodies: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        bodies.append(body)
+        if "cachedContent" in body:
+            return httpx.Response(403, json={"error": {
+                "message": "CachedContent not found (or permission denied)",
+            }})
+        return httpx.Response(200, json={"candidates": [{"content": {"parts": [{"text": "완료"}]}}]})
+
+    monkeypatch.setattr(gemini_service.settings, "gemini_api_key", "test-key")
+    mock_upstream(UPSTREAM_GEMINI, handler)
+    cache = RepoContextCache(LocalContextCacheBackend(), ttl_seconds=3600)
+    service = GeminiAnalysisService(
+        None, llm_cache=LLMResponseCache(db_session_factory), context_cache=cache,
+    )
+    context = await cache.get_or_create(1, "gemini-2.5-flash", LONG_ANALYSIS)
+    result = await service._call_gemini("요청", use_cache=False, cached_content=context)
+
+    # 거부된 참조는 매핑에서 버리고 컨텍스트 원문을 프롬프트에 넣어 한 번 재시도
+    assert result == "완료"
+    assert len(bodies) == 2 and "cachedContent" not in bodies[1]
+    prompt = bodies[1]["contents"][0]["parts"][0]["text"]
+    assert prompt.startswith(LONG_ANALYSIS) and prompt.endswith("요청")
+    assert cache.stats()["entries"] == 0
+
+
+async def test_rejected_cache_reference_in_work_plan_stream(
+    db_session, db_session_factory, monkeypatch, mock_upstream
+):
+    bodies: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        bodies.append(body)
+        if "cachedContent" in body:
+            return httpx.Response(404, json={"error": {"message": "CachedContent not found"}})
+        data = {"candidates": [{"content": {"parts": [{"text": "### 작업 계획\n1. 구현"}]}}]}
+        return httpx.Response(
+            200, content=f"data: {json.dumps(data)}\r\n\r\n".encode(),
+            headers={"Content-Type": "text/event-stream"},
+        )
+
+    monkeypatch.setattr(gemini_service.settings, "gemini_api_key", "test-key")
+    mock_upstream(UPSTREAM_GEMINI, handler)
+    db_session.add(ConnectedRepo(
+        user_id=1, github_repo_id=1, full_name="owner/repo", name="repo",
+        html_url="https://github.com/owner/repo", analysis_result=LONG_ANALYSIS,
+    ))
+    issue = Issue(
+        title="임시", description="기능 개선", priority=IssuePriority.MEDIUM,
+        repo_full_name="owner/repo",
+    )
+    db_session.add(issue)
+    await db_session.commit()
+
+    service = GeminiAnalysisService(
+        None, llm_cache=LLMResponseCache(db_session_factory),
+        context_cache=RepoContextCache(LocalContextCacheBackend(), ttl_seconds=3600),
+    )
+    await service.generate_work_plan(issue.id, db_session)
+
+    assert len(bodies) == 2 and "cachedContent" not in bodies[1]
+    assert "module_399" in bodies[1]["contents"][0]["parts"][0]["text"]
+    assert issue.ai_plan_status == "completed"
@@ -0,0 +1,235 @@
+"""분석 지문 기반 증분 분석 테스트"""
+import json
+import re
+
+import pytest
+from sqlalchemy import select
+
+from src.models.connected_repo import ConnectedRepo
+from src.models.deep_analysis_suggestion import DeepAnalysisSuggestion
+from src.models.issue import Issue, IssueStatus
+from src.services import gemini_service
+from src.services.gemini_service import (
+    GEMINI_MODEL_FLASH,
+    GEMINI_MODEL_PRO,
+    GeminiAnalysisService,
+)
+from src.services.llm_scheduler import LLMPriority
+
+
+def _tree(tree_sha: str, files: dict[str, str]) -> dict:
+    return {
+        "sha": tree_sha,
+        "tree": [
+            {"path": path, "type": "blob", "sha": sha, "size": 10}
+            for path, sha in files.items()
+        ],
+    }
+
+
+class _FakeGitHub:
+    def __init__(self, tree: dict):
+        self.tree = tree
+
+    async def resolve_repo_tree(self, owner, repo, branch):
+        return "c1", self.tree
+
+
+def _deep_response(*files: str) -> str:
+    suggestions = [
+        {
+            "category": "code_quality", "severity": "medium",
+            "title": f"{path} 개선", "description": "설명",
+            "affected_files": [path],
+        }
+        for path in files
+    ]
+    return f"리포트\n\n```json\n{json.dumps(suggestions)}\n```"
+
+
+@pytest.fixture
+def make_service(monkeypatch):
+    calls: list[dict] = []
+    plan_batches: list[list[int]] = []
+
+    def _factory(github: _FakeGitHub, response_files: tuple[str, ...] = ()) -> GeminiAnalysisService:
+        service = GeminiAnalysisService(github)
+
+        async def fake_fetch(owner, repo, paths, snapshot=None, **kwargs):
+            return {path: f"# {path}" for path in paths}
+
+        async def fake_call_gemini(prompt, model=None, **kwargs):
+            calls.append({"prompt": prompt, "model": model})
+            if "one part of a larger codebase" in prompt:
+                path = re.search(r"### (\S+)", prompt).group(1)
+                return _deep_response(path)
+            if "deep code review" in prompt:
+                return _deep_response(*response_files)
+            return "Phase 1 분석"
+
+        async def fake_plans_batch(issue_ids, db, use_cache=True, priority=None):
+            # 심층 분석 후속 작업 계획은 사용자 요청보다 낮은 우선순위
+            assert priority == LLMPriority.BACKGROUND_PLAN
+            plan_batches.append(list(issue_ids))
+
+        monkeypatch.setattr(service, "_fetch_deep_files", fake_fetch)
+        monkeypatch.setattr(service, "_fetch_key_files", fake_fetch)
+        monkeypatch.setattr(service, "_call_gemini", fake_call_gemini)
+        monkeypatch.setattr(service, "generate_work_plans_batch", fake_plans_batch)
+        return service
+
+    _factory.plan_batches = plan_batches
+    return _factory, calls
+
+
+async def _repo(db_session) -> ConnectedRepo:
+    repo = ConnectedRepo(
+        user_id=1, github_repo_id=1, full_name="owner/repo", name="repo",
+        html_url="https://github.com/owner/repo",
+    )
+    db_session.add(repo)
+    await db_session.commit()
+    return repo
+
+
+async def _suggestion_titles(db_session, repo_id: int) -> list[str]:
+    result = await db_session.execute(
+        select(DeepAnalysisSuggestion.title)
+        .where(DeepAnalysisSuggestion.connected_repo_id == repo_id)
+        .order_by(DeepAnalysisSuggestion.title)
+    )
+    return list(result.scalars().all())
+
+
+async def _issue_titles(db_session) -> list[str]:
+    result = await db_session.execute(select(Issue.title).order_by(Issue.title))
+    return list(result.scalars().all())
+
+
+async def test_unchanged_tree_skips_both_phases(db_session, make_service):
+    factory, calls = make_service
+    repo = await _repo(db_session)
+    github = _FakeGitHub(_tree("t1", {"src/a.py": "a1", "src/b.py": "b1"}))
+
+    await factory(github, ("src/a.py",)).analyze_repo(repo.id, db_session)
+    assert len(calls) == 2
+
+    await factory(github).analyze_repo(repo.id, db_session)
+
+    await db_session.refresh(repo)
+    assert len(calls) == 2
+    assert repo.analysis_status == "completed"
+    assert repo.deep_analysis_status == "completed"
+    assert await _suggestion_titles(db_session, repo.id) == ["src/a.py 개선"]
+
+
+async def test_only_changed_files_are_reviewed(db_session, make_service):
+    factory, calls = make_service
+    repo = await _repo(db_session)
+
+    github = _FakeGitHub(_tree("t1", {"src/a.py": "a1", "src/b.py": "b1"}))
+    await factory(github, ("src/a.py", "src/b.py")).analyze_repo_deep(repo.id, db_session)
+    assert "### src/a.py" in calls[0]["prompt"]
+
+    github = _FakeGitHub(_tree("t2", {"src/a.py": "a1", "src/b.py": "b2"}))
+    await factory(github, ("src/b.py",)).analyze_repo_deep(repo.id, db_session)
+
+    prompt = calls[1]["prompt"]
+    assert "### src/b.py" in prompt
+    assert "### src/a.py" not in prompt
+    assert "src/a.py 개선" in prompt  # 유지되는 기존 제안 요약
+
+    await db_session.refresh(repo)
+    assert json.loads(repo.deep_analysis_files) == {"src/a.py": "a1", "src/b.py": "b2"}
+    assert repo.deep_analysis_tree_sha == "t2"
+    assert await _suggestion_titles(db_session, repo.id) == ["src/a.py 개선", "src/b.py 개선"]
+    # 다시 보고된 src/b.py 문제는 기존 이슈에 연결되어 새 이슈·작업 계획을 만들지 않음
+    assert [len(ids) for ids in factory.plan_batches] == [2]
+    assert await _issue_titles(db_session) == ["src/a.py 개선", "src/b.py 개선"]
+    assert "기존 제안 (1개 유지)" in repo.deep_analysis_result
+
+
+async def test_unreported_finding_removes_only_untouched_issue(db_session, make_service):
+    factory, _ = make_service
+    repo = await _repo(db_session)
+
+    github = _FakeGitHub(_tree("t1", {"src/a.py": "a1", "src/b.py": "b1"}))
+    await factory(github, ("src/a.py", "src/b.py")).analyze_repo_deep(repo.id, db_session)
+    result = await db_session.execute(select(Issue).where(Issue.title == "src/a.py 개선"))
+    result.scalar_one().status = IssueStatus.IN_PROGRESS
+    await db_session.commit()
+
+    # 두 파일이 바뀌었고 더 이상 문제가 보고되지 않음
+    github = _FakeGitHub(_tree("t2", {"src/a.py": "a2", "src/b.py": "b2"}))
+    await factory(github).analyze_repo_deep(repo.id, db_session)
+
+    assert await _suggestion_titles(db_session, repo.id) == []
+    # 진행 중인 이슈는 유지, 손대지 않은 자동 생성 이슈는 삭제
+    assert await _issue_titles(db_session) == ["src/a.py 개선"]
+
+
+async def test_force_reanalyzes_everything(db_session, make_service):
+    factory, calls = make_service
+    repo = await _repo(db_session)
+    github = _FakeGitHub(_tree("t1", {"src/a.py": "a1", "src/b.py": "b1"}))
+
+    await factory(github, ("src/a.py",)).analyze_repo_deep(repo.id, db_session)
+    await factory(github, ("src/b.py",)).analyze_repo_deep(
+        repo.id, db_session, use_cache=False
+    )
+
+    assert "### src/a.py" in calls[1]["prompt"]
+    assert await _suggestion_titles(db_session, repo.id) == ["src/b.py 개선"]
+
+
+def test_shards_respect_token_budget():
+    files = {"a.py": "x" * 400, "b.py": "y" * 400, "c.py": "z" * 2000}
+
+    shards = GeminiAnalysisService._shard_deep_files(files, shard_tokens=250)
+
+    assert [list(shard) for shard in shards] == [["a.py", "b.py"], ["c.py"]]
+    assert len(shards[1]["c.py"]) < 2000
+
+
+async def test_map_reduce_reviews_shards_with_flash(db_session, make_service, monkeypatch):
+    monkeypatch.setattr(gemini_service.settings, "deep_analysis_mode", "auto")
+    monkeypatch.setattr(gemini_service.settings, "deep_analysis_shard_tokens", 5)
+    factory, calls = make_service
+    repo = await _repo(db_session)
+    files = {f"src/m{i}.py": f"s{i}" for i in range(3)}
+    github = _FakeGitHub(_tree("t1", files))
+
+    await factory(github, ("src/m0.py",)).analyze_repo_deep(repo.id, db_session)
+
+    map_calls = [c for c in calls if c["model"] == GEMINI_MODEL_FLASH]
+    reduce_calls = [c for c in calls if c["model"] == GEMINI_MODEL_PRO]
+    assert len(map_calls) == 3
+    assert len(reduce_calls) == 1
+    assert "src/m2.py 개선" in reduce_calls[0]["prompt"]
+
+    await db_session.refresh(repo)
+    assert repo.deep_analysis_status == "completed"
+    assert set(json.loads(repo.deep_analysis_files)) == set(files)
+
+
+def test_reduce_prompt_keeps_severe_candidates_within_budget(monkeypatch):
+    from src.services import prompt_packer
+
+    monkeypatch.setattr(prompt_packer.settings, "prompt_max_input_tokens", 2_000)
+    candidates = [
+        {"category": "code_quality", "severity": "critical" if i % 2 else "low",
+         "title": f"제안 {i}", "description": "설명 " * 40, "affected_files": [f"src/m{i}.py"]}
+        for i in range(40)
+    ]
+    service = GeminiAnalysisService(None)
+
+    prompt = service._build_deep_reduce_prompt(
+        "owner/repo", None, "개요 " * 5_000, candidates, file_count=40, previous_findings=[],
+    )
+
+    assert prompt_packer.estimate_tokens(prompt) <= 2_000
+    block = re.search(r"```json\n(\[.*?\])\n```", prompt, re.DOTALL)
+    kept = json.loads(block.group(1))
+    # 예산이 부족하면 severity가 낮은 후보부터 제외
+    assert 0 < len(kept) < 20
+    assert {c["severity"] for c in kept} == {"critical"}
@@ -0,0 +1,129 @@
+"""Gemini hedged request / 모델 선택 테스트"""
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.http_client import UPSTREAM_GEMINI
+from src.metrics import gemini_hedged_requests
+from src.services import gemini_service
+from src.services.gemini_service import (
+    GEMINI_MODEL_FLASH,
+    GEMINI_MODEL_PRO,
+    GeminiAnalysisService,
+)
+from src.services.latency_tracker import LatencyTracker
+from src.services.llm_cache import LLMResponseCache
+
+LARGE_PROMPT = "review this code\n" * 2000
+
+
+def _answer(text: str) -> httpx.Response:
+    return httpx.Response(200, json={"candidates": [{"content": {"parts": [{"text": text}]}}]})
+
+
+@pytest.fixture
+def gemini_models(monkeypatch, mock_upstream):
+    """모델별 응답 핸들러를 등록하는 mock Gemini"""
+    handlers: dict = {}
+    calls: list[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        model = request.url.path.rsplit("/", 1)[-1].split(":")[0]
+        calls.append(model)
+        return await handlers[model](request)
+
+    monkeypatch.setattr(gemini_service.settings, "gemini_api_key", "test-key")
+    monkeypatch.setattr(gemini_service.settings, "gemini_hedge_percentile", 0.9)
+    monkeypatch.setattr(gemini_service.settings, "gemini_hedge_min_delay_seconds", 0.05)
+    monkeypatch.setattr(gemini_service.settings, "gemini_hedge_backup_model", "flash")
+    mock_upstream(UPSTREAM_GEMINI, handler)
+    return handlers, calls
+
+
+def _service(db_session_factory, tracker: LatencyTracker) -> GeminiAnalysisService:
+    return GeminiAnalysisService(
+        None, llm_cache=LLMResponseCache(db_session_factory), latency_tracker=tracker
+    )
+
+
+def test_latency_percentile_needs_min_samples():
+    tracker = LatencyTracker(window=10, min_samples=3)
+    tracker.observe("m", 1.0)
+    tracker.observe("m", 3.0)
+    assert tracker.percentile("m", 0.9) is None
+
+    for seconds in (2.0, 4.0, 5.0):
+        tracker.observe("m", seconds)
+    assert tracker.percentile("m", 0.5) == 3.0
+    assert tracker.percentile("m", 0.9) == 5.0
+
+
+async def test_slow_primary_is_hedged_to_backup(db_session_factory, gemini_models):
+    handlers, calls = gemini_models
+
+    async def slow_pro(request):
+        await asyncio.sleep(5)
+        return _answer("pro")
+
+    async def fast_flash(request):
+        return _answer("flash")
+
+    handlers[GEMINI_MODEL_PRO] = slow_pro
+    handlers[GEMINI_MODEL_FLASH] = fast_flash
+    tracker = LatencyTracker(min_samples=1)
+    tracker.observe(GEMINI_MODEL_PRO, 0.01)
+    before = gemini_hedged_requests.value(model=GEMINI_MODEL_PRO, outcome="backup_won")
+
+    result = await _service(db_session_factory, tracker)._call_gemini(
+        LARGE_PROMPT, model=GEMINI_MODEL_PRO, use_cache=False
+    )
+
+    assert result == "flash"
+    assert calls == [GEMINI_MODEL_PRO, GEMINI_MODEL_FLASH]
+    assert gemini_hedged_requests.value(
+        model=GEMINI_MODEL_PRO, outcome="backup_won"
+    ) == before + 1
+
+
+async def test_failed_primary_falls_back_without_latency_samples(
+    db_session_factory, gemini_models
+):
+    handlers, calls = gemini_models
+
+    async def bad_pro(request):
+        return httpx.Response(400, json={"error": {"message": "invalid"}})
+
+    async def fast_flash(request):
+        return _answer("flash")
+
+    handlers[GEMINI_MODEL_PRO] = bad_pro
+    handlers[GEMINI_MODEL_FLASH] = fast_flash
+
+    result = await _service(db_session_factory, LatencyTracker())._call_gemini(
+        LARGE_PROMPT, model=GEMINI_MODEL_PRO, use_cache=False
+    )
+
+    assert result == "flash"
+    assert calls == [GEMINI_MODEL_PRO, GEMINI_MODEL_FLASH]
+
+
+async def test_small_pro_request_uses_flash(db_session_factory, gemini_models, monkeypatch):
+    handlers, calls = gemini_models
+    monkeypatch.setattr(gemini_service.settings, "gemini_pro_min_input_tokens", 2000)
+
+    async def fast_flash(request):
+        assert json.loads(request.content)["contents"][0]["parts"][0]["text"] == "짧은 요청"
+        return _answer("flash")
+
+    handlers[GEMINI_MODEL_FLASH] = fast_flash
+    tracker = LatencyTracker()
+
+    result = await _service(db_session_factory, tracker)._call_gemini(
+        "짧은 요청", model=GEMINI_MODEL_PRO, use_cache=False
+    )
+
+    assert result == "flash"
+    assert calls == [GEMINI_MODEL_FLASH]
+    assert tracker.stats()[GEMINI_MODEL_FLASH]["samples"] == 1
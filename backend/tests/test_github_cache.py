@@ -0,0 +1,91 @@
+"""GitHub API 조건부 요청 캐시 테스트"""
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from sqlalchemy import select
+
+from src.http_client import UPSTREAM_GITHUB
+from src.models.github_http_cache import GitHubHttpCache
+from src.services.github_cache import GitHubResponseCache
+from src.services.github_service import GitHubAPIService
+
+
+@pytest.fixture
+def github_requests(mock_upstream):
+    """GitHub 업스트림을 ETag를 지원하는 가짜 서버로 교체"""
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(
+            200,
+            json=[{"name": "main", "commit": {"sha": "abc"}, "protected": True}],
+            headers={"ETag": '"v1"'},
+        )
+
+    mock_upstream(UPSTREAM_GITHUB, handler)
+    return requests
+
+
+async def test_conditional_request_serves_cached_body(
+    db_session_factory, github_requests
+):
+    cache = GitHubResponseCache(db_session_factory)
+    api = GitHubAPIService("token-a", cache=cache)
+
+    first = await api.get_branches("owner", "repo")
+    second = await api.get_branches("owner", "repo")
+
+    assert first == second == [{"name": "main", "sha": "abc", "protected": True}]
+    assert "If-None-Match" not in github_requests[0].headers
+    assert github_requests[1].headers["If-None-Match"] == '"v1"'
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+async def test_cache_is_isolated_per_token(db_session_factory, github_requests):
+    cache = GitHubResponseCache(db_session_factory)
+
+    await GitHubAPIService("token-a", cache=cache).get_branches("owner", "repo")
+    await GitHubAPIService("token-b", cache=cache).get_branches("owner", "repo")
+
+    assert "If-None-Match" not in github_requests[1].headers
+    assert cache.stats()["hits"] == 0
+
+
+async def test_invalidate_repo(db_session_factory, github_requests):
+    cache = GitHubResponseCache(db_session_factory)
+    api = GitHubAPIService("token-a", cache=cache)
+
+    await api.get_branches("owner", "repo")
+    await cache.invalidate_repo("owner/repo")
+    await api.get_branches("owner", "repo")
+
+    assert "If-None-Match" not in github_requests[1].headers
+
+
+async def test_evict_removes_expired_and_oldest_entries(db_session_factory, github_requests):
+    cache = GitHubResponseCache(db_session_factory, max_age_seconds=3600, max_entries=2)
+    for token in ("token-a", "token-b", "token-c", "token-d"):
+        await GitHubAPIService(token, cache=cache).get_branches("owner", "repo")
+
+    # token-a 항목은 보관 기간이 지남 (토큰 교체로 더 이상 쓰이지 않는 항목)
+    async with db_session_factory() as db:
+        entries = (await db.execute(
+            select(GitHubHttpCache).order_by(GitHubHttpCache.updated_at)
+        )).scalars().all()
+        for offset, entry in enumerate(entries):
+            entry.updated_at = datetime.utcnow() - timedelta(minutes=len(entries) - offset)
+        entries[0].updated_at = datetime.utcnow() - timedelta(hours=2)
+        await db.commit()
+    stale_key = entries[0].cache_key
+    assert await cache.get(stale_key) is None
+
+    # 만료 1개 + 한도(2개) 초과분 중 가장 오래된 1개
+    assert await cache.evict() == 2
+    async with db_session_factory() as db:
+        remaining = (await db.execute(select(GitHubHttpCache.cache_key))).scalars().all()
+    assert set(remaining) == {entries[2].cache_key, entries[3].cache_key}
@@ -0,0 +1,149 @@
+"""GitHubAPIService 단위 테스트"""
+import json
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from src.http_client import UPSTREAM_GITHUB
+from src.services.github_cache import GitHubResponseCache
+from src.services.github_service import GitHubAPIService
+from src.services.tree_cache import RepoTreeCache, estimate_size
+
+
+@pytest.fixture
+def github_api(db_session_factory, mock_upstream):
+    """GitHub 업스트림을 가짜 서버로 교체한 GitHubAPIService 팩토리"""
+
+    def _factory(handler) -> GitHubAPIService:
+        mock_upstream(UPSTREAM_GITHUB, handler)
+        return GitHubAPIService("token", cache=GitHubResponseCache(db_session_factory))
+
+    return _factory
+
+
+def _paged_handler(total_pages: int, requested: list[int]):
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        requested.append(page)
+        headers = {}
+        if total_pages > 1:
+            last = request.url.copy_set_param("page", total_pages)
+            headers["Link"] = f'<{last}>; rel="last"'
+        return httpx.Response(
+            200,
+            json=[{"name": f"b{page}", "commit": {"sha": str(page)}}],
+            headers=headers,
+        )
+    return handler
+
+
+async def test_get_branches_fetches_all_pages_in_order(github_api):
+    requested: list[int] = []
+    api = github_api(_paged_handler(4, requested))
+
+    branches = await api.get_branches("owner", "repo")
+
+    assert [b["name"] for b in branches] == ["b1", "b2", "b3", "b4"]
+    assert sorted(requested) == [1, 2, 3, 4]
+
+
+async def test_single_page_without_link_header(github_api):
+    requested: list[int] = []
+    api = github_api(_paged_handler(1, requested))
+
+    branches = await api.get_branches("owner", "repo")
+
+    assert len(branches) == 1
+    assert requested == [1]
+
+
+async def test_iter_pages_streams_pages(github_api):
+    requested: list[int] = []
+    api = github_api(_paged_handler(3, requested))
+
+    pages = []
+    async for page, items in api.iter_pages(
+        "https://api.github.com/repos/owner/repo/branches",
+        detail="브랜치 목록 조회 실패",
+        max_pages=2,
+    ):
+        pages.append(page)
+
+    assert pages[0] == 1
+    assert sorted(pages) == [1, 2]
+    assert sorted(requested) == [1, 2]
+
+
+async def test_not_found_is_translated(github_api):
+    api = github_api(lambda request: httpx.Response(404))
+    with pytest.raises(HTTPException) as exc_info:
+        await api.get_branches("owner", "missing")
+    assert exc_info.value.status_code == 404
+
+
+def _tree_handler(tree_requests: list[str], branches: dict[str, str]):
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if "/commits/" in path:
+            sha = branches.get(path.rsplit("/", 1)[-1])
+            if sha is None:
+                return httpx.Response(404, json={"message": "Not Found"})
+            return httpx.Response(200, text=sha, headers={"ETag": f'"{sha}"'})
+        commit_sha = path.rsplit("/", 1)[-1]
+        tree_requests.append(commit_sha)
+        return httpx.Response(
+            200, json={"sha": f"tree-{commit_sha}", "tree": [{"path": "a.py"}]}
+        )
+    return handler
+
+
+async def test_repo_tree_is_shared_by_commit_sha(github_api):
+    tree_requests: list[str] = []
+    handler = _tree_handler(tree_requests, {"master": "c1"})
+    tree_cache = RepoTreeCache(max_bytes=1024 * 1024)
+
+    first = github_api(handler)
+    first.tree_cache = tree_cache
+    second = GitHubAPIService("other-token", cache=first.cache, tree_cache=tree_cache)
+
+    # main이 없으면 master로 폴백
+    tree = await first.get_repo_tree("owner", "repo")
+    assert tree["sha"] == "tree-c1"
+    assert await second.get_repo_tree("owner", "repo") is tree
+    assert tree_requests == ["c1"]
+    assert tree_cache.stats()["hits"] == 1
+
+
+async def test_repo_tree_missing_branch_raises_404(github_api):
+    api = github_api(_tree_handler([], {}))
+    api.tree_cache = RepoTreeCache(max_bytes=1024)
+
+    with pytest.raises(HTTPException) as exc:
+        await api.get_repo_tree("owner", "repo", "feature")
+    assert exc.value.status_code == 404
+
+
+def _sized_tree(sha: str) -> dict:
+    return {"sha": sha, "tree": [{"path": f"src/{i}.py", "type": "blob"} for i in range(10)]}
+
+
+def test_tree_cache_evicts_least_recently_used_by_bytes():
+    size = estimate_size(_sized_tree("t1"))
+    cache = RepoTreeCache(max_bytes=size * 2 + size // 2)
+    cache.put("c1", _sized_tree("t1"))
+    cache.put("c2", _sized_tree("t2"))
+    assert cache.get_by_commit("c1") is not None
+
+    cache.put("c3", _sized_tree("t3"))
+
+    assert cache.get_by_commit("c2") is None
+    assert cache.get_by_commit("c1") is not None
+    assert cache.stats()["bytes"] == size * 2
+
+
+def test_tree_size_counts_parsed_entries():
+    tree = _sized_tree("t1")
+    body = json.dumps(tree).encode()
+
+    # 파싱된 dict/list/str 객체는 직렬화된 본문보다 크다
+    assert estimate_size(tree) > len(body)
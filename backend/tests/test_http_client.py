@@ -0,0 +1,298 @@
+"""HTTP 클라이언트 유틸리티 단위 테스트"""
+import asyncio
+
+import httpx
+import pytest
+
+from src import circuit_breaker, http_client
+from src.circuit_breaker import CircuitBreaker, CircuitOpenError, CircuitState
+from src.http_client import (
+    UPSTREAM_DEFAULT,
+    UPSTREAM_GEMINI,
+    UPSTREAM_GITHUB,
+    UPSTREAM_TELEGRAM,
+    RateLimitState,
+    RetryBudget,
+    is_rate_limited,
+    parse_retry_after,
+    request_with_retry,
+    resolve_upstream,
+    stream_request,
+)
+
+
+def test_resolve_upstream():
+    assert resolve_upstream("https://api.github.com/user/repos") == UPSTREAM_GITHUB
+    assert resolve_upstream("https://github.com/login/oauth/access_token") == UPSTREAM_GITHUB
+    assert (
+        resolve_upstream("https://generativelanguage.googleapis.com/v1beta/models")
+        == UPSTREAM_GEMINI
+    )
+    assert resolve_upstream("https://api.telegram.org/botX/sendMessage") == UPSTREAM_TELEGRAM
+    assert resolve_upstream("https://example.com") == UPSTREAM_DEFAULT
+
+
+async def test_get_client_reuses_instance():
+    client = http_client.get_client("test-upstream")
+    try:
+        assert http_client.get_client("test-upstream") is client
+    finally:
+        await http_client.close_clients()
+    assert client.is_closed
+    assert "test-upstream" not in http_client._clients
+
+
+async def test_request_retries_server_error_on_shared_client(mock_upstream):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"ok": True})
+
+    mock_upstream(UPSTREAM_GITHUB, handler)
+
+    response = await request_with_retry(
+        "GET", "https://api.github.com/user", backoff_base=0
+    )
+    assert response.status_code == 200
+    assert len(calls) == 2
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("not-a-date") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_is_rate_limited():
+    assert is_rate_limited(httpx.Response(429))
+    assert is_rate_limited(
+        httpx.Response(403, headers={"X-RateLimit-Remaining": "0"})
+    )
+    assert is_rate_limited(
+        httpx.Response(403, text="You have exceeded a secondary rate limit")
+    )
+    assert not is_rate_limited(httpx.Response(403, text="Resource not accessible"))
+
+
+def test_retry_budget_exhaustion():
+    budget = RetryBudget(ratio=0.5, max_tokens=2)
+    assert budget.withdraw()
+    assert budget.withdraw()
+    assert not budget.withdraw()
+    budget.deposit()
+    budget.deposit()
+    assert budget.withdraw()
+
+
+def test_rate_limit_pacing_delay():
+    state = RateLimitState()
+    assert state.pacing_delay() == 0.0
+
+    state.update(httpx.Response(
+        200, headers={"X-RateLimit-Remaining": "4000", "X-RateLimit-Reset": "1100"}
+    ))
+    assert state.pacing_delay(now=1000) == 0.0
+
+    state.update(httpx.Response(
+        200, headers={"X-RateLimit-Remaining": "20", "X-RateLimit-Reset": "1100"}
+    ))
+    assert state.pacing_delay(now=1000) == pytest.approx(5.0)
+
+
+async def test_request_retries_after_429(mock_upstream):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        return httpx.Response(200)
+
+    mock_upstream(UPSTREAM_GEMINI, handler)
+
+    response = await request_with_retry(
+        "POST", "https://generativelanguage.googleapis.com/v1beta/models/x"
+    )
+    assert response.status_code == 200
+    assert len(calls) == 2
+
+
+async def test_request_returns_rate_limit_when_wait_too_long(mock_upstream):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(403, headers={"Retry-After": "3600"})
+
+    mock_upstream(UPSTREAM_GITHUB, handler)
+
+    response = await request_with_retry("GET", "https://api.github.com/user")
+    assert response.status_code == 403
+    assert len(calls) == 1
+
+
+async def test_concurrent_identical_gets_are_coalesced(mock_upstream):
+    release = asyncio.Event()
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        await release.wait()
+        return httpx.Response(200, json={"sha": "abc"})
+
+    mock_upstream(UPSTREAM_GITHUB, handler)
+
+    headers = {"Authorization": "Bearer t"}
+    url = "https://api.github.com/repos/o/r/commits"
+    tasks = [
+        asyncio.create_task(
+            request_with_retry("GET", url, headers=headers, params={"per_page": 30})
+        )
+        for _ in range(3)
+    ]
+    other_user = asyncio.create_task(
+        request_with_retry(
+            "GET", url, headers={"Authorization": "Bearer u"}, params={"per_page": 30}
+        )
+    )
+    await asyncio.sleep(0.01)
+    release.set()
+    responses = await asyncio.gather(*tasks, other_user)
+
+    assert all(r.json() == {"sha": "abc"} for r in responses)
+    assert len(calls) == 2  # 같은 토큰 3건은 1건으로, 다른 토큰은 별도 요청
+    assert http_client._inflight == {}
+
+
+async def test_gets_with_different_options_are_not_coalesced(mock_upstream):
+    release = asyncio.Event()
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        await release.wait()
+        return httpx.Response(200, json={})
+
+    mock_upstream(UPSTREAM_GITHUB, handler)
+
+    url = "https://api.github.com/repos/o/r/tarball"
+    tasks = [
+        asyncio.create_task(request_with_retry("GET", url)),
+        asyncio.create_task(request_with_retry("GET", url, timeout=5.0)),
+        asyncio.create_task(request_with_retry("GET", url, headers={"X-GitHub-Api-Version": "2022-11-28"})),
+        asyncio.create_task(request_with_retry("GET", url, follow_redirects=True)),
+        asyncio.create_task(request_with_retry("GET", url, follow_redirects=True)),
+    ]
+    await asyncio.sleep(0.01)
+    release.set()
+    await asyncio.gather(*tasks)
+
+    # 타임아웃·헤더가 다르면 별도 요청, 키에 없는 옵션이 있으면 합치지 않음
+    assert len(calls) == 5
+    assert http_client._inflight == {}
+
+
+def test_circuit_breaker_transitions(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=10)
+
+    breaker.before_call()
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    now[0] += 11
+    breaker.before_call()  # half-open 시험 요청
+    assert breaker.state == CircuitState.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # 시험 슬롯 초과
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+
+
+async def test_open_circuit_fails_fast(mock_upstream):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(503)
+
+    mock_upstream(UPSTREAM_TELEGRAM, handler)
+    breaker = circuit_breaker.get_breaker(UPSTREAM_TELEGRAM)
+    breaker.failure_threshold = 2
+
+    url = "https://api.telegram.org/botX/sendMessage"
+    response = await request_with_retry("POST", url, backoff_base=0)
+    assert response.status_code == 503
+    assert len(calls) == 2  # 두 번째 실패에서 서킷이 열려 세 번째 재시도는 생략
+
+    with pytest.raises(CircuitOpenError):
+        await request_with_retry("POST", url, backoff_base=0)
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+async def test_transport_error_during_half_open_reopens_circuit(
+    mock_upstream, monkeypatch, streaming
+):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) == 1:
+            raise httpx.RemoteProtocolError("peer closed connection", request=request)
+        return httpx.Response(200, json={"ok": True})
+
+    mock_upstream(UPSTREAM_TELEGRAM, handler)
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", lambda: now[0])
+    breaker = circuit_breaker.get_breaker(UPSTREAM_TELEGRAM)
+    breaker._transition(CircuitState.OPEN)
+    now[0] += breaker.recovery_timeout + 1
+
+    url = "https://api.telegram.org/botX/sendMessage"
+    with pytest.raises(httpx.RemoteProtocolError):
+        if streaming:
+            async with stream_request("POST", url):
+                pass
+        else:
+            await request_with_retry("POST", url, max_retries=1)
+
+    # 시험 요청 실패로 다시 open (half-open 슬롯에 묶이지 않음)
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.half_open_calls == 0
+    assert breaker.retry_after() > 0
+
+    now[0] += breaker.recovery_timeout + 1
+    response = await request_with_retry("POST", url, max_retries=1)
+    assert response.status_code == 200
+    assert breaker.state == CircuitState.CLOSED
+    assert len(calls) == 2
+
+
+async def test_stream_error_after_status_is_counted_once(mock_upstream):
+    class BrokenStream(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            yield b"partial"
+            raise httpx.ReadError("connection reset")
+
+    mock_upstream(UPSTREAM_TELEGRAM, lambda request: httpx.Response(200, stream=BrokenStream()))
+    breaker = circuit_breaker.get_breaker(UPSTREAM_TELEGRAM)
+    breaker.consecutive_failures = 1
+
+    with pytest.raises(httpx.ReadError):
+        async with stream_request("POST", "https://api.telegram.org/botX/sendMessage") as response:
+            async for _ in response.aiter_bytes():
+                pass
+
+    # 200 응답으로 이미 성공을 기록했으므로 본문 수신 중 오류를 실패로 다시 세지 않음
+    assert breaker.total_failures == 0
+    assert breaker.consecutive_failures == 0
@@ -0,0 +1,78 @@
+"""LLM 응답 캐시 테스트"""
+import json
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from src.http_client import UPSTREAM_GEMINI
+from src.models.llm_response import LLMResponse
+from src.services import gemini_service
+from src.services.gemini_service import GeminiAnalysisService
+from src.services.llm_cache import LLMResponseCache, make_cache_key
+
+
+async def test_normalized_prompt_hits_cache(db_session_factory):
+    cache = LLMResponseCache(db_session_factory, ttl_seconds=3600, max_bytes=1024)
+    await cache.put("flash", "hello\r\nworld  \n", "answer")
+
+    assert await cache.get("flash", "  hello\nworld") == "answer"
+    assert await cache.get("pro", "hello\nworld") is None
+    assert await cache.get("flash", "hello\nworld", {"temperature": 0.2}) is None
+    assert cache.stats() == {"hits": 1, "misses": 2, "bypasses": 0, "hit_rate": 0.3333}
+
+
+async def test_expired_entry_is_a_miss(db_session_factory):
+    cache = LLMResponseCache(db_session_factory, ttl_seconds=60, max_bytes=1024)
+    await cache.put("flash", "prompt", "old")
+
+    async with db_session_factory() as db:
+        entry = await db.get(LLMResponse, make_cache_key("flash", "prompt"))
+        entry.created_at = datetime.utcnow() - timedelta(seconds=120)
+        await db.commit()
+
+    assert await cache.get("flash", "prompt") is None
+
+
+async def test_size_cap_evicts_least_recently_used(db_session_factory):
+    cache = LLMResponseCache(db_session_factory, ttl_seconds=3600, max_bytes=10)
+    await cache.put("flash", "a", "aaaa")
+    await cache.put("flash", "b", "bbbb")
+    assert await cache.get("flash", "a") == "aaaa"  # a를 최근 사용으로 갱신
+
+    await cache.put("flash", "c", "cccc")
+
+    assert await cache.get("flash", "b") is None
+    assert await cache.get("flash", "a") == "aaaa"
+    assert await cache.get("flash", "c") == "cccc"
+
+
+@pytest.fixture
+def gemini_upstream(monkeypatch, mock_upstream):
+    calls: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(json.loads(request.content))
+        text = f"response #{len(calls)}"
+        return httpx.Response(
+            200, json={"candidates": [{"content": {"parts": [{"text": text}]}}]}
+        )
+
+    monkeypatch.setattr(gemini_service.settings, "gemini_api_key", "test-key")
+    mock_upstream(UPSTREAM_GEMINI, handler)
+    return calls
+
+
+async def test_call_gemini_uses_cache_and_bypass(db_session_factory, gemini_upstream):
+    cache = LLMResponseCache(db_session_factory, ttl_seconds=3600, max_bytes=1024)
+    service = GeminiAnalysisService(None, llm_cache=cache)
+
+    assert await service._call_gemini("prompt") == "response #1"
+    assert await service._call_gemini("prompt ") == "response #1"
+    assert len(gemini_upstream) == 1
+
+    # 명시적 재생성은 API를 다시 호출하고 캐시를 새 응답으로 갱신
+    assert await service._call_gemini("prompt", use_cache=False) == "response #2"
+    assert await service._call_gemini("prompt") == "response #2"
+    assert len(gemini_upstream) == 2
+    assert cache.stats()["bypasses"] == 1
@@ -0,0 +1,61 @@
+"""LLM 스케줄러 테스트"""
+import asyncio
+
+import pytest
+
+from src.services.llm_scheduler import LLMPriority, LLMScheduler, TokenBucket
+
+
+def test_token_bucket_refills_per_minute():
+    bucket = TokenBucket(60)  # 초당 1개 보충
+    now = bucket.updated
+
+    assert bucket.wait_time(60, now) == 0
+    bucket.consume(60)
+    assert bucket.wait_time(1, now) == pytest.approx(1.0)
+    assert bucket.wait_time(1, now + 2) == 0
+    # 용량보다 큰 요청은 용량만큼으로 취급 (영원히 대기하지 않음)
+    assert bucket.wait_time(1000, now + 2) == pytest.approx(58.0)
+    assert TokenBucket(0).wait_time(10**9, now) == 0
+
+
+async def test_higher_priority_runs_first():
+    scheduler = LLMScheduler(max_concurrency=1)
+    order: list[str] = []
+
+    async def call(name: str, priority: LLMPriority):
+        async with scheduler.slot("flash", 10, priority):
+            order.append(name)
+
+    await scheduler.acquire("flash", 10, LLMPriority.INTERACTIVE)
+    deep = asyncio.create_task(call("deep", LLMPriority.DEEP_ANALYSIS))
+    plan = asyncio.create_task(call("plan", LLMPriority.BACKGROUND_PLAN))
+    commit = asyncio.create_task(call("commit", LLMPriority.COMMIT_ANALYSIS))
+    interactive = asyncio.create_task(call("interactive", LLMPriority.INTERACTIVE))
+    await asyncio.sleep(0)
+    assert scheduler.stats()["queued"] == 4
+
+    scheduler.release()
+    await asyncio.gather(deep, plan, commit, interactive)
+
+    assert order == ["interactive", "commit", "plan", "deep"]
+    assert scheduler.inflight == 0
+
+
+async def test_rate_limited_model_does_not_block_other_models():
+    scheduler = LLMScheduler(max_concurrency=4, limits={"pro": (1, 0)})
+    async with scheduler.slot("pro", 10, LLMPriority.REPO_ANALYSIS):
+        pass
+
+    blocked = asyncio.create_task(scheduler.acquire("pro", 10, LLMPriority.INTERACTIVE))
+    await asyncio.sleep(0)
+    assert not blocked.done()
+
+    await asyncio.wait_for(scheduler.acquire("flash", 10, LLMPriority.DEEP_ANALYSIS), 1)
+    scheduler.release()
+
+    blocked.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await blocked
+    assert scheduler.stats()["queued"] == 0
+    assert scheduler.inflight == 0
@@ -0,0 +1,58 @@
+"""메트릭 레지스트리/미들웨어 테스트"""
+import httpx
+from fastapi import FastAPI
+
+from src.metrics import MetricsMiddleware, MetricsRegistry, http_request_duration
+
+
+def test_histogram_render():
+    registry = MetricsRegistry()
+    histogram = registry.histogram(
+        "test_duration_seconds", "테스트", ("model",), buckets=(0.1, 1.0)
+    )
+    histogram.observe(0.05, model="flash")
+    histogram.observe(0.5, model="flash")
+    histogram.observe(5.0, model="flash")
+
+    text = registry.render()
+    assert '# TYPE test_duration_seconds histogram' in text
+    assert 'test_duration_seconds_bucket{model="flash",le="0.1"} 1' in text
+    assert 'test_duration_seconds_bucket{model="flash",le="1"} 2' in text
+    assert 'test_duration_seconds_bucket{model="flash",le="+Inf"} 3' in text
+    assert 'test_duration_seconds_count{model="flash"} 3' in text
+    assert 'test_duration_seconds_sum{model="flash"} 5.55' in text
+
+
+def test_counter_and_gauge_render():
+    registry = MetricsRegistry()
+    counter = registry.counter("test_requests_total", "테스트", ("outcome",))
+    gauge = registry.gauge("test_depth", "테스트", ("status",))
+    counter.inc(outcome="success")
+    counter.inc(2, outcome="success")
+    gauge.set(4, status="pending")
+
+    text = registry.render()
+    assert 'test_requests_total{outcome="success"} 3' in text
+    assert 'test_depth{status="pending"} 4' in text
+
+
+async def test_middleware_labels_by_route_template():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"id": item_id}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get("/items/1")
+        await client.get("/items/2")
+        await client.get("/missing")
+
+    assert http_request_duration.count(
+        method="GET", route="/items/{item_id}", status=200
+    ) == 2
+    assert http_request_duration.count(
+        method="GET", route="unmatched", status=404
+    ) == 1
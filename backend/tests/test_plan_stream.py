@@ -0,0 +1,129 @@
+"""작업 계획 스트리밍 테스트"""
+import json
+
+import httpx
+import pytest
+
+from src import http_client
+from src.http_client import UPSTREAM_GEMINI
+from src.models.issue import Issue, IssuePriority
+from src.services import gemini_service
+from src.services.gemini_service import GeminiAnalysisService
+from src.services.llm_cache import LLMResponseCache
+from src.services.plan_stream import PlanStreamBroker
+
+META = '```json\n{"title": "로그인 개선", "priority": "high", "labels": [], "repo_full_name": null}\n```\n'
+PLAN_PARTS = ["### 작업 계획\n", "1. 세션 만료 처리\n", "2. 테스트 추가\n"]
+
+
+def _sse_body(texts: list[str]) -> bytes:
+    lines = [
+        "data: " + json.dumps({"candidates": [{"content": {"parts": [{"text": t}]}}]})
+        for t in texts
+    ]
+    return ("\r\n\r\n".join(lines) + "\r\n\r\n").encode()
+
+
+@pytest.fixture
+def gemini_stream(monkeypatch, mock_upstream):
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        body = _sse_body([META[:20], META[20:]] + PLAN_PARTS)
+        return httpx.Response(200, content=body, headers={"Content-Type": "text/event-stream"})
+
+    monkeypatch.setattr(gemini_service.settings, "gemini_api_key", "test-key")
+    mock_upstream(UPSTREAM_GEMINI, handler)
+    return requests
+
+
+async def test_broker_replays_snapshot_to_late_subscriber():
+    broker = PlanStreamBroker()
+    broker.start(1)
+    broker.publish(1, "abc")
+
+    async with broker.subscribe(1) as queue:
+        broker.publish(1, "def")
+        broker.finish(1, "completed")
+        events = [queue.get_nowait() for _ in range(3)]
+
+    assert events == [
+        {"event": "snapshot", "data": {"text": "abc"}},
+        {"event": "chunk", "data": {"text": "def"}},
+        {"event": "done", "data": {"status": "completed"}},
+    ]
+    assert not broker.is_active(1)
+
+
+def test_partial_plan_hides_unfinished_metadata():
+    assert GeminiAnalysisService._partial_plan("```js") == ""
+    assert GeminiAnalysisService._partial_plan(META[:30]) == ""
+    assert GeminiAnalysisService._partial_plan(META + "### 계획") == "### 계획"
+    assert GeminiAnalysisService._partial_plan("### 바로 본문") == "### 바로 본문"
+
+
+async def test_work_plan_streams_chunks(db_session, db_session_factory, gemini_stream):
+    issue = Issue(title="임시", description="로그인 세션이 자주 끊김", priority=IssuePriority.MEDIUM)
+    db_session.add(issue)
+    await db_session.commit()
+
+    broker = PlanStreamBroker()
+    service = GeminiAnalysisService(
+        None, llm_cache=LLMResponseCache(db_session_factory), plan_broker=broker
+    )
+    async with broker.subscribe(issue.id) as queue:
+        await service.generate_work_plan(issue.id, db_session)
+        events = []
+        while not queue.empty():
+            events.append(queue.get_nowait())
+
+    assert ":streamGenerateContent" in str(gemini_stream[0].url)
+    assert "alt=sse" in str(gemini_stream[0].url)
+
+    chunks = "".join(e["data"]["text"] for e in events if e["event"] == "chunk")
+    assert chunks == "".join(PLAN_PARTS)
+    assert "```json" not in chunks
+    assert events[-1] == {"event": "done", "data": {"status": "completed"}}
+
+    await db_session.refresh(issue)
+    assert issue.ai_plan_status == "completed"
+    assert issue.title == "로그인 개선"
+    assert issue.priority == IssuePriority.HIGH
+    assert issue.behavior_example == "".join(PLAN_PARTS).strip()
+
+
+@pytest.mark.parametrize("status, attempts, plan_status", [
+    (429, 2, "completed"),  # 첫 조각 전 rate limit은 Retry-After 후 재시도
+    (503, 2, "completed"),
+    (400, 1, "failed"),  # 재시도 대상이 아닌 오류는 바로 실패
+])
+async def test_stream_retries_before_first_chunk(
+    db_session, db_session_factory, monkeypatch, status, attempts, plan_status, mock_upstream
+):
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if len(requests) == 1:
+            return httpx.Response(status, headers={"Retry-After": "0"}, json={"error": {}})
+        return httpx.Response(
+            200, content=_sse_body([META] + PLAN_PARTS),
+            headers={"Content-Type": "text/event-stream"},
+        )
+
+    monkeypatch.setattr(gemini_service.settings, "gemini_api_key", "test-key")
+    monkeypatch.setattr(http_client.settings, "http_retry_max_backoff", 0.0)
+    mock_upstream(UPSTREAM_GEMINI, handler)
+    issue = Issue(title="임시", description="재시도 확인", priority=IssuePriority.MEDIUM)
+    db_session.add(issue)
+    await db_session.commit()
+
+    service = GeminiAnalysisService(
+        None, llm_cache=LLMResponseCache(db_session_factory), plan_broker=PlanStreamBroker()
+    )
+    await service.generate_work_plan(issue.id, db_session)
+
+    assert len(requests) == attempts
+    await db_session.refresh(issue)
+    assert issue.ai_plan_status == plan_status
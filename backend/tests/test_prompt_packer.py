@@ -0,0 +1,76 @@
+"""프롬프트 패커 테스트"""
+from src.services.prompt_packer import (
+    PromptPacker,
+    budget_for_model,
+    estimate_tokens,
+    truncate_to_tokens,
+)
+
+
+def test_estimate_tokens_counts_non_ascii_per_char():
+    assert estimate_tokens("abcd" * 10) == 10
+    assert estimate_tokens("한글") == 2
+    assert estimate_tokens("") == 0
+
+
+def test_truncate_to_tokens_stays_within_budget():
+    text = "\n".join(f"line {i} 한글" for i in range(500))
+
+    truncated = truncate_to_tokens(text, 100)
+
+    assert estimate_tokens(truncated) <= 100
+    assert truncated.endswith("... (truncated)")
+    assert truncate_to_tokens("short", 100) == "short"
+
+
+def test_sections_filled_by_priority_in_registration_order():
+    packer = PromptPacker(60)
+    packer.add_fixed("HEAD\n")
+    packer.add("low", "l" * 400, priority=2)
+    packer.add("high", "h" * 80, priority=1)
+
+    packed = packer.pack()
+
+    assert packed.text.startswith("HEAD\n" + "l")
+    assert packed.text.endswith("h" * 80)
+    assert packed.tokens <= 60
+    assert [d.name for d in packed.dropped] == ["low"]
+    assert "low" in packed.report()
+
+
+def test_files_share_budget_and_drop_tail():
+    files = {
+        "small.py": "s" * 400,       # 100 tokens
+        "big.py": "b" * 40_000,      # 10000 tokens
+        "huge.py": "h" * 80_000,     # 20000 tokens
+    }
+    packer = PromptPacker(2_000).add_files("src", files)
+
+    packed = packer.pack()
+
+    assert "s" * 400 in packed.text
+    assert "### big.py" in packed.text and "### huge.py" in packed.text
+    assert packed.tokens <= 2_000
+    assert {d.name for d in packed.dropped} == {"src:big.py", "src:huge.py"}
+
+    tight = PromptPacker(400).add_files("src", files).pack()
+    assert "### huge.py" not in tight.text
+    assert any(d.name == "src:huge.py" and d.removed for d in tight.dropped)
+
+
+def test_model_budget_is_capped_by_setting():
+    assert 0 < budget_for_model("gemini-2.5-pro") <= 200_000
+
+
+def test_items_are_kept_whole_in_order():
+    items = [f'{{"id": {i}, "text": "{"x" * 40}"}}' for i in range(10)]
+    packer = PromptPacker(80).add_items(
+        "candidates", items, header="[\n", footer="\n]", separator=",\n"
+    )
+
+    packed = packer.pack()
+
+    kept = packed.text[2:-2].split(",\n")
+    assert kept == items[: len(kept)] and 0 < len(kept) < len(items)
+    assert packed.tokens <= 80
+    assert packed.dropped[0].name == f"candidates[{len(items) - len(kept)}/10개 제외]"
@@ -0,0 +1,101 @@
+"""tarball 스트리밍 추출 테스트"""
+import io
+import tarfile
+
+import httpx
+import pytest
+
+from src.http_client import UPSTREAM_GITHUB
+from src.services.blob_store import BlobStore
+from src.services.gemini_service import GeminiAnalysisService, RepoSnapshot
+from src.services.github_cache import GitHubResponseCache
+from src.services.github_service import GitHubAPIService
+from src.services.repo_archive import TarStreamExtractor
+
+LONG_PATH = "src/" + "/".join(["nested_directory"] * 8) + "/module.py"
+
+
+def _make_tarball(files: dict[str, bytes], fmt: int = tarfile.PAX_FORMAT) -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz", format=fmt) as tar:
+        root = tarfile.TarInfo("owner-repo-abc123")
+        root.type = tarfile.DIRTYPE
+        tar.addfile(root)
+        for path, data in files.items():
+            info = tarfile.TarInfo(f"owner-repo-abc123/{path}")
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("fmt", [tarfile.PAX_FORMAT, tarfile.GNU_FORMAT])
+def test_extracts_wanted_paths_from_small_chunks(fmt):
+    files = {
+        "README.md": b"# readme",
+        LONG_PATH: b"x = 1\n" * 200,
+        "skip.bin": b"\0" * 5000,
+        "empty.py": b"",
+    }
+    archive = _make_tarball(files, fmt)
+    extractor = TarStreamExtractor(["README.md", LONG_PATH, "empty.py"], max_file_bytes=10_000)
+
+    for i in range(0, len(archive), 37):
+        extractor.feed(archive[i:i + 37])
+
+    assert extractor.files == {
+        "README.md": b"# readme",
+        LONG_PATH: files[LONG_PATH],
+        "empty.py": b"",
+    }
+    assert extractor.complete
+
+
+def test_stops_once_all_paths_found():
+    archive = _make_tarball({"a.py": b"a", "b.py": b"b" * 100_000})
+    extractor = TarStreamExtractor(["a.py"], max_file_bytes=1000)
+
+    consumed = 0
+    for i in range(0, len(archive), 64):
+        extractor.feed(archive[i:i + 64])
+        consumed += 64
+        if extractor.complete:
+            break
+
+    assert extractor.files == {"a.py": b"a"}
+    assert consumed < len(archive)
+
+
+async def test_collect_files_uses_single_archive_download(
+    db_session_factory, monkeypatch, mock_upstream
+):
+    monkeypatch.setattr("src.services.gemini_service.settings.github_fetch_mode", "auto")
+    monkeypatch.setattr("src.services.gemini_service.settings.github_archive_min_files", 2)
+    files = {f"pkg/mod{i}.py": f"value = {i}\n".encode() for i in range(5)}
+    archive = _make_tarball(files)
+    requested: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(request.url.path)
+        if request.url.host == "api.github.com":
+            return httpx.Response(
+                302, headers={"Location": "https://codeload.github.com/owner/repo/tar.gz/c1"}
+            )
+        return httpx.Response(200, content=archive)
+
+    mock_upstream(UPSTREAM_GITHUB, handler)
+    github = GitHubAPIService("token", cache=GitHubResponseCache(db_session_factory))
+    store = BlobStore(db_session_factory)
+    service = GeminiAnalysisService(github, blob_store=store)
+    snapshot = RepoSnapshot.from_tree(
+        {"tree": [
+            {"path": path, "type": "blob", "sha": f"sha{i}", "size": len(data)}
+            for i, (path, data) in enumerate(files.items())
+        ]},
+        commit_sha="c1",
+    )
+
+    result = await service._fetch_deep_files("owner", "repo", snapshot.paths, snapshot)
+
+    assert result == {path: data.decode() for path, data in files.items()}
+    assert requested == ["/repos/owner/repo/tarball/c1", "/owner/repo/tar.gz/c1"]
+    assert len(await store.get_many(f"sha{i}" for i in range(5))) == 5
@@ -0,0 +1,72 @@
+"""리포 목록 stale-while-revalidate 캐시 테스트"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.models.user_repo_list import UserRepoList
+from src.services.github_service import GitHubAPIService
+from src.services.repo_list_cache import RepoListCache
+
+
+def _repo(repo_id: int) -> dict:
+    return {
+        "id": repo_id, "name": f"r{repo_id}", "full_name": f"o/r{repo_id}",
+        "description": None, "private": False,
+        "html_url": f"https://github.com/o/r{repo_id}", "default_branch": "main",
+        "updated_at": "2026-01-01T00:00:00Z", "owner": {"login": "o"},
+    }
+
+
+@pytest.fixture
+def github_repos(monkeypatch):
+    """get_all_repos 호출 횟수를 세는 가짜 응답"""
+    calls = {"count": 0}
+
+    async def fake_get_all_repos(self):
+        calls["count"] += 1
+        return [_repo(calls["count"])]
+
+    monkeypatch.setattr(GitHubAPIService, "get_all_repos", fake_get_all_repos)
+    return calls
+
+
+async def test_serves_cached_projection_within_ttl(db_session_factory, github_repos):
+    cache = RepoListCache(db_session_factory)
+
+    items, fetched_at = await cache.get_repos(1, "token")
+    again, again_fetched_at = await cache.get_repos(1, "token")
+
+    assert github_repos["count"] == 1
+    assert again == items
+    assert again_fetched_at == fetched_at
+    assert "owner" not in items[0]
+    assert items[0]["stargazers_count"] == 0
+
+
+async def test_stale_list_is_served_then_refreshed(db_session_factory, github_repos):
+    cache = RepoListCache(db_session_factory)
+    await cache.get_repos(1, "token")
+
+    async with db_session_factory() as db:
+        entry = await db.get(UserRepoList, 1)
+        entry.fetched_at = datetime.utcnow() - timedelta(hours=1)
+        await db.commit()
+
+    items, _ = await cache.get_repos(1, "token")
+    assert items[0]["id"] == 1  # 오래된 목록 즉시 반환
+    await asyncio.gather(*cache._refreshing.values())
+
+    refreshed, _ = await cache.get_repos(1, "token")
+    assert github_repos["count"] == 2
+    assert refreshed[0]["id"] == 2
+
+
+async def test_explicit_refresh_bypasses_cache(db_session_factory, github_repos):
+    cache = RepoListCache(db_session_factory)
+    await cache.get_repos(1, "token")
+
+    items, _ = await cache.get_repos(1, "token", refresh=True)
+
+    assert github_repos["count"] == 2
+    assert items[0]["id"] == 2
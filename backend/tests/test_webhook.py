@@ -0,0 +1,150 @@
+"""GitHub 웹훅 처리 테스트"""
+import asyncio
+import hashlib
+import hmac
+
+import pytest
+
+from src.crypto import encrypt_token
+from src.models.connected_repo import ConnectedRepo
+from src.models.issue import Issue
+from src.models.user import User
+from src.services import webhook_service
+from src.services.webhook_service import GitHubWebhookService, verify_signature
+
+
+class _FakeCache:
+    def __init__(self):
+        self.invalidated: list[str] = []
+
+    async def invalidate_repo(self, repo_full_name: str) -> None:
+        self.invalidated.append(repo_full_name)
+
+
+@pytest.fixture
+def scheduled(monkeypatch):
+    """백그라운드 분석 대신 호출 기록"""
+    calls: list[tuple] = []
+
+    async def fake_repo_analysis(repo_id, token):
+        calls.append(("analysis", repo_id, token))
+
+    async def fake_commit_analysis(repo_id, token):
+        calls.append(("commit_analysis", repo_id, token))
+
+    monkeypatch.setattr(webhook_service, "_run_repo_analysis", fake_repo_analysis)
+    monkeypatch.setattr(webhook_service, "_run_commit_analysis", fake_commit_analysis)
+    return calls
+
+
+async def _connect_repo(db_session) -> ConnectedRepo:
+    user = User(
+        github_id=1, github_login="gary",
+        github_access_token=encrypt_token("access"),
+        github_repo_token=encrypt_token("repo-token"),
+    )
+    db_session.add(user)
+    await db_session.flush()
+    repo = ConnectedRepo(
+        user_id=user.id, github_repo_id=10, full_name="owner/repo", name="repo",
+        html_url="https://github.com/owner/repo", default_branch="main",
+    )
+    db_session.add(repo)
+    await db_session.commit()
+    return repo
+
+
+def _push(commits: list[dict], ref: str = "refs/heads/main") -> dict:
+    return {
+        "ref": ref,
+        "before": "a" * 40,
+        "after": "b" * 40,
+        "commits": commits,
+        "repository": {"full_name": "owner/repo", "default_branch": "main"},
+    }
+
+
+def test_verify_signature():
+    body = b'{"zen": "ok"}'
+    digest = hmac.new(b"secret", body, hashlib.sha256).hexdigest()
+
+    assert verify_signature("secret", body, f"sha256={digest}")
+    assert not verify_signature("secret", body, f"sha256={'0' * 64}")
+    assert not verify_signature("secret", body, None)
+    assert not verify_signature("", body, f"sha256={digest}")
+
+
+async def test_push_with_file_changes_schedules_analysis(db_session, scheduled):
+    repo = await _connect_repo(db_session)
+    cache = _FakeCache()
+    service = GitHubWebhookService(db_session, cache=cache)
+
+    result = await service.handle("push", _push([{"modified": ["src/app.py"]}]))
+    await asyncio.sleep(0)
+
+    assert cache.invalidated == ["owner/repo"]
+    assert result["scheduled"] == [f"analysis:{repo.id}", f"commit_analysis:{repo.id}"]
+    assert ("analysis", repo.id, "repo-token") in scheduled
+
+
+async def test_push_without_content_change_skips_analysis(db_session, scheduled):
+    await _connect_repo(db_session)
+    cache = _FakeCache()
+    service = GitHubWebhookService(db_session, cache=cache)
+
+    other_branch = await service.handle(
+        "push", _push([{"modified": ["a.py"]}], ref="refs/heads/feature")
+    )
+    empty_commit = await service.handle("push", _push([{"modified": []}]))
+
+    assert other_branch["scheduled"] == []
+    assert [s.split(":")[0] for s in empty_commit["scheduled"]] == ["commit_analysis"]
+    assert cache.invalidated == ["owner/repo", "owner/repo"]
+
+
+async def test_pull_request_updates_issue_pr_status(db_session):
+    pr_url = "https://github.com/owner/repo/pull/7"
+    issue = Issue(title="일감", pr_url=pr_url, pr_status="open")
+    db_session.add(issue)
+    await db_session.commit()
+
+    service = GitHubWebhookService(db_session, cache=_FakeCache())
+    result = await service.handle("pull_request", {
+        "action": "closed",
+        "pull_request": {"html_url": pr_url, "state": "closed", "merged": True},
+    })
+
+    await db_session.refresh(issue)
+    assert result["updated"] == 1
+    assert issue.pr_status == "merged"
+
+
+async def test_push_commits_pending_status_before_scheduling(db_session, monkeypatch):
+    repo = await _connect_repo(db_session)
+    events: list[str] = []
+
+    async def noop():
+        pass
+
+    def fake_run(repo_id, token):
+        # 코루틴 생성 시점 = create_task 호출 시점
+        events.append("schedule")
+        return noop()
+
+    original_commit = db_session.commit
+
+    async def recording_commit():
+        events.append("commit")
+        await original_commit()
+
+    monkeypatch.setattr(webhook_service, "_run_repo_analysis", fake_run)
+    monkeypatch.setattr(webhook_service, "_run_commit_analysis", fake_run)
+    monkeypatch.setattr(db_session, "commit", recording_commit)
+
+    service = GitHubWebhookService(db_session, cache=_FakeCache())
+    await service.handle("push", _push([{"modified": ["src/app.py"]}]))
+    await asyncio.sleep(0)
+
+    assert events == ["commit", "schedule", "schedule"]
+    await db_session.refresh(repo)
+    assert repo.analysis_status == "pending"
@@ -0,0 +1,147 @@
+"""작업 계획 배치 생성 테스트"""
+import json
+import re
+
+import pytest
+from sqlalchemy import select
+
+from src.models.connected_repo import ConnectedRepo
+from src.models.issue import Issue, IssuePriority
+from src.models.label import Label, issue_labels
+from src.services.gemini_service import GeminiAnalysisService
+from src.services.llm_scheduler import LLMPriority
+from src.services.plan_stream import PlanStreamBroker
+
+
+@pytest.fixture
+async def seeded(db_session):
+    db_session.add(ConnectedRepo(
+        user_id=1, github_repo_id=1, full_name="owner/repo", name="repo",
+        html_url="https://github.com/owner/repo", analysis_result="FastAPI 백엔드",
+    ))
+    label = Label(name="버그", color="#FF0000")
+    db_session.add(label)
+    issues = [
+        Issue(title="임시", description=f"버그 {i}", priority=IssuePriority.MEDIUM,
+              repo_full_name="owner/repo")
+        for i in range(3)
+    ]
+    issues.append(Issue(title="임시", description="리포 미지정", priority=IssuePriority.MEDIUM))
+    db_session.add_all(issues)
+    await db_session.commit()
+    return issues, label
+
+
+def _make_service(monkeypatch, respond, priority=LLMPriority.INTERACTIVE):
+    service = GeminiAnalysisService(None, plan_broker=PlanStreamBroker())
+    expected_priority = priority
+    calls: list[dict] = []
+    singles: list[int] = []
+    metadata_loads: list[int] = []
+
+    async def fake_call_gemini(prompt, model=None, **kwargs):
+        calls.append({"prompt": prompt, **kwargs})
+        return respond([int(i) for i in re.findall(r"### issue_id: (\d+)", prompt)])
+
+    async def fake_single(issue_id, db, use_cache=True, metadata=None, priority=None):
+        assert metadata is not None
+        assert priority == expected_priority
+        singles.append(issue_id)
+
+    load = service._load_work_plan_metadata
+
+    async def counting_load(db):
+        metadata_loads.append(1)
+        return await load(db)
+
+    monkeypatch.setattr(service, "_call_gemini", fake_call_gemini)
+    monkeypatch.setattr(service, "generate_work_plan", fake_single)
+    monkeypatch.setattr(service, "_load_work_plan_metadata", counting_load)
+    return service, calls, singles, metadata_loads
+
+
+async def test_groups_same_repo_issues_into_one_call(db_session, seeded, monkeypatch):
+    issues, label = seeded
+
+    def respond(ids):
+        # 마지막 일감은 응답에서 누락
+        return json.dumps([
+            {"issue_id": i, "title": f"제목 {i}", "priority": "high",
+             "labels": ["버그"], "repo_full_name": "owner/repo", "plan": f"### 작업 계획 {i}"}
+            for i in ids[:-1]
+        ], ensure_ascii=False)
+
+    service, calls, singles, metadata_loads = _make_service(
+        monkeypatch, respond, priority=LLMPriority.BACKGROUND_PLAN
+    )
+    await service.generate_work_plans_batch(
+        [i.id for i in issues], db_session, priority=LLMPriority.BACKGROUND_PLAN
+    )
+
+    assert len(calls) == 1
+    assert calls[0]["priority"] == LLMPriority.BACKGROUND_PLAN
+    assert calls[0]["generation_config"] == {"responseMimeType": "application/json"}
+    assert metadata_loads == [1]
+    # 리포 미지정 단독 일감과 응답에서 빠진 일감은 단건 생성으로
+    assert singles == [issues[3].id, issues[2].id]
+
+    for issue in issues[:2]:
+        await db_session.refresh(issue)
+        assert issue.ai_plan_status == "completed"
+        assert issue.title == f"제목 {issue.id}"
+        assert issue.priority == IssuePriority.HIGH
+        assert issue.behavior_example == f"### 작업 계획 {issue.id}"
+    label_rows = await db_session.execute(
+        select(issue_labels.c.issue_id).where(issue_labels.c.label_id == label.id)
+    )
+    assert sorted(label_rows.scalars().all()) == [issues[0].id, issues[1].id]
+
+
+async def test_failed_batch_call_restores_previous_plans(db_session, seeded, monkeypatch):
+    issues, _ = seeded
+    issues[0].behavior_example = "기존 계획"
+    await db_session.commit()
+
+    def respond(ids):
+        raise RuntimeError("Gemini API 오류 (503)")
+
+    service, _, singles, _ = _make_service(monkeypatch, respond)
+    await service.generate_work_plans_batch([i.id for i in issues[:3]], db_session)
+
+    assert singles == []
+    for issue in issues[:3]:
+        await db_session.refresh(issue)
+        assert issue.ai_plan_status == "failed"
+    assert issues[0].behavior_example == "기존 계획"
+
+
+def test_parse_batch_plans_accepts_fenced_json():
+    raw = '```json\n[{"issue_id": "3", "plan": "계획"}, {"plan": "id 없음"}, 1]\n```'
+    assert GeminiAnalysisService._parse_batch_plans(raw) == {3: {"issue_id": "3", "plan": "계획"}}
+    assert GeminiAnalysisService._parse_batch_plans("JSON 아님") == {}
+
+
+async def test_failure_before_calls_marks_batch_failed(db_session, seeded, monkeypatch):
+    issues, _ = seeded
+    issues[0].behavior_example = "기존 계획"
+    await db_session.commit()
+
+    service, calls, singles, _ = _make_service(monkeypatch, lambda ids: "[]")
+    finished: list[tuple[int, str]] = []
+    monkeypatch.setattr(
+        service.plan_broker, "finish", lambda issue_id, status: finished.append((issue_id, status))
+    )
+
+    async def broken_prompt(chunk, metadata):
+        raise RuntimeError("프롬프트 생성 실패")
+
+    monkeypatch.setattr(service, "_build_batch_plan_prompt", broken_prompt)
+    await service.generate_work_plans_batch([i.id for i in issues[:3]], db_session)
+
+    # generating에 머물지 않고 이전 계획 복원 + 실패 알림
+    assert calls == [] and singles == []
+    assert sorted(finished) == [(issue.id, "failed") for issue in issues[:3]]
+    for issue in issues[:3]:
+        await db_session.refresh(issue)
+        assert issue.ai_plan_status == "failed"
+    assert issues[0].behavior_example == "기존 계획"
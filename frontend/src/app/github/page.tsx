@@ -39,6 +39,7 @@ interface GithubRepo {
 
 interface RepoListResponse {
   items: GithubRepo[];
+  fetched_at?: string | null;
 }
 
 /* ── 언어 색상 ──────────────────────────────────────── */
@@ -10,6 +10,7 @@ import { Badge, Button, useToast } from '@/components/ui';
 import { issueService } from '@/services/issueService';
 import { fetcher, fetcherWithOptions } from '@/lib/fetcher';
 import { formatRelativeTime } from '@/lib/timeUtils';
+import { usePlanStream } from '@/hooks';
 import type { Issue, QueueItem } from '@/types';
 
 interface IssueDetailModalProps {
@@ -57,6 +58,12 @@ export function IssueDetailModal({ issue: initialIssue, onClose, onEdit }: Issue
     },
   );
   const issue = issueData || initialIssue;
+  // 생성 중에는 SSE로 계획 본문을 실시간 수신 (폴링은 대체 경로로 유지)
+  const streamedPlan = usePlanStream(
+    issue.id,
+    issue.ai_plan_status === 'generating',
+    () => mutateIssue(),
+  );
   const [behaviorDraft, setBehaviorDraft] = useState(issue.behavior_example || '');
 
   // behavior_example이 업데이트되면 draft도 업데이트
@@ -276,6 +283,13 @@ export function IssueDetailModal({ issue: initialIssue, onClose, onEdit }: Issue
                 </div>
               </div>
             )}
+            {issue.ai_plan_status === 'generating' && streamedPlan && (
+              <div className="prose prose-sm prose-gray max-w-none bg-gray-50 rounded-lg p-4 border border-gray-100 mt-2">
+                <ReactMarkdown remarkPlugins={[remarkGfm]}>
+                  {streamedPlan}
+                </ReactMarkdown>
+              </div>
+            )}
 
             {/* completed 상태 */}
             {issue.ai_plan_status === 'completed' && !editingBehavior && (
@@ -3,3 +3,4 @@ export { useAuth } from './useAuth';
 export { useRepos } from './useRepos';
 export { useLabels } from './useLabels';
 export { useCommitHistory } from './useCommitHistory';
+export { usePlanStream } from './usePlanStream';
@@ -0,0 +1,44 @@
+/**
+ * AI 작업 계획 생성 스트림 (SSE) 훅
+ */
+
+import { useEffect, useState } from 'react';
+
+interface PlanStreamEvent {
+  text?: string;
+  status?: string | null;
+}
+
+/**
+ * active인 동안 /api/issues/{id}/plan-stream을 구독하여 생성 중인 계획 본문을 반환.
+ * 생성이 끝나면 onDone을 호출하고 연결을 닫는다.
+ */
+export function usePlanStream(issueId: number, active: boolean, onDone?: () => void) {
+  const [text, setText] = useState('');
+
+  useEffect(() => {
+    if (!active) return;
+
+    setText('');
+    const source = new EventSource(`/api/issues/${issueId}/plan-stream`);
+
+    source.addEventListener('snapshot', (e) => {
+      const data: PlanStreamEvent = JSON.parse((e as MessageEvent).data);
+      setText(data.text || '');
+    });
+    source.addEventListener('chunk', (e) => {
+      const data: PlanStreamEvent = JSON.parse((e as MessageEvent).data);
+      setText((prev) => prev + (data.text || ''));
+    });
+    source.addEventListener('done', () => {
+      source.close();
+      onDone?.();
+    });
+
+    return () => source.close();
+    // onDone은 매 렌더마다 바뀌므로 구독 재시작 조건에서 제외
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [issueId, active]);
+
+  return text;
+}
@@ -15,6 +15,7 @@ export interface Repo {
 
 export interface RepoListResponse {
   items: Repo[];
+  fetched_at?: string | null;
 }
 
 export interface TreeItem {